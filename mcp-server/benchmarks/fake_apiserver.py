@@ -0,0 +1,703 @@
+"""
+An in-process stand-in for the Kubernetes API server, serving a synthetic
+fleet over plain HTTP. It implements what the tools use: legacy discovery,
+chunked lists with label and field selectors, Table and metadata-only
+lists, watches, get/create/delete, apply/JSON/merge patches with
+resourceVersion preconditions, pod logs and node log proxying. Created
+pods become Running and Ready shortly after, as if scheduled and started.
+
+Objects are kept serialized, so list responses are assembled from cached
+bytes and the server stays cheap next to the tools being measured.
+
+Run it standalone with:
+
+    python -m benchmarks.fake_apiserver --nodes 5000 --pods 100000
+"""
+import argparse
+import bisect
+import copy
+import json
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, List, Dict, Tuple, Any, Callable
+from urllib.parse import urlparse, parse_qs
+
+from benchmarks.fleet import FleetSpec, generate
+
+
+@dataclass(frozen=True)
+class ResourceType:
+    group: str
+    version: str
+    kind: str
+    namespaced: bool
+
+    @property
+    def api_version(self) -> str:
+        return f"{self.group}/{self.version}" if self.group else self.version
+
+
+RESOURCES = {
+    "namespaces": ResourceType("", "v1", "Namespace", False),
+    "nodes": ResourceType("", "v1", "Node", False),
+    "pods": ResourceType("", "v1", "Pod", True),
+    "configmaps": ResourceType("", "v1", "ConfigMap", True),
+    "deployments": ResourceType("apps", "v1", "Deployment", True),
+    "bindingpolicies": ResourceType("control.kubestellar.io", "v1alpha1", "BindingPolicy", False),
+    "managedclusters": ResourceType("cluster.open-cluster-management.io", "v1", "ManagedCluster", False),
+}
+SUBRESOURCES = {"pods": ("log",), "nodes": ("proxy",)}
+FIELD_PATHS = {
+    "metadata.name": ("metadata", "name"),
+    "metadata.namespace": ("metadata", "namespace"),
+    "spec.nodeName": ("spec", "nodeName"),
+    "status.phase": ("status", "phase"),
+}
+# Longest a watch stays open, whatever timeoutSeconds asks for.
+MAX_WATCH_SECONDS = 30.0
+# Created pods turn Running and Ready this long after the create, as if a
+# kubelet had started them.
+POD_START_SECONDS = 0.2
+NODE_LOG_FILES = ("kubelet.log", "containerd.log", "syslog")
+
+
+class ApiError(Exception):
+    def __init__(self, code: int, reason: str, message: str):
+        super().__init__(message)
+        self.code = code
+        self.reason = reason
+
+    def status(self) -> Dict[str, Any]:
+        return {"kind": "Status", "apiVersion": "v1", "status": "Failure", "message": str(self),
+                "reason": self.reason, "code": self.code}
+
+
+class Entry:
+    """One stored object: its serialized body plus what selectors need."""
+    __slots__ = ("name", "namespace", "labels", "fields", "created", "resource_version", "body", "metadata")
+
+    def __init__(self, obj: Dict[str, Any]):
+        metadata = obj["metadata"]
+        self.name = metadata["name"]
+        self.namespace = metadata.get("namespace", "")
+        self.labels = metadata.get("labels") or {}
+        self.created = metadata.get("creationTimestamp", "")
+        self.fields = {}
+        for selector, (section, key) in FIELD_PATHS.items():
+            value = (obj.get(section) or {}).get(key)
+            if value is not None:
+                self.fields[selector] = value
+        self.resource_version = int(metadata["resourceVersion"])
+        self.body = json.dumps(obj, separators=(",", ":")).encode()
+        self.metadata = json.dumps(metadata, separators=(",", ":")).encode()
+
+    def object(self) -> Dict[str, Any]:
+        return json.loads(self.body)
+
+
+def _split_selector(selector: str) -> List[str]:
+    # Commas inside "in (a,b)" sets do not separate requirements.
+    parts, depth, start = [], 0, 0
+    for i, ch in enumerate(selector):
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(selector[start:i])
+            start = i + 1
+    parts.append(selector[start:])
+    return [p.strip() for p in parts if p.strip()]
+
+
+_SET_REQUIREMENT = re.compile(r"^(\S+)\s+(in|notin)\s+\((.*)\)$")
+
+
+def parse_label_selector(selector: str) -> Callable[[Dict[str, str]], bool]:
+    """A predicate for the label selector syntax of the list API."""
+    requirements: List[Callable[[Dict[str, str]], bool]] = []
+    for part in _split_selector(selector or ""):
+        match = _SET_REQUIREMENT.match(part)
+        if match:
+            key, op, values = match.group(1), match.group(2), {v.strip() for v in match.group(3).split(",")}
+            if op == "in":
+                requirements.append(lambda labels, k=key, vs=values: labels.get(k) in vs)
+            else:
+                requirements.append(lambda labels, k=key, vs=values: labels.get(k) not in vs)
+        elif "!=" in part:
+            key, value = part.split("!=", 1)
+            requirements.append(lambda labels, k=key.strip(), v=value.strip(): labels.get(k) != v)
+        elif "=" in part:
+            key, value = part.replace("==", "=").split("=", 1)
+            requirements.append(lambda labels, k=key.strip(), v=value.strip(): labels.get(k) == v)
+        elif part.startswith("!"):
+            requirements.append(lambda labels, k=part[1:].strip(): k not in labels)
+        else:
+            requirements.append(lambda labels, k=part: k in labels)
+    return lambda labels: all(requirement(labels) for requirement in requirements)
+
+
+def parse_field_selector(selector: str) -> Callable[[Dict[str, str]], bool]:
+    requirements = []
+    for part in _split_selector(selector or ""):
+        negate = "!=" in part
+        key, value = part.replace("!=", "=").replace("==", "=").split("=", 1)
+        if key not in FIELD_PATHS:
+            raise ApiError(400, "BadRequest", f'field label not supported: "{key}"')
+        requirements.append((key, value, negate))
+    return lambda values: all((values.get(k) == v) != negate for k, v, negate in requirements)
+
+
+class Store:
+    """
+    All objects by resource, namespace and name, with one resourceVersion
+    counter and an event log that watches replay from.
+    """
+
+    def __init__(self):
+        self._objects: Dict[str, Dict[str, Dict[str, Entry]]] = {resource: {} for resource in RESOURCES}
+        self._resource_version = 0
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        # (resourceVersion, resource, namespace, event type, entry)
+        self._events: List[Tuple[int, str, str, str, Entry]] = []
+        self._event_versions: List[int] = []
+
+    @property
+    def resource_version(self) -> int:
+        return self._resource_version
+
+    def load(self, objects) -> int:
+        count = 0
+        with self._lock:
+            for resource, namespace, obj in objects:
+                self._store(resource, namespace, obj)
+                count += 1
+        return count
+
+    def _store(self, resource: str, namespace: str, obj: Dict[str, Any]) -> Entry:
+        self._resource_version += 1
+        metadata = obj.setdefault("metadata", {})
+        metadata["resourceVersion"] = str(self._resource_version)
+        if namespace:
+            metadata["namespace"] = namespace
+        entry = Entry(obj)
+        self._objects[resource].setdefault(namespace, {})[entry.name] = entry
+        return entry
+
+    def _record(self, resource: str, namespace: str, event_type: str, entry: Entry) -> None:
+        # Called with the lock held, in resourceVersion order.
+        self._events.append((entry.resource_version, resource, namespace, event_type, entry))
+        self._event_versions.append(entry.resource_version)
+        self._changed.notify_all()
+
+    def get(self, resource: str, namespace: str, name: str) -> Entry:
+        entry = self._objects[resource].get(namespace, {}).get(name)
+        if entry is None:
+            raise ApiError(404, "NotFound", f'{resource} "{name}" not found')
+        return entry
+
+    def list(self, resource: str, namespace: Optional[str]) -> List[Entry]:
+        with self._lock:
+            if namespace is not None:
+                return list(self._objects[resource].get(namespace, {}).values())
+            return [entry for space in self._objects[resource].values() for entry in space.values()]
+
+    def create(self, resource: str, namespace: str, obj: Dict[str, Any], dry_run: bool = False) -> Entry:
+        metadata = obj.setdefault("metadata", {})
+        with self._lock:
+            if not metadata.get("name") and metadata.get("generateName"):
+                metadata["name"] = f"{metadata['generateName']}{self._resource_version + 1:05x}"
+            if metadata.get("name") in self._objects[resource].get(namespace, {}):
+                raise ApiError(409, "AlreadyExists", f'{resource} "{metadata["name"]}" already exists')
+            metadata.setdefault("uid", f"uid-{namespace}-{metadata.get('name')}")
+            metadata.setdefault("creationTimestamp", time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()))
+            if dry_run:
+                return Entry(dict(obj, metadata=dict(metadata, resourceVersion=str(self._resource_version))))
+            entry = self._store(resource, namespace, obj)
+            self._record(resource, namespace, "ADDED", entry)
+            return entry
+
+    def replace(self, resource: str, namespace: str, name: str, mutate: Callable[[Optional[Dict[str, Any]]], Dict[str, Any]],
+                dry_run: bool = False) -> Tuple[Entry, bool]:
+        """Apply mutate() to the current object (None when missing); returns (entry, created)."""
+        with self._lock:
+            current = self._objects[resource].get(namespace, {}).get(name)
+            updated = mutate(current.object() if current is not None else None)
+            requested = (updated.get("metadata") or {}).get("resourceVersion")
+            if current is not None and requested and int(requested) != current.resource_version:
+                raise ApiError(409, "Conflict", f'Operation cannot be fulfilled on {resource} "{name}": '
+                                                f"the object has been modified")
+            updated.setdefault("metadata", {})["name"] = name
+            if dry_run:
+                return Entry(dict(updated, metadata=dict(updated["metadata"], resourceVersion="0"))), current is None
+            entry = self._store(resource, namespace, updated)
+            self._record(resource, namespace, "ADDED" if current is None else "MODIFIED", entry)
+            return entry, current is None
+
+    def delete(self, resource: str, namespace: str, name: str, dry_run: bool = False) -> Entry:
+        with self._lock:
+            entry = self._objects[resource].get(namespace, {}).get(name)
+            if entry is None:
+                raise ApiError(404, "NotFound", f'{resource} "{name}" not found')
+            if not dry_run:
+                del self._objects[resource][namespace][name]
+                self._resource_version += 1
+                obj = entry.object()
+                obj["metadata"]["resourceVersion"] = str(self._resource_version)
+                self._record(resource, namespace, "DELETED", Entry(obj))
+            return entry
+
+    def wait_events(self, resource: str, namespace: Optional[str], since: int, deadline: float) -> List[Tuple[int, str, Entry]]:
+        """Events after resourceVersion since, waiting until deadline for the first one."""
+        with self._lock:
+            while True:
+                start = bisect.bisect_right(self._event_versions, since)
+                found = [(rv, event_type, entry) for rv, r, ns, event_type, entry in self._events[start:]
+                         if r == resource and (namespace is None or ns == namespace)]
+                if found:
+                    return found
+                if self._event_versions:
+                    since = max(since, self._event_versions[-1])
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return []
+                self._changed.wait(remaining)
+
+
+def _merge(target: Any, patch: Any) -> Any:
+    """RFC 7386 merge patch."""
+    if not isinstance(patch, dict):
+        return patch
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = _merge(result.get(key), value)
+    return result
+
+
+def _json_patch(document: Any, operations: List[Dict[str, Any]]) -> Any:
+    """RFC 6902 JSON patch (add, remove, replace and test)."""
+    document = copy.deepcopy(document)
+    for operation in operations:
+        tokens = [t.replace("~1", "/").replace("~0", "~") for t in operation["path"].split("/")[1:]]
+        parent = document
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last, op = tokens[-1], operation["op"]
+        if op == "test":
+            current = parent[int(last)] if isinstance(parent, list) else parent.get(last)
+            if current != operation["value"]:
+                raise ApiError(422, "Invalid", f"test operation failed at {operation['path']}")
+        elif op == "remove":
+            if isinstance(parent, list):
+                parent.pop(int(last))
+            else:
+                del parent[last]
+        elif isinstance(parent, list):
+            if last == "-":
+                parent.append(operation["value"])
+            elif op == "add":
+                parent.insert(int(last), operation["value"])
+            else:
+                parent[int(last)] = operation["value"]
+        else:
+            parent[last] = operation["value"]
+    return document
+
+
+def _log_lines(prefix: str, count: int) -> List[bytes]:
+    return [f"2026-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}Z {'ERROR' if i % 50 == 0 else 'INFO'} "
+            f"{prefix} handled request {i} in {i % 97}ms\n".encode() for i in range(count)]
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Send headers and body in one segment, without waiting on Nagle's
+    # algorithm; otherwise delayed ACKs add ~40 ms to every small response.
+    disable_nagle_algorithm = True
+    wbufsize = -1
+    server: "FakeApiServer"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    # -- responses -------------------------------------------------------
+
+    def _send(self, code: int, body: bytes, content_type: str = "application/json",
+              headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, obj: Any, code: int = 200) -> None:
+        self._send(code, json.dumps(obj, separators=(",", ":")).encode())
+
+    def _body(self) -> Any:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length)) if length else None
+
+    # -- routing ---------------------------------------------------------
+
+    def _route(self) -> Tuple[List[str], Dict[str, List[str]]]:
+        url = urlparse(self.path)
+        return [p for p in url.path.split("/") if p], parse_qs(url.query)
+
+    def _dispatch(self, method: Callable[[List[str], Dict[str, List[str]]], None]) -> None:
+        parts, query = self._route()
+        if parts == ["fake", "requests"]:
+            # Not part of the Kubernetes API: lets a benchmark count the
+            # requests a tool call made.
+            return self._send_json({"requests": self.server.requests})
+        self.server.count_request()
+        try:
+            method(parts, query)
+        except ApiError as e:
+            self._send_json(e.status(), e.code)
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            self._send_json(ApiError(400, "BadRequest", f"{type(e).__name__}: {e}").status(), 400)
+
+    def do_GET(self) -> None:
+        self._dispatch(self._get)
+
+    def do_POST(self) -> None:
+        self._dispatch(self._post)
+
+    def do_DELETE(self) -> None:
+        self._dispatch(self._delete)
+
+    def do_PATCH(self) -> None:
+        self._dispatch(self._patch)
+
+    def do_PUT(self) -> None:
+        self._dispatch(self._put)
+
+    def _resolve(self, parts: List[str]) -> Tuple[str, Optional[str], Optional[str], List[str]]:
+        """(resource, namespace, name, subresource path) of an object or collection URL."""
+        if parts[:1] == ["api"] and len(parts) >= 2:
+            group, version, rest = "", parts[1], parts[2:]
+        elif parts[:1] == ["apis"] and len(parts) >= 3:
+            group, version, rest = parts[1], parts[2], parts[3:]
+        else:
+            raise ApiError(404, "NotFound", "the server could not find the requested resource")
+        namespace = None
+        if len(rest) >= 3 and rest[0] == "namespaces":
+            namespace, rest = rest[1], rest[2:]
+        resource = rest[0] if rest else None
+        info = RESOURCES.get(resource)
+        if info is None or info.group != group or info.version != version:
+            raise ApiError(404, "NotFound", "the server could not find the requested resource")
+        if namespace is not None and not info.namespaced:
+            raise ApiError(404, "NotFound", f"{resource} is not namespaced")
+        name = rest[1] if len(rest) > 1 else None
+        return resource, namespace, name, rest[2:]
+
+    # -- discovery -------------------------------------------------------
+
+    def _discovery(self, parts: List[str]) -> bool:
+        if parts == ["api"]:
+            self._send_json({"kind": "APIVersions", "versions": ["v1"]})
+        elif parts == ["apis"]:
+            groups: Dict[str, List[str]] = {}
+            for info in RESOURCES.values():
+                if info.group:
+                    versions = groups.setdefault(info.group, [])
+                    if info.version not in versions:
+                        versions.append(info.version)
+            self._send_json({"kind": "APIGroupList", "apiVersion": "v1", "groups": [
+                {"name": group, "versions": [{"groupVersion": f"{group}/{v}", "version": v} for v in versions],
+                 "preferredVersion": {"groupVersion": f"{group}/{versions[0]}", "version": versions[0]}}
+                for group, versions in groups.items()
+            ]})
+        elif (len(parts) == 2 and parts[0] == "api") or (len(parts) == 3 and parts[0] == "apis"):
+            group, version = ("", parts[1]) if parts[0] == "api" else (parts[1], parts[2])
+            resources = []
+            for plural, info in RESOURCES.items():
+                if info.group == group and info.version == version:
+                    resources.append({"name": plural, "singularName": info.kind.lower(), "kind": info.kind,
+                                      "namespaced": info.namespaced,
+                                      "verbs": ["create", "delete", "get", "list", "patch", "update", "watch"]})
+                    resources.extend({"name": f"{plural}/{sub}", "kind": info.kind, "namespaced": info.namespaced,
+                                      "verbs": ["get"]} for sub in SUBRESOURCES.get(plural, ()))
+            if not resources:
+                raise ApiError(404, "NotFound", "the server could not find the requested resource")
+            self._send_json({"kind": "APIResourceList", "groupVersion": "/".join(parts[1:]), "resources": resources})
+        else:
+            return False
+        return True
+
+    # -- verbs -----------------------------------------------------------
+
+    def _get(self, parts: List[str], query: Dict[str, List[str]]) -> None:
+        if self._discovery(parts):
+            return
+        resource, namespace, name, sub = self._resolve(parts)
+        store = self.server.store
+        if name is None:
+            if query.get("watch", [""])[0].lower() in ("true", "1"):
+                return self._watch(resource, namespace, query)
+            return self._list(resource, namespace, query)
+        entry = store.get(resource, namespace or "", name)
+        if not sub:
+            return self._send(200, entry.body)
+        if resource == "pods" and sub == ["log"]:
+            return self._pod_log(entry, query)
+        if resource == "nodes" and sub[0] == "proxy":
+            return self._node_log(sub[1:], query)
+        raise ApiError(404, "NotFound", "the server could not find the requested resource")
+
+    def _list(self, resource: str, namespace: Optional[str], query: Dict[str, List[str]]) -> None:
+        info = RESOURCES[resource]
+        labels = parse_label_selector(query.get("labelSelector", [""])[0])
+        field_values = parse_field_selector(query.get("fieldSelector", [""])[0])
+        entries = self.server.store.list(resource, namespace)
+        # Every page re-lists the collection, so only filter when there is a selector.
+        if query.get("labelSelector", [""])[0] or query.get("fieldSelector", [""])[0]:
+            entries = [e for e in entries if labels(e.labels) and field_values(e.fields)]
+        resource_version = self.server.store.resource_version
+
+        start = 0
+        token = query.get("continue", [""])[0]
+        if token:
+            resource_version, start = (int(x) for x in token.split(":"))
+        limit = int(query.get("limit", ["0"])[0] or 0)
+        page = entries[start:start + limit] if limit else entries[start:]
+        end = start + len(page)
+        metadata: Dict[str, Any] = {"resourceVersion": str(resource_version)}
+        if limit and end < len(entries):
+            metadata["continue"] = f"{resource_version}:{end}"
+            metadata["remainingItemCount"] = len(entries) - end
+        head = json.dumps(metadata, separators=(",", ":")).encode()
+
+        accept = self.headers.get("Accept", "")
+        if "as=Table" in accept:
+            rows = b",".join(
+                b'{"cells":[' + json.dumps([e.name, e.created]).encode()[1:-1] + b"],"
+                b'"object":{"kind":"PartialObjectMetadata","apiVersion":"meta.k8s.io/v1","metadata":' + e.metadata + b"}}"
+                for e in page
+            )
+            body = (b'{"kind":"Table","apiVersion":"meta.k8s.io/v1","metadata":' + head +
+                    b',"columnDefinitions":[{"name":"Name","type":"string","format":"name"},'
+                    b'{"name":"Created At","type":"date"}],"rows":[' + rows + b"]}")
+        elif "as=PartialObjectMetadataList" in accept:
+            items = b",".join(b'{"kind":"PartialObjectMetadata","apiVersion":"meta.k8s.io/v1","metadata":' + e.metadata + b"}"
+                              for e in page)
+            body = (b'{"kind":"PartialObjectMetadataList","apiVersion":"meta.k8s.io/v1","metadata":' + head +
+                    b',"items":[' + items + b"]}")
+        else:
+            body = (b'{"kind":"' + info.kind.encode() + b'List","apiVersion":"' + info.api_version.encode() +
+                    b'","metadata":' + head + b',"items":[' + b",".join(e.body for e in page) + b"]}")
+        self._send(200, body)
+
+    def _watch(self, resource: str, namespace: Optional[str], query: Dict[str, List[str]]) -> None:
+        labels = parse_label_selector(query.get("labelSelector", [""])[0])
+        field_values = parse_field_selector(query.get("fieldSelector", [""])[0])
+        since = int(query.get("resourceVersion", ["0"])[0] or 0) or self.server.store.resource_version
+        timeout = min(float(query.get("timeoutSeconds", [str(MAX_WATCH_SECONDS)])[0]), MAX_WATCH_SECONDS)
+        deadline = time.monotonic() + timeout
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self.wfile.flush()
+        try:
+            while not self.server.stopping.is_set():
+                events = self.server.store.wait_events(resource, namespace, since, min(deadline, time.monotonic() + 1.0))
+                for resource_version, event_type, entry in events:
+                    since = resource_version
+                    if labels(entry.labels) and field_values(entry.fields):
+                        line = b'{"type":"' + event_type.encode() + b'","object":' + entry.body + b"}\n"
+                        self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+                self.wfile.flush()
+                if time.monotonic() >= deadline:
+                    break
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def _pod_log(self, entry: Entry, query: Dict[str, List[str]]) -> None:
+        container = query.get("container", [""])[0] or entry.name
+        lines = _log_lines(container, self.server.log_lines)
+        if "tailLines" in query:
+            lines = lines[-int(query["tailLines"][0]):] if int(query["tailLines"][0]) else []
+        body = b"".join(lines)
+        if "limitBytes" in query:
+            body = body[:int(query["limitBytes"][0])]
+        self._send(200, body, "text/plain")
+
+    def _node_log(self, path: List[str], query: Dict[str, List[str]]) -> None:
+        if path[:1] != ["logs"]:
+            raise ApiError(404, "NotFound", "the server could not find the requested resource")
+        if "query" in query:
+            lines = _log_lines(query["query"][0], self.server.log_lines)
+            if "pattern" in query:
+                pattern = re.compile(query["pattern"][0])
+                lines = [line for line in lines if pattern.search(line.decode())]
+            if "tailLines" in query:
+                lines = lines[-int(query["tailLines"][0]):]
+            return self._send(200, b"".join(lines), "text/plain")
+        if len(path) == 1:
+            listing = "".join(f'<a href="{name}">{name}</a>\n' for name in NODE_LOG_FILES)
+            return self._send(200, f"<pre>\n{listing}</pre>\n".encode(), "text/html")
+        if path[1] not in NODE_LOG_FILES:
+            raise ApiError(404, "NotFound", f"log file {path[1]} not found")
+        body = b"".join(_log_lines(path[1], self.server.log_lines))
+        byte_range = self.headers.get("Range")
+        if byte_range and byte_range.startswith("bytes="):
+            first, _, last = byte_range[len("bytes="):].partition("-")
+            part = body[int(first or 0):(int(last) + 1 if last else None)]
+            return self._send(206, part, "text/plain",
+                              {"Content-Range": f"bytes {first or 0}-{int(first or 0) + len(part) - 1}/{len(body)}"})
+        self._send(200, body, "text/plain")
+
+    def _post(self, parts: List[str], query: Dict[str, List[str]]) -> None:
+        resource, namespace, name, _ = self._resolve(parts)
+        if name is not None:
+            raise ApiError(405, "MethodNotAllowed", "POST to an object URL")
+        obj = self._body()
+        info = RESOURCES[resource]
+        obj.setdefault("apiVersion", info.api_version)
+        obj.setdefault("kind", info.kind)
+        entry = self.server.store.create(resource, namespace or "", obj, dry_run="dryRun" in query)
+        self._send(201, entry.body)
+        if resource == "pods" and "dryRun" not in query and not obj.get("status"):
+            timer = threading.Timer(POD_START_SECONDS, _start_pod,
+                                    (self.server.store, namespace, obj["metadata"]["name"]))
+            timer.daemon = True
+            timer.start()
+
+    def _put(self, parts: List[str], query: Dict[str, List[str]]) -> None:
+        resource, namespace, name, _ = self._resolve(parts)
+        obj = self._body()
+        entry, created = self.server.store.replace(resource, namespace or "", name, lambda current: obj,
+                                                   dry_run="dryRun" in query)
+        self._send(201 if created else 200, entry.body)
+
+    def _delete(self, parts: List[str], query: Dict[str, List[str]]) -> None:
+        resource, namespace, name, _ = self._resolve(parts)
+        self._body()
+        entry = self.server.store.delete(resource, namespace or "", name, dry_run="dryRun" in query)
+        self._send(200, entry.body)
+
+    def _patch(self, parts: List[str], query: Dict[str, List[str]]) -> None:
+        resource, namespace, name, _ = self._resolve(parts)
+        patch = self._body()
+        content_type = (self.headers.get("Content-Type") or "").split(";")[0]
+
+        def mutate(current: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+            if content_type == "application/apply-patch+yaml":
+                if current is None:
+                    return patch
+                # Fields the applier no longer sets are not pruned here; a
+                # benchmark only needs the resulting object to be plausible.
+                return _merge(current, patch)
+            if current is None:
+                raise ApiError(404, "NotFound", f'{resource} "{name}" not found')
+            if content_type == "application/json-patch+json":
+                return _json_patch(current, patch)
+            return _merge(current, patch)
+
+        entry, created = self.server.store.replace(resource, namespace or "", name, mutate, dry_run="dryRun" in query)
+        self._send(201 if created else 200, entry.body)
+
+
+def _start_pod(store: Store, namespace: str, name: str) -> None:
+    def mutate(current: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if current is None:
+            raise ApiError(404, "NotFound", f'pods "{name}" not found')
+        now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        containers = (current.get("spec") or {}).get("containers") or []
+        current["status"] = {
+            "phase": "Running",
+            "startTime": now,
+            "conditions": [{"type": "Ready", "status": "True", "lastTransitionTime": now}],
+            "containerStatuses": [{"name": c.get("name"), "image": c.get("image"), "ready": True,
+                                   "restartCount": 0, "state": {"running": {"startedAt": now}}}
+                                  for c in containers],
+        }
+        return current
+
+    try:
+        store.replace("pods", namespace, name, mutate)
+    except ApiError:
+        pass  # Deleted before it started.
+
+
+class FakeApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Many tool calls share a few pooled connections; keep the backlog deep.
+    request_queue_size = 128
+
+    def __init__(self, store: Store, host: str = "127.0.0.1", port: int = 0, log_lines: int = 2000):
+        super().__init__((host, port), Handler)
+        self.store = store
+        self.log_lines = log_lines
+        self.stopping = threading.Event()
+        self.requests = 0
+        self._requests_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_request(self) -> None:
+        with self._requests_lock:
+            self.requests += 1
+
+    def start(self) -> "FakeApiServer":
+        threading.Thread(target=self.serve_forever, name="fake-apiserver", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.stopping.set()
+        self.shutdown()
+        self.server_close()
+
+
+def serve_fleet(spec: FleetSpec, port: int = 0, log_lines: int = 2000) -> FakeApiServer:
+    """Build the fleet and start serving it on a background thread."""
+    store = Store()
+    store.load(generate(spec))
+    return FakeApiServer(store, port=port, log_lines=log_lines).start()
+
+
+def _fleet_arguments(parser: argparse.ArgumentParser) -> None:
+    for field in fields(FleetSpec):
+        parser.add_argument(f"--{field.name.replace('_', '-')}", type=int, default=field.default,
+                            help=f"default {field.default}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    _fleet_arguments(parser)
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--log-lines", type=int, default=2000, help="lines in every pod and node log")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    spec = FleetSpec(**{f.name: getattr(args, f.name) for f in fields(FleetSpec)})
+    server = serve_fleet(spec, args.port, args.log_lines)
+    # The first line of output tells a parent process where to connect.
+    print(json.dumps({"url": server.url, "resourceVersion": server.store.resource_version,
+                      "seconds": round(time.perf_counter() - started, 3)}), flush=True)
+    try:
+        # Serve until stdin closes (the parent exited) or Ctrl-C.
+        sys.stdin.read()
+    except KeyboardInterrupt:
+        pass
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+import random
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Iterator, Tuple
+
+# (cpu cores, memory GiB, GPUs) per instance type
+INSTANCE_TYPES = {
+    "m5.xlarge": (4, 16, 0),
+    "m5.2xlarge": (8, 32, 0),
+    "c5.4xlarge": (16, 32, 0),
+    "r5.2xlarge": (8, 64, 0),
+    "p3.2xlarge": (8, 61, 1),
+}
+ZONES = ("a", "b", "c")
+REGIONS = ("us-east-1", "us-west-2", "eu-west-1")
+ENVIRONMENTS = ("prod", "staging", "dev")
+APPS = ("web", "api", "worker", "cache", "batch", "gateway", "auth", "search", "billing", "metrics")
+CREATED = "2026-01-01T00:00:00Z"
+
+
+@dataclass
+class FleetSpec:
+    """Sizes of the synthetic fleet a benchmark runs against."""
+    nodes: int = 5000
+    pods: int = 100000
+    namespaces: int = 2000
+    policies: int = 1000
+    clusters: int = 500
+    deployments_per_namespace: int = 5
+    configmaps_per_namespace: int = 2
+    # Extra namespaces, pods and policies that delete benchmarks remove.
+    scratch: int = 200
+    seed: int = 1
+
+
+# (resource, namespace or "" when cluster-scoped, object)
+FleetObject = Tuple[str, str, Dict[str, Any]]
+
+
+def _metadata(name: str, namespace: str = "", labels: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    metadata = {"name": name, "uid": f"uid-{namespace}-{name}", "creationTimestamp": CREATED, "labels": labels or {}}
+    if namespace:
+        metadata["namespace"] = namespace
+    return metadata
+
+
+def namespace_name(i: int) -> str:
+    return f"ns-{i:04d}"
+
+
+def node_name(i: int) -> str:
+    return f"node-{i:05d}"
+
+
+def cluster_name(i: int) -> str:
+    return f"cluster-{i:04d}"
+
+
+def policy_name(i: int) -> str:
+    return f"policy-{i:04d}"
+
+
+def pod_ref(i: int, spec: FleetSpec) -> Tuple[str, str]:
+    """(namespace, name) of the i-th generated pod."""
+    namespace = namespace_name(i % spec.namespaces) if spec.namespaces else "default"
+    return namespace, f"{APPS[i % len(APPS)]}-{i:06d}"
+
+
+def _node(i: int, rng: random.Random) -> Dict[str, Any]:
+    instance_type = list(INSTANCE_TYPES)[i % len(INSTANCE_TYPES)]
+    cpu, memory, gpus = INSTANCE_TYPES[instance_type]
+    region = REGIONS[i % len(REGIONS)]
+    capacity = {"cpu": str(cpu), "memory": f"{memory}Gi", "pods": "110", "ephemeral-storage": "100Gi"}
+    allocatable = {"cpu": f"{cpu * 1000 - 200}m", "memory": f"{memory * 1024 - 800}Mi", "pods": "110",
+                   "ephemeral-storage": "95Gi"}
+    if gpus:
+        capacity["nvidia.com/gpu"] = allocatable["nvidia.com/gpu"] = str(gpus)
+    ready = rng.random() > 0.02
+    pressure = rng.random() < 0.01
+    name = node_name(i)
+    return {
+        "apiVersion": "v1",
+        "kind": "Node",
+        "metadata": _metadata(name, labels={
+            "kubernetes.io/hostname": name,
+            "kubernetes.io/os": "linux",
+            "node.kubernetes.io/instance-type": instance_type,
+            "topology.kubernetes.io/region": region,
+            "topology.kubernetes.io/zone": f"{region}{ZONES[i % len(ZONES)]}",
+            "node-role.kubernetes.io/worker": "",
+        }),
+        "spec": {"podCIDR": f"10.{i // 256 % 256}.{i % 256}.0/24", "providerID": f"aws:///{region}/i-{i:08x}"},
+        "status": {
+            "capacity": capacity,
+            "allocatable": allocatable,
+            "conditions": [
+                {"type": "MemoryPressure", "status": "True" if pressure else "False", "reason": "KubeletHasSufficientMemory"},
+                {"type": "DiskPressure", "status": "False", "reason": "KubeletHasNoDiskPressure"},
+                {"type": "PIDPressure", "status": "False", "reason": "KubeletHasSufficientPID"},
+                {"type": "Ready", "status": "True" if ready else "False",
+                 "reason": "KubeletReady" if ready else "KubeletNotReady"},
+            ],
+            "addresses": [{"type": "InternalIP", "address": f"10.0.{i // 256 % 256}.{i % 256}"},
+                          {"type": "Hostname", "address": name}],
+            "nodeInfo": {"kubeletVersion": "v1.30.2", "kubeProxyVersion": "v1.30.2",
+                         "containerRuntimeVersion": "containerd://1.7.13", "kernelVersion": "6.5.0-1020-aws",
+                         "osImage": "Ubuntu 22.04.4 LTS", "operatingSystem": "linux", "architecture": "amd64",
+                         "bootID": f"boot-{i:08x}", "machineID": f"machine-{i:08x}", "systemUUID": f"uuid-{i:08x}"},
+        },
+    }
+
+
+def _namespace(i: int) -> Dict[str, Any]:
+    name = namespace_name(i)
+    return {
+        "apiVersion": "v1",
+        "kind": "Namespace",
+        "metadata": _metadata(name, labels={
+            "kubernetes.io/metadata.name": name,
+            "team": f"team-{i % 40:02d}",
+            "env": ENVIRONMENTS[i % len(ENVIRONMENTS)],
+        }),
+        "spec": {"finalizers": ["kubernetes"]},
+        "status": {"phase": "Active"},
+    }
+
+
+def _pod(i: int, namespace: str, node: str, rng: random.Random) -> Dict[str, Any]:
+    app = APPS[i % len(APPS)]
+    roll = rng.random()
+    phase = "Running" if roll < 0.9 else "Pending" if roll < 0.94 else "Succeeded" if roll < 0.97 else "Failed"
+    restarts = int(rng.expovariate(0.5)) if rng.random() < 0.2 else 0
+    containers = [{
+        "name": app,
+        "image": f"registry.example.com/{app}:1.{i % 7}.0",
+        "ports": [{"containerPort": 8080, "protocol": "TCP"}],
+        "resources": {"requests": {"cpu": f"{100 * (1 + i % 4)}m", "memory": f"{128 * (1 + i % 3)}Mi"},
+                      "limits": {"cpu": f"{500 * (1 + i % 2)}m", "memory": f"{512 * (1 + i % 3)}Mi"}},
+    }]
+    if i % 5 == 0:
+        containers.append({"name": "proxy", "image": "registry.example.com/proxy:2.1.0",
+                           "resources": {"requests": {"cpu": "50m", "memory": "64Mi"}}})
+    statuses = []
+    for container in containers:
+        status = {"name": container["name"], "image": container["image"], "imageID": f"sha256:{i % 7:064x}",
+                  "ready": phase == "Running",
+                  "restartCount": restarts, "started": phase == "Running",
+                  "containerID": f"containerd://{i:064x}"}
+        if phase == "Running":
+            status["state"] = {"running": {"startedAt": CREATED}}
+        elif phase == "Pending":
+            status["state"] = {"waiting": {"reason": rng.choice(("ContainerCreating", "ImagePullBackOff", "CrashLoopBackOff"))}}
+        else:
+            status["state"] = {"terminated": {"exitCode": 0 if phase == "Succeeded" else 137,
+                                              "reason": "Completed" if phase == "Succeeded" else "OOMKilled"}}
+        if restarts:
+            status["lastState"] = {"terminated": {"exitCode": 1, "reason": "Error"}}
+        statuses.append(status)
+    return {
+        "apiVersion": "v1",
+        "kind": "Pod",
+        "metadata": _metadata(f"{app}-{i:06d}", namespace, {"app": app, "tier": "backend" if i % 2 else "frontend",
+                                                           "pod-template-hash": f"{i % 9973:04x}"}),
+        "spec": {"nodeName": node, "containers": containers, "restartPolicy": "Always",
+                 "serviceAccountName": "default", "schedulerName": "default-scheduler"},
+        "status": {
+            "phase": phase,
+            "podIP": f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}",
+            "hostIP": "10.0.0.1",
+            "startTime": CREATED,
+            "qosClass": "Burstable",
+            "conditions": [{"type": t, "status": "True" if phase == "Running" else "False"}
+                           for t in ("Initialized", "Ready", "ContainersReady", "PodScheduled")],
+            "containerStatuses": statuses,
+        },
+    }
+
+
+def _deployment(namespace: str, app: str) -> Dict[str, Any]:
+    return {
+        "apiVersion": "apps/v1",
+        "kind": "Deployment",
+        "metadata": _metadata(app, namespace, {"app": app}),
+        "spec": {"replicas": 3, "selector": {"matchLabels": {"app": app}},
+                 "template": {"metadata": {"labels": {"app": app}},
+                              "spec": {"containers": [{"name": app, "image": f"registry.example.com/{app}:1.0.0"}]}}},
+        "status": {"replicas": 3, "readyReplicas": 3, "availableReplicas": 3},
+    }
+
+
+def _configmap(namespace: str, i: int) -> Dict[str, Any]:
+    return {
+        "apiVersion": "v1",
+        "kind": "ConfigMap",
+        "metadata": _metadata(f"config-{i}", namespace, {"app": APPS[i % len(APPS)]}),
+        "data": {"settings.yaml": "replicas: 3\nlogLevel: info\n"},
+    }
+
+
+def _managed_cluster(i: int) -> Dict[str, Any]:
+    return {
+        "apiVersion": "cluster.open-cluster-management.io/v1",
+        "kind": "ManagedCluster",
+        "metadata": _metadata(cluster_name(i), labels={
+            "name": cluster_name(i),
+            "env": ENVIRONMENTS[i % len(ENVIRONMENTS)],
+            "region": REGIONS[i % len(REGIONS)],
+            "tier": f"tier-{i % 4}",
+            **({"gpu": "true"} if i % 10 == 0 else {}),
+        }),
+        "spec": {"hubAcceptsClient": True},
+        "status": {"conditions": [{"type": "ManagedClusterConditionAvailable", "status": "True"}]},
+    }
+
+
+def _binding_policy(name: str, i: int, namespaces: int) -> Dict[str, Any]:
+    selector = {"matchLabels": {"env": ENVIRONMENTS[i % len(ENVIRONMENTS)]}}
+    if i % 3 == 0:
+        selector["matchExpressions"] = [{"key": "region", "operator": "In", "values": list(REGIONS[:1 + i % 3])}]
+    rules = [{
+        "apiGroup": "apps",
+        "resources": ["deployments"],
+        "namespaces": [namespace_name(i % max(1, namespaces))],
+        "objectSelectors": [{"matchLabels": {"app": APPS[i % len(APPS)]}}],
+    }]
+    if i % 4 == 0:
+        rules.append({"apiGroup": "", "resources": ["configmaps"], "namespaces": [namespace_name(i % max(1, namespaces))]})
+    if i % 50 == 0:
+        rules.append({"apiGroup": "", "resources": ["namespaces"],
+                      "namespaceSelectors": [{"matchLabels": {"team": f"team-{i % 40:02d}"}}]})
+    return {
+        "apiVersion": "control.kubestellar.io/v1alpha1",
+        "kind": "BindingPolicy",
+        "metadata": _metadata(name),
+        "spec": {"clusterSelectors": [selector], "downsync": rules},
+        "status": {"conditions": [{"type": "Ready", "status": "True"}]},
+    }
+
+
+def generate(spec: FleetSpec) -> Iterator[FleetObject]:
+    """Every object of the fleet, deterministically for a given seed."""
+    rng = random.Random(spec.seed)
+    for i in range(spec.nodes):
+        yield "nodes", "", _node(i, rng)
+    for i in range(spec.namespaces):
+        namespace = _namespace(i)
+        yield "namespaces", "", namespace
+        name = namespace["metadata"]["name"]
+        for app in APPS[:spec.deployments_per_namespace]:
+            yield "deployments", name, _deployment(name, app)
+        for j in range(spec.configmaps_per_namespace):
+            yield "configmaps", name, _configmap(name, j)
+    for i in range(spec.pods):
+        namespace, _ = pod_ref(i, spec)
+        yield "pods", namespace, _pod(i, namespace, node_name(i % max(1, spec.nodes)), rng)
+    for i in range(spec.clusters):
+        yield "managedclusters", "", _managed_cluster(i)
+    for i in range(spec.policies):
+        yield "bindingpolicies", "", _binding_policy(policy_name(i), i, spec.namespaces)
+
+    yield "namespaces", "", {"apiVersion": "v1", "kind": "Namespace", "metadata": _metadata("default"),
+                             "status": {"phase": "Active"}}
+    for i in range(spec.scratch):
+        yield "namespaces", "", {"apiVersion": "v1", "kind": "Namespace",
+                                 "metadata": _metadata(f"scratch-{i}", labels={"scratch": "true"}),
+                                 "status": {"phase": "Active"}}
+        yield "pods", "default", _pod(i, "default", node_name(0), rng) | {"metadata": _metadata(f"scratch-{i}", "default")}
+        yield "bindingpolicies", "", _binding_policy(f"scratch-{i}", i, spec.namespaces)
@@ -0,0 +1,396 @@
+"""
+Benchmark every tool against a fake API server serving a synthetic fleet.
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --compare results.json
+
+Each scenario runs in a fresh worker process, so allocations, peak RSS and
+caches are its own. Results are written as JSON for comparing commits.
+"""
+import argparse
+import asyncio
+import fnmatch
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+from dataclasses import asdict, fields
+from typing import Optional, List, Dict, Tuple, Any
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from benchmarks.fleet import FleetSpec
+from benchmarks.scenarios import SCENARIOS, Run, Scenario, WDS, ITS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKER_TIMEOUT = 900
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of values (q in 0..100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), -(-len(ordered) * q // 100)))
+    return ordered[int(rank) - 1]
+
+
+def peak_rss() -> Optional[int]:
+    """Peak resident set size of this process in bytes."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux and in bytes on macOS.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _decode(contents: List[Any]) -> Any:
+    """The tool's return value from the MCP content it was converted to."""
+    values = []
+    for content in contents:
+        text = getattr(content, "text", None)
+        try:
+            values.append(json.loads(text))
+        except (TypeError, ValueError):
+            values.append(text)
+    return values[0] if len(values) == 1 else values
+
+
+def _error_of(value: Any) -> Optional[str]:
+    if isinstance(value, dict) and "error" in value:
+        return f"{value['error']}: {value.get('message', '')}"
+    return None
+
+
+def _server_requests(server_url: str) -> int:
+    with urllib.request.urlopen(f"{server_url}/fake/requests") as response:
+        return json.load(response)["requests"]
+
+
+# -- worker: one scenario in its own process ----------------------------
+
+async def _measure(scenario: Scenario, spec: FleetSpec, options: argparse.Namespace) -> Dict[str, Any]:
+    started = time.perf_counter()
+    import main
+    mcp = main.mcp
+    import_seconds = time.perf_counter() - started
+    rss_at_start = peak_rss()
+
+    async def call(tool: str, arguments: Dict[str, Any]) -> Any:
+        return _decode(await mcp.call_tool(tool, arguments))
+
+    calls = 1 + options.iterations + options.throughput_calls + 1
+    run = Run(spec=spec, call=call, calls=calls)
+    if scenario.setup is not None:
+        run.state = await scenario.setup(run)
+
+    counter = iter(range(calls))
+    errors: List[str] = []
+    response_bytes: List[int] = []
+
+    async def invoke() -> float:
+        arguments = scenario.arguments(next(counter), run)
+        begin = time.perf_counter()
+        try:
+            contents = await mcp.call_tool(scenario.tool, arguments)
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+            return time.perf_counter() - begin
+        elapsed = time.perf_counter() - begin
+        response_bytes.append(sum(len(getattr(c, "text", "") or "") for c in contents))
+        error = _error_of(_decode(contents))
+        if error:
+            errors.append(error)
+        return elapsed
+
+    first_call = await invoke()
+
+    # Each timed phase stops early once it has used half the time budget,
+    # so tools that page through the whole fleet do not dominate the run.
+    phase_budget = options.time_budget / 2
+    requests_before = _server_requests(options.server_url)
+    latencies = []
+    latency_started = time.perf_counter()
+    while len(latencies) < options.iterations:
+        latencies.append(await invoke())
+        if len(latencies) >= 3 and time.perf_counter() - latency_started > phase_budget:
+            break
+    api_requests = _server_requests(options.server_url) - requests_before
+
+    throughput_started = time.perf_counter()
+    remaining = options.throughput_calls
+    made = 0
+
+    async def caller() -> None:
+        nonlocal remaining, made
+        while remaining > 0:
+            if made >= options.concurrency and time.perf_counter() - throughput_started > phase_budget:
+                break
+            remaining -= 1
+            await invoke()
+            made += 1
+
+    await asyncio.gather(*(caller() for _ in range(options.concurrency)))
+    throughput_seconds = time.perf_counter() - throughput_started
+
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    await invoke()
+    current, peak = tracemalloc.get_traced_memory()
+    blocks = sum(stat.count_diff for stat in tracemalloc.take_snapshot().compare_to(snapshot, "filename"))
+    tracemalloc.stop()
+
+    return {
+        "tool": scenario.tool,
+        "variant": scenario.variant,
+        "samples": len(latencies),
+        "throughputCalls": made,
+        "errors": len(errors),
+        "firstError": errors[0] if errors else None,
+        "importSeconds": round(import_seconds, 4),
+        "firstCallMs": round(first_call * 1000, 3),
+        "p50Ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99Ms": round(percentile(latencies, 99) * 1000, 3),
+        "meanMs": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        "maxMs": round(max(latencies, default=0.0) * 1000, 3),
+        "throughputPerSecond": round(made / throughput_seconds, 2) if throughput_seconds else None,
+        "apiRequestsPerCall": round(api_requests / len(latencies), 2),
+        "responseBytes": max(response_bytes, default=0),
+        "allocPeakBytes": peak - baseline,
+        "allocRetainedBytes": current - baseline,
+        "allocRetainedBlocks": blocks,
+        "rssAtStartBytes": rss_at_start,
+        "peakRssBytes": peak_rss(),
+    }
+
+
+def _worker(options: argparse.Namespace, spec: FleetSpec) -> None:
+    scenario = next(s for s in SCENARIOS if s.name == options.worker)
+    try:
+        result = asyncio.run(_measure(scenario, spec, options))
+    except Exception as e:
+        result = {"tool": scenario.tool, "variant": scenario.variant, "failed": f"{type(e).__name__}: {e}"}
+    with open(options.result_file, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+
+
+# -- orchestrator ---------------------------------------------------------
+
+def _write_kubeconfig(path: str, server_url: str, scratch: int) -> None:
+    names = ["wds1", "wds2", ITS] + [f"scratch-{i}" for i in range(scratch)]
+    document = {
+        "apiVersion": "v1",
+        "kind": "Config",
+        "current-context": WDS,
+        "clusters": [{"name": "fake", "cluster": {"server": server_url}}],
+        "users": [{"name": "fake", "user": {"token": "benchmark"}}],
+        "contexts": [{"name": name, "context": {"cluster": "fake", "user": "fake"}} for name in names],
+    }
+    # JSON is valid YAML, and keeps the orchestrator free of a yaml import.
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=1)
+
+
+def _start_server(spec: FleetSpec, log_lines: int) -> Tuple[subprocess.Popen, Dict[str, Any]]:
+    argv = [sys.executable, "-m", "benchmarks.fake_apiserver", "--log-lines", str(log_lines)]
+    for field in fields(FleetSpec):
+        argv += [f"--{field.name.replace('_', '-')}", str(getattr(spec, field.name))]
+    server = subprocess.Popen(argv, cwd=ROOT, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    line = server.stdout.readline()
+    if not line:
+        server.kill()
+        raise RuntimeError("fake API server failed to start")
+    return server, json.loads(line)
+
+
+def _startup() -> Dict[str, Any]:
+    completed = subprocess.run([sys.executable, "-W", "ignore", "main.py", "--startup-time"], cwd=ROOT,
+                               capture_output=True, text=True)
+    try:
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        return {"failed": completed.stderr.strip()[-2000:]}
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _select(patterns: Optional[str]) -> List[Scenario]:
+    if not patterns:
+        return list(SCENARIOS)
+    wanted = [p.strip() for p in patterns.split(",") if p.strip()]
+    return [s for s in SCENARIOS if any(fnmatch.fnmatchcase(s.name, p) or fnmatch.fnmatchcase(s.tool, p) for p in wanted)]
+
+
+def _uncovered() -> List[str]:
+    import main
+    covered = {s.tool for s in SCENARIOS}
+    return sorted(t.name for t in main.mcp._tool_manager.list_tools() if t.name not in covered)
+
+
+def _print_summary(results: Dict[str, Dict[str, Any]]) -> None:
+    header = f"{'scenario':44} {'p50 ms':>9} {'p99 ms':>9} {'calls/s':>9} {'req/call':>8} {'alloc KiB':>10} {'RSS MiB':>8} {'err':>4}"
+    print(header, file=sys.stderr)
+    for name, r in results.items():
+        if "failed" in r:
+            print(f"{name:44} FAILED: {r['failed']}", file=sys.stderr)
+            continue
+        print(f"{name:44} {r['p50Ms']:9.2f} {r['p99Ms']:9.2f} {r['throughputPerSecond'] or 0:9.1f} "
+              f"{r['apiRequestsPerCall'] or 0:8.1f} {r['allocPeakBytes'] / 1024:10.0f} "
+              f"{(r['peakRssBytes'] or 0) / 2 ** 20:8.0f} {r['errors']:4d}", file=sys.stderr)
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float, floor_ms: float) -> List[str]:
+    """
+    Scenarios whose p50 or p99 latency grew by more than threshold (a
+    fraction) and by more than floor_ms, which keeps noise on sub-millisecond
+    tools from counting as a regression.
+    """
+    regressions = []
+    for name, now in current.get("tools", {}).items():
+        before = baseline.get("tools", {}).get(name)
+        if not before or "failed" in before or "failed" in now:
+            continue
+        for metric in ("p50Ms", "p99Ms"):
+            old, new = before[metric], now[metric]
+            if new - old > floor_ms and old > 0 and new / old > 1 + threshold:
+                regressions.append(f"{name}: {metric} {old:.2f} -> {new:.2f} ms ({new / old - 1:+.0%})")
+    return regressions
+
+
+def _orchestrate(options: argparse.Namespace, spec: FleetSpec) -> int:
+    scenarios = _select(options.tools)
+    if not scenarios:
+        print(f"No scenario matches {options.tools!r}", file=sys.stderr)
+        return 2
+    calls = 1 + options.iterations + options.throughput_calls + 1
+    spec.scratch = max(spec.scratch, calls)
+
+    server, started = _start_server(spec, options.log_lines)
+    print(f"Fake API server at {started['url']} ({started['resourceVersion']} objects, "
+          f"built in {started['seconds']} s)", file=sys.stderr)
+    workdir = tempfile.mkdtemp(prefix="kubralis-bench-")
+    template = os.path.join(workdir, "kubeconfig")
+    _write_kubeconfig(template, started["url"], calls)
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        for scenario in scenarios:
+            # A kubeconfig of its own, since the space_management tools edit it.
+            kubeconfig = os.path.join(workdir, f"kubeconfig-{len(results)}")
+            shutil.copyfile(template, kubeconfig)
+            result_file = os.path.join(workdir, f"result-{len(results)}.json")
+            env = dict(os.environ, KUBECONFIG=kubeconfig, PYTHONWARNINGS="ignore")
+            # Measure the tools, not the client-side rate limit (unless asked to).
+            env.setdefault("KUBRALIS_QPS", "0")
+            if options.cache:
+                env["KUBRALIS_CACHE"] = "all"
+            argv = [sys.executable, "-m", "benchmarks.run", "--worker", scenario.name,
+                    "--server-url", started["url"], "--result-file", result_file,
+                    "--iterations", str(options.iterations), "--concurrency", str(options.concurrency),
+                    "--throughput-calls", str(options.throughput_calls),
+                    "--time-budget", str(options.time_budget)]
+            for field in fields(FleetSpec):
+                argv += [f"--{field.name.replace('_', '-')}", str(getattr(spec, field.name))]
+            print(f"  {scenario.name} ...", file=sys.stderr, flush=True)
+            try:
+                subprocess.run(argv, cwd=ROOT, env=env, timeout=WORKER_TIMEOUT, stdout=subprocess.DEVNULL)
+                with open(result_file, encoding="utf-8") as f:
+                    results[scenario.name] = json.load(f)
+            except (subprocess.TimeoutExpired, OSError, ValueError) as e:
+                results[scenario.name] = {"tool": scenario.tool, "variant": scenario.variant,
+                                          "failed": f"{type(e).__name__}: {e}"}
+    finally:
+        server.stdin.close()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "commit": _commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "fleet": asdict(spec),
+            "iterations": options.iterations,
+            "concurrency": options.concurrency,
+            "throughputCalls": options.throughput_calls,
+            "timeBudgetSeconds": options.time_budget,
+            "cache": options.cache,
+            "serverBuildSeconds": started["seconds"],
+        },
+        "startup": _startup(),
+        "uncoveredTools": _uncovered(),
+        "tools": results,
+    }
+    _print_summary(results)
+    text = json.dumps(report, indent=2)
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"Results written to {options.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if options.compare:
+        with open(options.compare, encoding="utf-8") as f:
+            regressions = compare(json.load(f), report, options.threshold, options.floor_ms)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions against {options.compare}", file=sys.stderr)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    for field in fields(FleetSpec):
+        parser.add_argument(f"--{field.name.replace('_', '-')}", type=int, default=field.default,
+                            help=f"fleet size (default {field.default})")
+    parser.add_argument("--iterations", type=int, default=20, help="sequential calls timed for p50/p99")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent callers in the throughput phase")
+    parser.add_argument("--throughput-calls", type=int, default=64, help="calls made in the throughput phase")
+    parser.add_argument("--time-budget", type=float, default=60.0,
+                        help="seconds after which a scenario's timed phases stop early (at least 3 samples are kept)")
+    parser.add_argument("--log-lines", type=int, default=2000, help="lines in every pod and node log")
+    parser.add_argument("--tools", help="comma-separated scenario or tool names (glob patterns allowed)")
+    parser.add_argument("--cache", action="store_true", help="run with KUBRALIS_CACHE=all")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", help="a previous JSON report to check for latency regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown counted as a regression")
+    parser.add_argument("--floor-ms", type=float, default=2.0, help="absolute slowdown below which nothing counts")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--server-url", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    options = parser.parse_args(argv)
+    options.iterations = max(1, options.iterations)
+    options.concurrency = max(1, options.concurrency)
+    spec = FleetSpec(**{f.name: getattr(options, f.name) for f in fields(FleetSpec)})
+
+    if options.worker:
+        _worker(options, spec)
+        return 0
+    return _orchestrate(options, spec)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
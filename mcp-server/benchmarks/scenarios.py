@@ -0,0 +1,179 @@
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, Callable, Awaitable
+
+from benchmarks.fleet import FleetSpec, APPS, cluster_name, namespace_name, node_name, pod_ref, policy_name
+
+# Contexts of the benchmark kubeconfig; all point at the fake API server.
+WDS = "wds1"
+ITS = "its1"
+
+
+@dataclass
+class Run:
+    """What a scenario's arguments are built from: the fleet and its setup state."""
+    spec: FleetSpec
+    call: Callable[[str, Dict[str, Any]], Awaitable[Any]]
+    # Calls the benchmark will make, warm-up included.
+    calls: int
+    state: Any = None
+
+
+@dataclass
+class Scenario:
+    """
+    One way of calling a tool. arguments(i, run) gives the arguments of the
+    i-th call; calls that create or delete objects use i to pick unique
+    names. setup(run) runs once before the first call.
+    """
+    tool: str
+    arguments: Callable[[int, Run], Dict[str, Any]]
+    variant: str = ""
+    setup: Optional[Callable[[Run], Awaitable[Any]]] = None
+    # Whether every call needs an object of its own (a "scratch-<i>" one).
+    consumes_scratch: bool = False
+
+    @property
+    def name(self) -> str:
+        return f"{self.tool}[{self.variant}]" if self.variant else self.tool
+
+
+def _pod(i: int, run: Run) -> Dict[str, Any]:
+    namespace, name = pod_ref(i % max(1, run.spec.pods), run.spec)
+    return {"namespace": namespace, "pod_name": name, "context": WDS}
+
+
+def _namespace(i: int, run: Run) -> str:
+    return namespace_name(i % max(1, run.spec.namespaces))
+
+
+def _pod_template(name: str) -> Dict[str, Any]:
+    return {"metadata": {"name": name, "labels": {"app": "bench"}},
+            "spec": {"containers": [{"name": "web", "image": "nginx"}]}}
+
+
+def _policy_spec(name: str, i: int) -> Dict[str, Any]:
+    return {
+        "policy_name": name,
+        "cluster_labels": {"env": "prod"},
+        "workload_labels": {"app": APPS[i % len(APPS)]},
+        "resource_configs": [{"Type": "deployments"}, {"Type": "configmaps"}],
+        "namespaces_to_sync": [namespace_name(i)],
+    }
+
+
+async def _node_cursor(run: Run) -> str:
+    result = await run.call("get_nodes", {"context": WDS})
+    if not isinstance(result, dict) or "cursor" not in result:
+        raise RuntimeError("get_nodes did not return a cursor; raise --nodes above the cursor threshold")
+    return result["cursor"]
+
+
+async def _cursors(run: Run) -> List[str]:
+    from k8s.cursors import stash_items
+
+    items = [{"metadata": {"name": f"item-{i}", "labels": {"app": APPS[i % len(APPS)]}}, "padding": "x" * 100}
+             for i in range(3000)]
+    return [stash_items(items, "benchmark")["cursor"] for _ in range(run.calls)]
+
+
+SCENARIOS: List[Scenario] = [
+    # k8s/cluster_management.py
+    Scenario("list_all_clusters", lambda i, run: {"context": WDS}),
+    Scenario("list_all_clusters", lambda i, run: {"context": WDS, "output": "table"}, "table"),
+    Scenario("get_cluster_details", lambda i, run: {"cluster_name": node_name(i % run.spec.nodes), "context": WDS}),
+    Scenario("get_cluster_status", lambda i, run: {"cluster_name": node_name(i % run.spec.nodes), "context": WDS}),
+    Scenario("get_cluster_logs", lambda i, run: {"cluster_name": node_name(0), "context": WDS,
+                                                 "log_path": "kubelet.log", "tail_lines": 200}),
+    Scenario("get_cluster_logs", lambda i, run: {"cluster_name": node_name(0), "context": WDS,
+                                                 "query": "kubelet", "pattern": "ERROR"}, "query"),
+    Scenario("get_fleet_capacity", lambda i, run: {"context": WDS}),
+    Scenario("get_fleet_capacity", lambda i, run: {"context": WDS, "group_by": "node.kubernetes.io/instance-type",
+                                                   "resources": ["cpu", "memory", "nvidia.com/gpu"]}, "instance-type"),
+
+    # k8s/namespace_management.py
+    Scenario("create_namespace", lambda i, run: {"namespace": f"bench-{i}", "context": WDS}),
+    Scenario("delete_namespace", lambda i, run: {"namespace": f"scratch-{i}", "context": WDS}, consumes_scratch=True),
+    Scenario("list_namespaces", lambda i, run: {"context": WDS}),
+    Scenario("list_namespaces", lambda i, run: {"context": WDS, "fields": ["metadata.name", "metadata.labels"]}, "fields"),
+    Scenario("create_labelled_namespace", lambda i, run: {"namespace": f"bench-labelled-{i}",
+                                                          "labels": {"team": "bench", "env": "dev"}, "context": WDS}),
+    Scenario("get_namespace_details", lambda i, run: {"namespace": _namespace(i, run), "context": WDS}),
+    Scenario("get_namespace_status", lambda i, run: {"namespace": _namespace(i, run), "context": WDS}),
+
+    # k8s/resource_management.py
+    Scenario("list_pods", lambda i, run: {"namespace": _namespace(i, run), "context": WDS}),
+    Scenario("list_pods", lambda i, run: {"namespace": _namespace(i, run), "context": WDS,
+                                          "label_selector": "app in (web,api)", "field_selector": "status.phase=Running"},
+             "selectors"),
+    Scenario("get_nodes", lambda i, run: {"context": WDS}),
+    Scenario("get_nodes", lambda i, run: {"context": WDS, "fields": ["metadata.name", "status.allocatable"]}, "fields"),
+    Scenario("get_nodes", lambda i, run: {"context": WDS, "use_cursor": False}, "no-cursor"),
+    Scenario("get_workload_rollup", lambda i, run: {"namespace": _namespace(i, run), "context": WDS}),
+    Scenario("get_workload_rollup", lambda i, run: {"context": WDS, "group_by": "app"}, "all-namespaces"),
+    Scenario("create_pod", lambda i, run: {"namespace": "default", "pod_name": f"bench-{i}", "image": "nginx",
+                                           "context": WDS}),
+    Scenario("delete_pod", lambda i, run: {"namespace": "default", "pod_name": f"scratch-{i}", "context": WDS},
+             consumes_scratch=True),
+    Scenario("create_pods", lambda i, run: {"template": _pod_template(f"bench-batch-{i}"), "replicas": 50,
+                                            "context": WDS}),
+    Scenario("create_pods", lambda i, run: {"template": _pod_template(f"bench-spread-{i}"), "replicas": 10,
+                                            "namespaces": [_namespace(i + k, run) for k in range(5)],
+                                            "context": WDS}, "namespaces"),
+    Scenario("wait_for", lambda i, run: {"resource": "namespaces", "name": _namespace(i, run), "condition": "Active",
+                                         "context": WDS}),
+    Scenario("wait_for", lambda i, run: {"resource": "pods", "namespace": _pod(i, run)["namespace"],
+                                         "label_selector": "app", "condition": "phase=Running", "match": "any",
+                                         "context": WDS}, "selector"),
+    Scenario("get_pod_logs", lambda i, run: {**_pod(i, run), "tail_lines": 200}),
+    Scenario("get_pod_logs", lambda i, run: _pod(i, run), "full"),
+    Scenario("get_pod_status", lambda i, run: _pod(i, run)),
+    Scenario("describe_pod", lambda i, run: _pod(i, run)),
+
+    # k8s/cursors.py
+    Scenario("read_cursor", lambda i, run: {"cursor": run.state, "offset": (i * 100) % max(1, run.spec.nodes)},
+             setup=_node_cursor),
+    Scenario("read_cursor", lambda i, run: {"cursor": run.state, "offset": (i * 100) % max(1, run.spec.nodes),
+                                            "sort_by": "metadata.name", "descending": True,
+                                            "where": {"status.node_info.architecture": "amd64"},
+                                            "fields": ["metadata.name"]},
+             "sorted", setup=_node_cursor),
+    Scenario("close_cursor", lambda i, run: {"cursor": run.state[i]}, setup=_cursors, consumes_scratch=True),
+
+    # kubestellar/binding_policy_management.py
+    Scenario("create_binding_policy", lambda i, run: {**_policy_spec(f"bench-{i}", i), "namespace": "default",
+                                                      "context": WDS}),
+    Scenario("list_binding_policies", lambda i, run: {"context": WDS}),
+    Scenario("delete_binding_policy", lambda i, run: {"policy_name": f"scratch-{i}", "context": WDS},
+             consumes_scratch=True),
+    Scenario("get_binding_policy_details", lambda i, run: {"policy_name": policy_name(i % run.spec.policies),
+                                                           "context": WDS}),
+    Scenario("get_binding_policy_status", lambda i, run: {"policy_name": policy_name(i % run.spec.policies),
+                                                          "context": WDS}),
+    Scenario("apply_binding_policies", lambda i, run: {"policies": [_policy_spec(f"applied-{j}", j) for j in range(50)],
+                                                       "context": WDS}),
+    Scenario("get_binding_policy_clusters", lambda i, run: {"policy_name": policy_name(i % run.spec.policies),
+                                                            "context": WDS, "inventory_context": ITS}),
+    Scenario("get_cluster_binding_policies", lambda i, run: {"cluster_name": cluster_name(i % run.spec.clusters),
+                                                             "context": WDS, "inventory_context": ITS}),
+    Scenario("get_binding_policy_cluster_matrix", lambda i, run: {"context": WDS, "inventory_context": ITS}),
+    Scenario("get_workload_binding_policies", lambda i, run: {"namespace": _namespace(i, run), "context": WDS,
+                                                              "inventory_context": ITS}),
+    Scenario("get_workload_binding_policies", lambda i, run: {"objects": [
+        {"apiVersion": "apps/v1", "kind": "Deployment",
+         "metadata": {"name": app, "namespace": _namespace(i, run), "labels": {"app": app}}} for app in APPS
+    ], "context": WDS, "inventory_context": ITS}, "objects"),
+    Scenario("update_binding_policy", lambda i, run: {"policy_name": policy_name(i % run.spec.policies),
+                                                      "workload_labels": {"app": APPS[i % len(APPS)], "rev": str(i)},
+                                                      "context": WDS}),
+    Scenario("update_binding_policy", lambda i, run: {"policy_name": policy_name(i % run.spec.policies),
+                                                      "cluster_labels": {"env": "prod", "rev": str(i)},
+                                                      "patch_type": "merge", "context": WDS}, "merge"),
+
+    # kubestellar/space_management.py
+    Scenario("list_wds_contexts", lambda i, run: {}),
+    Scenario("get_wds_context_details", lambda i, run: {"context_name": WDS}),
+    Scenario("create_wds_context", lambda i, run: {"context_name": f"wds-bench-{i}", "cluster_name": "fake",
+                                                   "user_name": "fake"}),
+    Scenario("delete_wds_context", lambda i, run: {"context_name": f"scratch-{i}"}, consumes_scratch=True),
+    Scenario("switch_wds_context", lambda i, run: {"context_name": ("wds1", "wds2")[i % 2]}),
+]
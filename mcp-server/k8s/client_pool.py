@@ -0,0 +1,192 @@
+import json
+import os
+import socket
+import threading
+from dataclasses import dataclass, replace
+from typing import Optional, Dict, List, Tuple, Any
+
+from k8s.kubeconfig import get_kubeconfig, kubeconfig_fingerprint
+from k8s.lazy import lazy_import
+from k8s.metrics import instrument_request
+from k8s.resilience import resilient_request
+from k8s.singleflight import COALESCE_READS, coalesce_reads
+
+client = lazy_import("kubernetes.client")
+config = lazy_import("kubernetes.config")
+urllib3_connection = lazy_import("urllib3.connection")
+
+
+@dataclass(frozen=True)
+class ClientOptions:
+    """Connection settings applied to the ApiClient of a context."""
+    pool_maxsize: int = 8
+    keepalive: bool = True
+    keepalive_idle: int = 30
+    keepalive_interval: int = 10
+    keepalive_count: int = 3
+    verify_ssl: Optional[bool] = None
+    max_concurrency: int = 8
+    timeout: float = 30.0
+    qps: float = 50.0
+    burst: int = 300
+    max_retries: int = 3
+    breaker_threshold: int = 5
+    breaker_cooldown: float = 30.0
+
+
+def _options_from_env() -> Tuple[ClientOptions, Dict[str, ClientOptions]]:
+    """
+    Read pool settings from the environment.
+
+    KUBRALIS_POOL_MAXSIZE, KUBRALIS_KEEPALIVE, KUBRALIS_MAX_CONCURRENCY,
+    KUBRALIS_CALL_TIMEOUT, KUBRALIS_QPS, KUBRALIS_BURST, KUBRALIS_MAX_RETRIES,
+    KUBRALIS_BREAKER_THRESHOLD and KUBRALIS_BREAKER_COOLDOWN set the defaults for every context,
+    KUBRALIS_CONTEXT_OPTIONS is a JSON object mapping a context name to
+    overrides, e.g. {"wds1": {"pool_maxsize": 16, "keepalive": false}}.
+    """
+    defaults = ClientOptions()
+    if os.environ.get("KUBRALIS_POOL_MAXSIZE"):
+        defaults = replace(defaults, pool_maxsize=int(os.environ["KUBRALIS_POOL_MAXSIZE"]))
+    if os.environ.get("KUBRALIS_MAX_CONCURRENCY"):
+        defaults = replace(defaults, max_concurrency=int(os.environ["KUBRALIS_MAX_CONCURRENCY"]))
+    if os.environ.get("KUBRALIS_CALL_TIMEOUT"):
+        defaults = replace(defaults, timeout=float(os.environ["KUBRALIS_CALL_TIMEOUT"]))
+    if os.environ.get("KUBRALIS_QPS"):
+        defaults = replace(defaults, qps=float(os.environ["KUBRALIS_QPS"]))
+    if os.environ.get("KUBRALIS_BURST"):
+        defaults = replace(defaults, burst=int(os.environ["KUBRALIS_BURST"]))
+    if os.environ.get("KUBRALIS_MAX_RETRIES"):
+        defaults = replace(defaults, max_retries=int(os.environ["KUBRALIS_MAX_RETRIES"]))
+    if os.environ.get("KUBRALIS_BREAKER_THRESHOLD"):
+        defaults = replace(defaults, breaker_threshold=int(os.environ["KUBRALIS_BREAKER_THRESHOLD"]))
+    if os.environ.get("KUBRALIS_BREAKER_COOLDOWN"):
+        defaults = replace(defaults, breaker_cooldown=float(os.environ["KUBRALIS_BREAKER_COOLDOWN"]))
+    if os.environ.get("KUBRALIS_KEEPALIVE"):
+        defaults = replace(defaults, keepalive=os.environ["KUBRALIS_KEEPALIVE"].lower() not in ("0", "false", "no"))
+
+    per_context = {}
+    raw = os.environ.get("KUBRALIS_CONTEXT_OPTIONS")
+    if raw:
+        for name, overrides in json.loads(raw).items():
+            per_context[name] = replace(defaults, **overrides)
+    return defaults, per_context
+
+
+_default_options, _context_options = _options_from_env()
+_clients: Dict[Tuple[Optional[str], bool], Tuple["client.ApiClient", Tuple]] = {}
+_lock = threading.Lock()
+
+
+def configure_context(context: Optional[str] = None, **overrides: Any) -> ClientOptions:
+    """
+    Set pool options for a context (or the defaults when context is None).
+    Cached clients for the affected contexts are dropped so the new settings
+    take effect on the next call.
+    """
+    global _default_options
+    with _lock:
+        if context is None:
+            _default_options = replace(_default_options, **overrides)
+            options = _default_options
+            stale = list(_clients)
+        else:
+            options = replace(_context_options.get(context, _default_options), **overrides)
+            _context_options[context] = options
+            stale = [key for key in _clients if key[0] == context]
+        for key in stale:
+            _close(_clients.pop(key)[0])
+    return options
+
+
+def get_context_options(context: Optional[str] = None) -> ClientOptions:
+    """Return the effective pool options for a context."""
+    if context is None:
+        return _default_options
+    return _context_options.get(context, _default_options)
+
+
+def _keepalive_socket_options(options: ClientOptions):
+    socket_options = list(urllib3_connection.HTTPConnection.default_socket_options)
+    if not options.keepalive:
+        return socket_options
+    socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, options.keepalive_idle))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, options.keepalive_interval))
+    if hasattr(socket, "TCP_KEEPCNT"):
+        socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPCNT, options.keepalive_count))
+    return socket_options
+
+
+def _build_client(context: Optional[str], insecure: bool) -> "client.ApiClient":
+    """
+    Load kubeconfig into an isolated Configuration. Unlike
+    config.load_kube_config(context=...) this never touches the process-wide
+    default Configuration, so contexts cannot leak into each other.
+    """
+    options = get_context_options(context)
+    configuration = client.Configuration()
+    config.load_kube_config(context=context, client_configuration=configuration, persist_config=False)
+    configuration.connection_pool_maxsize = options.pool_maxsize
+    if insecure or options.verify_ssl is False:
+        configuration.verify_ssl = False
+        configuration.ssl_ca_cert = None
+    elif options.verify_ssl:
+        configuration.verify_ssl = True
+
+    api_client = client.ApiClient(configuration=configuration)
+    # RESTClientObject has no socket option hook, but the pool manager hands
+    # its connection_pool_kw to every pool (and connection) it creates.
+    api_client.rest_client.pool_manager.connection_pool_kw["socket_options"] = _keepalive_socket_options(options)
+    # The typed APIs call rest_client.request through the instance, so every
+    # request of the context is timed and counted, rate limited, retried and
+    # guarded by the context's circuit breaker, and identical concurrent
+    # reads share one request (only that one is counted).
+    request = instrument_request(api_client.rest_client.request, context)
+    request = resilient_request(request, context, options.qps, options.burst, options.max_retries,
+                                options.breaker_threshold, options.breaker_cooldown)
+    api_client.rest_client.request = coalesce_reads(request) if COALESCE_READS else request
+    return api_client
+
+
+def _close(api_client: "client.ApiClient") -> None:
+    try:
+        api_client.rest_client.pool_manager.clear()
+    except Exception:
+        pass
+
+
+def get_api_client(context: Optional[str] = None, insecure: bool = False) -> "client.ApiClient":
+    """
+    Return the shared ApiClient for a context, creating it on first use.
+
+    The client (and its urllib3 connection pool) is reused across calls and
+    rebuilt only when a kubeconfig file changes on disk. Passing insecure=True
+    returns a separate client with TLS verification disabled.
+    """
+    key = (context, insecure)
+    fingerprint = kubeconfig_fingerprint()
+    with _lock:
+        cached = _clients.get(key)
+        if cached is not None and cached[1] == fingerprint:
+            return cached[0]
+        api_client = _build_client(context, insecure)
+        _clients[key] = (api_client, fingerprint)
+    if cached is not None:
+        _close(cached[0])
+    return api_client
+
+
+def list_context_names() -> List[str]:
+    """Names of all kubeconfig contexts, re-read only when a kubeconfig file changes."""
+    return get_kubeconfig().names()
+
+
+def invalidate(context: Optional[str] = None) -> None:
+    """Drop cached clients for a context, or every context when None."""
+    with _lock:
+        keys = [key for key in _clients if context is None or key[0] == context]
+        dropped = [_clients.pop(key)[0] for key in keys]
+    for api_client in dropped:
+        _close(api_client)
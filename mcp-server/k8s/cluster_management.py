@@ -1,29 +1,64 @@
-from mcp.server.fastmcp import FastMCP
+from array import array
+from urllib.parse import quote
+from typing import Optional, List, Dict, Tuple, Any, Union
 
-from kubernetes import client, config
-from typing import Optional, List, Dict, Any
-import yaml
-mcp = FastMCP("Kubestellar  MCP")
+from k8s.client_pool import get_api_client
+from k8s.cursors import cursor_result
+from k8s.dispatch import call, stream
+from k8s.fanout import fan_out
+from k8s.informer import get_cached, list_cached
+from k8s.logs import collect_lines, clamp_bytes
+from k8s.pagination import iter_chunks, list_collection
+from k8s.lazy import lazy_import
+from k8s.quantity import quantity_or_zero, summarize_column
+from k8s.raw import accept_override, api_request, output_converter, read_object, render_cached
+from mcp_instance import mcp
 
-def load_kube_config(context: Optional[str] = None):
-    """Load kubeconfig for a given context."""
-    config.load_kube_config(context=context)
+client = lazy_import("kubernetes.client")
+yaml = lazy_import("yaml")
+
+DEFAULT_CAPACITY_RESOURCES = ("cpu", "memory", "pods", "ephemeral-storage")
 
 
 @mcp.tool()
 async def list_all_clusters(
-    context: Optional[str] = None
-) -> List[Dict[str, Any]]:
+    context: Optional[str] = None,
+    limit: Optional[int] = None,
+    continue_token: Optional[str] = None,
+    output: str = "object",
+    fields: Optional[List[str]] = None,
+    contexts: Optional[Union[str, List[str]]] = None,
+    use_cursor: bool = True
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
     List all clusters in the Kubernetes environment.
-    Returns a list of cluster dictionaries.
+    Returns a list of cluster dictionaries. When limit or continue_token is
+    given, returns one page as {"items", "continue", "remainingItemCount"};
+    pass "continue" back as continue_token to get the next page.
+    output="json" returns the API's own JSON instead of the client model
+    dump, output="table" returns compact kubectl-style rows and
+    output="metadata" returns only object metadata; fields (e.g.
+    ["metadata.name", "status.phase"]) keeps only those paths.
+    contexts ("all", a glob such as "wds*", or a list of names) queries
+    several contexts concurrently and returns {"contexts", "items",
+    "errors"} with every item tagged by its "context"; when paged, its
+    "continue" token covers every context and pages them all together.
+    Results larger than KUBRALIS_CURSOR_THRESHOLD come back as a first
+    slice plus a "cursor" for read_cursor, unless use_cursor=False.
     """
-    load_kube_config(context)
-    v1 = client.CoreV1Api()
+    if contexts:
+        result = await fan_out(contexts, lambda ctx, token: list_all_clusters(
+            context=ctx, limit=limit, continue_token=token, output=output, fields=fields,
+            use_cursor=False), continue_token=continue_token)
+        return cursor_result(result, "list_all_clusters") if use_cursor else result
+    raw, convert = output_converter(output, fields)
+    v1 = client.CoreV1Api(get_api_client(context))
     
     try:
-        clusters = v1.list_node()
-        return [cluster.to_dict() for cluster in clusters.items]
+        list_func = accept_override(v1.list_node, "/api/v1/nodes", output)
+        result = await list_collection(context, list_func, convert, raw=raw,
+                                       limit=limit, continue_token=continue_token)
+        return cursor_result(result, "list_all_clusters") if use_cursor else result
     except client.exceptions.ApiException as e:
         return {
             "error": f"Kubernetes API error: {e.status}",
@@ -34,18 +69,26 @@ async def list_all_clusters(
 @mcp.tool()
 async def get_cluster_details(
     cluster_name: str,
-    context: Optional[str] = None
+    context: Optional[str] = None,
+    live: bool = False,
+    output: str = "object",
+    fields: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """
     Get details of a specific cluster in the Kubernetes environment.
-    Returns the cluster's dictionary.
+    Returns the cluster's dictionary. Served from the informer cache when
+    enabled; set live=True to always read from the API server.
+    output="json" returns the API's own JSON instead of the client model
+    dump, and fields (e.g. ["metadata.name", "status.phase"]) keeps only
+    those paths.
     """
-    load_kube_config(context)
-    v1 = client.CoreV1Api()
+    cluster = get_cached(context, "nodes", cluster_name, live=live)
+    if cluster is not None:
+        return render_cached(cluster, output, fields)
+    v1 = client.CoreV1Api(get_api_client(context))
     
     try:
-        cluster = v1.read_node(name=cluster_name)
-        return cluster.to_dict()
+        return await read_object(context, v1.read_node, output, fields, name=cluster_name)
     except client.exceptions.ApiException as e:
         return {
             "error": f"Kubernetes API error: {e.status}",
@@ -56,17 +99,21 @@ async def get_cluster_details(
 @mcp.tool()
 async def get_cluster_status(
     cluster_name: str,
-    context: Optional[str] = None
+    context: Optional[str] = None,
+    live: bool = False
 ) -> Dict[str, Any]:
     """
     Get the status of a specific cluster in the Kubernetes environment.
-    Returns the cluster's status as a dictionary.
+    Returns the cluster's status as a dictionary. Served from the informer
+    cache when enabled; set live=True to always read from the API server.
     """
-    load_kube_config(context)
-    v1 = client.CoreV1Api()
+    cluster = get_cached(context, "nodes", cluster_name, live=live)
+    if cluster is not None:
+        return cluster.status.to_dict()
+    v1 = client.CoreV1Api(get_api_client(context))
     
     try:
-        cluster = v1.read_node(name=cluster_name)
+        cluster = await call(context, v1.read_node, name=cluster_name)
         return cluster.status.to_dict()
     except client.exceptions.ApiException as e:
         return {
@@ -77,21 +124,202 @@ async def get_cluster_status(
 @mcp.tool() 
 async def get_cluster_logs(
     cluster_name: str,
-    context: Optional[str] = None
-) -> str:
+    context: Optional[str] = None,
+    log_path: Optional[str] = None,
+    query: Optional[str] = None,
+    pattern: Optional[str] = None,
+    since_time: Optional[str] = None,
+    tail_lines: Optional[int] = None,
+    start_byte: Optional[int] = None,
+    end_byte: Optional[int] = None,
+    max_bytes: Optional[int] = None
+) -> Union[str, Dict[str, Any]]:
     """
     Get logs from a specific cluster in the Kubernetes environment.
     Returns the logs as a string.
+
+    Without arguments this returns the node's log directory listing.
+    log_path reads a file under the node's /var/log (e.g. "kubelet.log");
+    start_byte/end_byte fetch only that byte range of it. query reads a
+    system service log through the kubelet node log query (e.g. "kubelet"),
+    where pattern, since_time (RFC 3339) and tail_lines are evaluated on the
+    node itself. For plain files pattern and tail_lines are applied while
+    streaming; since_time needs query, as file lines have no common
+    timestamp format. At most max_bytes (capped by KUBRALIS_MAX_LOG_BYTES)
+    are returned.
     """
-    load_kube_config(context)
-    v1 = client.CoreV1Api()
+    segments = [segment for segment in (log_path or "").split("/") if segment]
+    if cluster_name in ("", ".", "..") or any(segment in (".", "..") for segment in segments):
+        return {
+            "error": "Invalid input",
+            "message": "cluster_name must be a node name and log_path must stay under the node's /var/log "
+                       "(no '.' or '..' segments)"
+        }
+    if since_time and not query:
+        return {
+            "error": "Invalid input",
+            "message": "since_time is only supported together with query; "
+                       "use tail_lines or pattern to narrow a log_path read"
+        }
+    api_client = get_api_client(context)
+    path = f"/api/v1/nodes/{quote(cluster_name, safe='')}/proxy/logs/"
+    params = []
+    headers = {"Accept": "*/*"}
+    server_side = False
+    if query:
+        server_side = True
+        params.append(("query", query))
+        if pattern:
+            params.append(("pattern", pattern))
+        if since_time:
+            params.append(("sinceTime", since_time))
+        if tail_lines:
+            params.append(("tailLines", tail_lines))
+    elif log_path:
+        path += "/".join(quote(segment, safe="") for segment in segments)
+        if segments and log_path.endswith("/"):
+            path += "/"
+        if start_byte is not None or end_byte is not None:
+            headers["Range"] = f"bytes={start_byte or 0}-{'' if end_byte is None else end_byte}"
     
     try:
-        logs = v1.read_node_log(name=cluster_name)
-        return logs
+        chunks = stream(context, api_request, api_client, "GET", path, params, headers)
+        if server_side:
+            return await collect_lines(chunks, max_bytes=clamp_bytes(max_bytes))
+        return await collect_lines(chunks, pattern, tail_lines, clamp_bytes(max_bytes))
     except client.exceptions.ApiException as e:
         return {
             "error": f"Kubernetes API error: {e.status}",
             "message": str(e),
             "details": e.body if hasattr(e, 'body') else "No details available"
-        }
\ No newline at end of file
+        }
+
+
+class _CapacityGroup:
+    """Columnar per-node values of one group of nodes."""
+    __slots__ = ("nodes", "allocatable", "capacity", "conditions", "unschedulable")
+
+    def __init__(self, resources: List[str]):
+        self.nodes = 0
+        self.allocatable = {resource: array("d") for resource in resources}
+        self.capacity = {resource: array("d") for resource in resources}
+        self.conditions: Dict[str, int] = {}
+        self.unschedulable = 0
+
+    def add(self, allocatable: Dict[str, Any], capacity: Dict[str, Any], conditions: List[Tuple[str, str]],
+            unschedulable: bool) -> None:
+        self.nodes += 1
+        for resource, column in self.allocatable.items():
+            column.append(quantity_or_zero(allocatable.get(resource)))
+        for resource, column in self.capacity.items():
+            column.append(quantity_or_zero(capacity.get(resource)))
+        ready = False
+        for condition_type, status in conditions:
+            if condition_type == "Ready":
+                ready = status == "True"
+            elif status == "True":
+                self.conditions[condition_type] = self.conditions.get(condition_type, 0) + 1
+        key = "Ready" if ready else "NotReady"
+        self.conditions[key] = self.conditions.get(key, 0) + 1
+        if unschedulable:
+            self.unschedulable += 1
+
+    def merge(self, other: "_CapacityGroup") -> None:
+        self.nodes += other.nodes
+        for resource, column in other.allocatable.items():
+            self.allocatable[resource].extend(column)
+        for resource, column in other.capacity.items():
+            self.capacity[resource].extend(column)
+        for condition, count in other.conditions.items():
+            self.conditions[condition] = self.conditions.get(condition, 0) + count
+        self.unschedulable += other.unschedulable
+
+    def summary(self, percentiles: List[float]) -> Dict[str, Any]:
+        return {
+            "nodes": self.nodes,
+            "allocatable": {resource: summarize_column(column, percentiles)
+                            for resource, column in self.allocatable.items()},
+            "capacity": {resource: summarize_column(column, [])["total"]
+                         for resource, column in self.capacity.items()},
+            "conditions": dict(sorted(self.conditions.items())),
+            "unschedulable": self.unschedulable,
+        }
+
+
+def _node_capacity_fields(node: Any) -> Tuple[Dict[str, str], Dict[str, Any], Dict[str, Any], List[Tuple[str, str]], bool]:
+    """(labels, allocatable, capacity, [(condition type, status)], unschedulable) of a raw or typed node."""
+    if isinstance(node, dict):
+        metadata = node.get("metadata") or {}
+        status = node.get("status") or {}
+        return (metadata.get("labels") or {}, status.get("allocatable") or {}, status.get("capacity") or {},
+                [(c.get("type"), c.get("status")) for c in status.get("conditions") or []],
+                bool((node.get("spec") or {}).get("unschedulable")))
+    status = node.status
+    return (node.metadata.labels or {}, (status and status.allocatable) or {}, (status and status.capacity) or {},
+            [(c.type, c.status) for c in (status and status.conditions) or []],
+            bool(node.spec and node.spec.unschedulable))
+
+
+@mcp.tool()
+async def get_fleet_capacity(
+    context: Optional[str] = None,
+    group_by: Optional[str] = "topology.kubernetes.io/zone",
+    label_selector: Optional[str] = None,
+    resources: Optional[List[str]] = None,
+    percentiles: Optional[List[float]] = None,
+    live: bool = False
+) -> Dict[str, Any]:
+    """
+    Summarize the capacity of all nodes instead of returning them.
+    Returns node counts, allocatable totals and percentiles, capacity
+    totals and condition counts (Ready/NotReady and any other condition
+    that is True), overall and per value of the group_by node label
+    (e.g. "topology.kubernetes.io/zone" or "node.kubernetes.io/instance-type";
+    None for no grouping). CPU is in cores, memory and storage in bytes.
+
+    Args:
+        context: Kubeconfig context to use
+        group_by: Node label to group by; nodes without it fall in "<none>"
+        label_selector: Only summarize matching nodes
+        resources: Resources to aggregate (default cpu, memory, pods, ephemeral-storage)
+        percentiles: Per-node allocatable percentiles to report (default 50, 90, 99)
+        live: Read from the API server even when the node cache is enabled
+    """
+    resources = resources or list(DEFAULT_CAPACITY_RESOURCES)
+    percentiles = percentiles or [50, 90, 99]
+    groups: Dict[str, _CapacityGroup] = {}
+
+    def add(node: Any) -> None:
+        labels, allocatable, capacity, conditions, unschedulable = _node_capacity_fields(node)
+        key = labels.get(group_by, "<none>") if group_by else "all"
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = _CapacityGroup(resources)
+        group.add(allocatable, capacity, conditions, unschedulable)
+
+    # The cache holds every node, so it can only stand in for an unfiltered list.
+    nodes = None if label_selector else list_cached(context, "nodes", live=live)
+    try:
+        if nodes is not None:
+            for node in nodes:
+                add(node)
+        else:
+            v1 = client.CoreV1Api(get_api_client(context))
+            # One chunk of raw nodes at a time; only the columns are kept.
+            async for chunk in iter_chunks(context, v1.list_node, raw=True, label_selector=label_selector):
+                for node in chunk:
+                    add(node)
+    except client.exceptions.ApiException as e:
+        return {
+            "error": f"Kubernetes API error: {e.status}",
+            "message": str(e),
+            "details": e.body if hasattr(e, 'body') else "No details available"
+        }
+
+    total = _CapacityGroup(resources)
+    for group in groups.values():
+        total.merge(group)
+    result = {"groupBy": group_by, **total.summary(percentiles)}
+    if group_by:
+        result["groups"] = {key: groups[key].summary(percentiles) for key in sorted(groups)}
+    return result
@@ -0,0 +1,331 @@
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, List, Dict, Tuple, Any
+
+from k8s.raw import compile_fields, project
+from mcp_instance import mcp
+
+# Results whose JSON is larger than this are kept server-side and returned
+# one slice at a time.
+CURSOR_THRESHOLD = int(os.environ.get("KUBRALIS_CURSOR_THRESHOLD", str(256 * 1024)))
+# Upper bound on the memory held by all cursors together (estimated);
+# least recently used cursors are evicted first.
+CURSOR_MAX_BYTES = int(os.environ.get("KUBRALIS_CURSOR_MAX_BYTES", str(256 * 1024 * 1024)))
+# Seconds a cursor lives after it was last read.
+CURSOR_TTL = float(os.environ.get("KUBRALIS_CURSOR_TTL", "600"))
+DEFAULT_SLICE = 100
+_MAX_VIEWS = 4
+# Items measured to estimate the memory held by a stashed list.
+_FOOTPRINT_SAMPLE = 32
+
+
+def _size(value: Any) -> int:
+    return len(json.dumps(value, default=str, separators=(",", ":")))
+
+
+def _footprint(value: Any) -> int:
+    """Approximate memory held by a JSON-like value."""
+    if value is None or value is True or value is False:
+        return 0
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += _footprint(key) + _footprint(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            size += _footprint(item)
+    return size
+
+
+def _estimate_footprint(items: List[Any]) -> int:
+    """_footprint of a list, measured on an evenly spaced sample of its items."""
+    step = max(1, len(items) // _FOOTPRINT_SAMPLE)
+    sample = items[::step]
+    return sys.getsizeof(items) + sum(_footprint(item) for item in sample) * len(items) // len(sample)
+
+
+def _prefix_sizes(items: List[Any], limit: int) -> List[int]:
+    """
+    JSON sizes of the leading items, stopping once they add up to more than
+    limit (after at least two items), so a large result is only partly
+    serialized.
+    """
+    sizes: List[int] = []
+    total = 0
+    for item in items:
+        sizes.append(_size(item))
+        total += sizes[-1]
+        if total > limit and len(sizes) > 1:
+            break
+    return sizes
+
+
+class _Cursor:
+    __slots__ = ("value", "size", "source", "expires", "views")
+
+    def __init__(self, value: Any, size: int, source: str, expires: float):
+        self.value = value
+        self.size = size
+        self.source = source
+        self.expires = expires
+        # (sort_by, descending, filter) -> item order, so paging through a
+        # sorted or filtered view does not redo the work per slice
+        self.views: "OrderedDict[Tuple, List[int]]" = OrderedDict()
+
+
+class CursorStore:
+    """
+    Tool results kept server-side under random handles, bounded by total
+    size with least-recently-used eviction and by a sliding TTL.
+    """
+
+    def __init__(self, max_bytes: int = CURSOR_MAX_BYTES, ttl: float = CURSOR_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.bytes = 0
+        self._cursors: "OrderedDict[str, _Cursor]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._cursors)
+
+    def _drop(self, handle: str) -> None:
+        cursor = self._cursors.pop(handle, None)
+        if cursor is not None:
+            self.bytes -= cursor.size
+
+    def _expire(self, now: float) -> None:
+        for handle in [h for h, c in self._cursors.items() if c.expires <= now]:
+            self._drop(handle)
+
+    def put(self, value: Any, size: int, source: str) -> Optional[str]:
+        """
+        Store a result that holds about size bytes of memory and return its
+        handle; None if it alone exceeds max_bytes.
+        """
+        if size > self.max_bytes:
+            return None
+        handle = secrets.token_urlsafe(12)
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            while self._cursors and self.bytes + size > self.max_bytes:
+                self._drop(next(iter(self._cursors)))
+            self._cursors[handle] = _Cursor(value, size, source, now + self.ttl)
+            self.bytes += size
+        return handle
+
+    def get(self, handle: str) -> Optional[_Cursor]:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            cursor = self._cursors.get(handle)
+            if cursor is not None:
+                self._cursors.move_to_end(handle)
+                cursor.expires = now + self.ttl
+            return cursor
+
+    def drop(self, handle: str) -> bool:
+        with self._lock:
+            found = handle in self._cursors
+            self._drop(handle)
+            return found
+
+
+_store = CursorStore()
+
+
+def _first_slice(items: List[Any], sizes: List[int], slice_size: int) -> List[Any]:
+    """Up to slice_size items, fewer if they would exceed CURSOR_THRESHOLD bytes (but at least one)."""
+    total = 0
+    for i, size in enumerate(sizes[:slice_size]):
+        total += size
+        if total > CURSOR_THRESHOLD and i > 0:
+            return items[:i]
+    return items[:slice_size]
+
+
+def stash_items(items: List[Any], source: str, slice_size: int = DEFAULT_SLICE) -> Optional[Dict[str, Any]]:
+    """
+    Keep an oversized list result in the cursor store. Returns the first
+    slice together with the cursor handle, or None when the result is
+    small enough (or too large to store) and should be returned as is.
+    Only items up to the threshold are serialized; the size of the rest
+    is extrapolated.
+    """
+    sizes = _prefix_sizes(items, CURSOR_THRESHOLD)
+    measured = sum(sizes)
+    if measured <= CURSOR_THRESHOLD:
+        return None
+    handle = _store.put(items, _estimate_footprint(items), source)
+    if handle is None:
+        return None
+    first = _first_slice(items, sizes, slice_size)
+    estimate = measured * len(items) // len(sizes)
+    return {
+        "message": f"Result of {len(items)} items (about {estimate} bytes) is kept server-side; "
+                   f"use read_cursor to fetch, sort or filter further slices",
+        "items": first,
+        "cursor": handle,
+        "totalItems": len(items),
+        "nextOffset": len(first) if len(first) < len(items) else None,
+    }
+
+
+def cursor_result(result: Any, source: str) -> Any:
+    """
+    Apply stash_items() to a list tool's full result: a plain list, or the
+    "items" of a multi-context result. Paged results are left alone.
+    """
+    if isinstance(result, list):
+        return stash_items(result, source) or result
+    if isinstance(result, dict) and isinstance(result.get("items"), list) and "continue" not in result:
+        stashed = stash_items(result["items"], source)
+        if stashed is not None:
+            return {**result, **stashed}
+    return result
+
+
+def stash_object(obj: Any, source: str) -> Any:
+    """
+    Keep an oversized single object in the cursor store and return an
+    outline of its top-level fields with their sizes instead; read_cursor
+    with fields returns the parts that are needed.
+    """
+    if not isinstance(obj, dict):
+        return obj
+    sizes = {key: _size(value) for key, value in obj.items()}
+    total = sum(sizes.values())
+    if total <= CURSOR_THRESHOLD:
+        return obj
+    handle = _store.put(obj, _footprint(obj), source)
+    if handle is None:
+        return obj
+    return {
+        "message": f"Result of {total} bytes is kept server-side; use read_cursor with fields to fetch parts of it",
+        "cursor": handle,
+        "fieldSizes": sizes,
+    }
+
+
+def _lookup(item: Any, path: str) -> Any:
+    for part in path.split("."):
+        if isinstance(item, dict):
+            item = item.get(part)
+        elif isinstance(item, list) and part.isdigit() and int(part) < len(item):
+            item = item[int(part)]
+        else:
+            return None
+    return item
+
+
+def _matches(item: Any, conditions: Dict[str, Any]) -> bool:
+    for path, expected in conditions.items():
+        value = _lookup(item, path)
+        if isinstance(expected, list):
+            if value not in expected:
+                return False
+        elif value != expected:
+            return False
+    return True
+
+
+def _sort_key(value: Any) -> Tuple:
+    # Missing values last; mixed types grouped by type instead of failing.
+    if value is None:
+        return (1, "", "")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, "number", value)
+    if isinstance(value, (dict, list)):
+        return (0, type(value).__name__, json.dumps(value, default=str, sort_keys=True))
+    return (0, type(value).__name__, str(value))
+
+
+def _view(cursor: _Cursor, sort_by: Optional[str], descending: bool, conditions: Optional[Dict[str, Any]]) -> List[int]:
+    key = (sort_by, descending, json.dumps(conditions, sort_keys=True, default=str) if conditions else None)
+    order = cursor.views.get(key)
+    if order is not None:
+        cursor.views.move_to_end(key)
+        return order
+    items = cursor.value
+    order = [i for i, item in enumerate(items) if not conditions or _matches(item, conditions)]
+    if sort_by:
+        values = {i: _sort_key(_lookup(items[i], sort_by)) for i in order}
+        # Missing values stay last in both directions.
+        present = [i for i in order if values[i][0] == 0]
+        missing = [i for i in order if values[i][0] == 1]
+        order = sorted(present, key=values.__getitem__, reverse=descending) + missing
+    cursor.views[key] = order
+    while len(cursor.views) > _MAX_VIEWS:
+        cursor.views.popitem(last=False)
+    return order
+
+
+@mcp.tool()
+async def read_cursor(
+    cursor: str,
+    offset: int = 0,
+    limit: int = DEFAULT_SLICE,
+    sort_by: Optional[str] = None,
+    descending: bool = False,
+    where: Optional[Dict[str, Any]] = None,
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Read a slice of a result kept server-side by another tool, without
+    querying the API server again.
+
+    Args:
+        cursor: Handle returned by the tool under "cursor"
+        offset: Index of the first item to return
+        limit: Maximum number of items to return
+        sort_by: Dotted path to sort by (e.g. "metadata.name" or "status.phase")
+        descending: Sort in descending order
+        where: Dotted path -> value (or list of accepted values) that items must match
+        fields: Dotted paths to keep in every returned item
+
+    Returns {"items", "offset", "nextOffset", "totalItems"}, where
+    totalItems counts the items left after filtering. For a kept single
+    object, returns {"item"} restricted to fields.
+    """
+    entry = _store.get(cursor)
+    if entry is None:
+        return {
+            "error": "Cursor not found",
+            "message": f"Cursor '{cursor}' does not exist or has expired; run the original tool again"
+        }
+    tree = compile_fields(fields) if fields else None
+    if isinstance(entry.value, dict):
+        return {"cursor": cursor, "item": project(entry.value, tree)}
+
+    try:
+        order = _view(entry, sort_by, descending, where)
+    except TypeError as e:
+        return {
+            "error": "Invalid input",
+            "message": f"Cannot sort by '{sort_by}': {e}"
+        }
+    offset = max(0, offset)
+    limit = max(1, limit)
+    selected = order[offset:offset + limit]
+    end = offset + len(selected)
+    return {
+        "cursor": cursor,
+        "items": [project(entry.value[i], tree) for i in selected],
+        "offset": offset,
+        "nextOffset": end if end < len(order) else None,
+        "totalItems": len(order),
+    }
+
+
+@mcp.tool()
+async def close_cursor(cursor: str) -> Dict[str, Any]:
+    """Release a server-side result before it expires."""
+    if _store.drop(cursor):
+        return {"message": f"Cursor '{cursor}' released"}
+    return {"message": f"Cursor '{cursor}' not found"}
@@ -0,0 +1,229 @@
+import asyncio
+import os
+import time
+from typing import Optional, List, Dict, Tuple, Any
+
+from k8s.client_pool import get_api_client, get_context_options
+from k8s.dispatch import request_timeout
+from k8s.lazy import lazy_import
+from k8s.metrics import cache_lookup
+from k8s.raw import api_request, call_raw, decode
+
+exceptions = lazy_import("kubernetes.client.exceptions")
+
+DISCOVERY_TTL = float(os.environ.get("KUBRALIS_DISCOVERY_TTL", "600"))
+
+# Ask for aggregated discovery (one request for all groups, versions and
+# resources); servers without it answer with the legacy group list.
+AGGREGATED_ACCEPT = (
+    "application/json;g=apidiscovery.k8s.io;v=v2;as=APIGroupDiscoveryList,"
+    "application/json;g=apidiscovery.k8s.io;v=v2beta1;as=APIGroupDiscoveryList,"
+    "application/json"
+)
+
+
+class Discovery:
+    """
+    A snapshot of the API groups, versions and resources served by one
+    context. Versions are kept in the server's preference order.
+    """
+
+    def __init__(self):
+        # group -> versions, preferred first ("" is the core group)
+        self.groups: Dict[str, List[str]] = {}
+        # (group, version) -> {plural: resource info}
+        self.resources: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {}
+        # plural, kind or singular name (lowercased) -> groups serving it, in discovery order
+        self._by_name: Dict[str, List[str]] = {}
+
+    def add(self, group: str, version: str, resources: List[Dict[str, Any]]) -> None:
+        self.groups.setdefault(group, [])
+        if version not in self.groups[group]:
+            self.groups[group].append(version)
+        served = self.resources.setdefault((group, version), {})
+        for resource in resources:
+            plural = resource["name"]
+            if "/" in plural:
+                # Subresources such as pods/log are not selectable.
+                continue
+            served[plural] = resource
+            for name in (plural, resource.get("kind", ""), resource.get("singularName", "")):
+                name = name.lower()
+                if name:
+                    owners = self._by_name.setdefault(name, [])
+                    if group not in owners:
+                        owners.append(group)
+
+    def has_resource(self, group: str, plural: str, version: Optional[str] = None) -> bool:
+        versions = [version] if version else self.groups.get(group, [])
+        return any(plural in self.resources.get((group, v), {}) for v in versions)
+
+    def preferred_version(self, group: str, plural: Optional[str] = None) -> Optional[str]:
+        """The most preferred version of a group, optionally one that serves plural."""
+        for version in self.groups.get(group, []):
+            if plural is None or plural in self.resources.get((group, version), {}):
+                return version
+        return None
+
+    def api_group_for(self, resource: str) -> Optional[str]:
+        """
+        The API group serving a resource, given its plural, kind or singular
+        name. The core group wins over named groups (e.g. "events").
+        Returns None when the resource is unknown.
+        """
+        owners = self._by_name.get(resource.lower())
+        if not owners:
+            return None
+        return "" if "" in owners else owners[0]
+
+    def groups_for(self, resource: str) -> List[str]:
+        """Every API group serving a resource (plural, kind or singular name)."""
+        return list(self._by_name.get(resource.lower()) or [])
+
+    def plural_for(self, resource: str) -> Optional[str]:
+        """The plural resource name for a plural, kind or singular name."""
+        group = self.api_group_for(resource)
+        if group is None:
+            return None
+        needle = resource.lower()
+        for version in self.groups.get(group, []):
+            for plural, info in self.resources.get((group, version), {}).items():
+                if needle in (plural, info.get("kind", "").lower(), info.get("singularName", "").lower()):
+                    return plural
+        return None
+
+    def find(self, group: str, resource: str) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+        """
+        (version, plural, resource info) of a plural, kind or singular name
+        within one group, in the group's preferred version first.
+        """
+        needle = resource.lower()
+        for version in self.groups.get(group, []):
+            for plural, info in self.resources.get((group, version), {}).items():
+                if needle in (plural, info.get("kind", "").lower(), info.get("singularName", "").lower()):
+                    return version, plural, info
+        return None
+
+
+def is_builtin_group(group: str) -> bool:
+    """Groups defined by Kubernetes itself: the core group, un-dotted groups and *.k8s.io."""
+    return group == "" or "." not in group or group.endswith(".k8s.io")
+
+
+async def _get(context: Optional[str], insecure: bool, path: str, accept: str = "application/json") -> Any:
+    api_client = get_api_client(context, insecure)
+    return await call_raw(context, api_request, api_client, "GET", path, headers={"Accept": accept})
+
+
+def _add_aggregated(discovery: Discovery, document: Dict[str, Any]) -> None:
+    for group in document.get("items") or []:
+        name = (group.get("metadata") or {}).get("name", "")
+        for version in group.get("versions") or []:
+            resources = [
+                {
+                    "name": r["resource"],
+                    "kind": (r.get("responseKind") or {}).get("kind", ""),
+                    "singularName": r.get("singularResource", ""),
+                    "namespaced": r.get("scope") == "Namespaced",
+                    "verbs": r.get("verbs", []),
+                }
+                for r in version.get("resources") or []
+            ]
+            discovery.add(name, version["version"], resources)
+
+
+async def _fetch(context: Optional[str], insecure: bool) -> Discovery:
+    discovery = Discovery()
+    core, named = await asyncio.gather(
+        _get(context, insecure, "/api", AGGREGATED_ACCEPT),
+        _get(context, insecure, "/apis", AGGREGATED_ACCEPT),
+    )
+    if core.get("kind") == "APIGroupDiscoveryList" and named.get("kind") == "APIGroupDiscoveryList":
+        _add_aggregated(discovery, core)
+        _add_aggregated(discovery, named)
+        return discovery
+
+    # Legacy discovery: one more request per group-version.
+    group_versions = [("", version) for version in core.get("versions") or []]
+    for group in named.get("groups") or []:
+        preferred = (group.get("preferredVersion") or {}).get("version")
+        versions = [v["version"] for v in group.get("versions") or []]
+        if preferred in versions:
+            versions.remove(preferred)
+            versions.insert(0, preferred)
+        group_versions.extend((group["name"], version) for version in versions)
+
+    async def resource_list(group: str, version: str) -> List[Dict[str, Any]]:
+        path = f"/api/{version}" if group == "" else f"/apis/{group}/{version}"
+        try:
+            return (await _get(context, insecure, path)).get("resources") or []
+        except Exception:
+            # An unavailable aggregated API must not break discovery of the rest.
+            return []
+
+    lists = await asyncio.gather(*(resource_list(g, v) for g, v in group_versions))
+    for (group, version), resources in zip(group_versions, lists):
+        discovery.add(group, version, resources)
+    return discovery
+
+
+_cache: Dict[Tuple[Optional[str], bool], Tuple[float, Discovery]] = {}
+_locks: Dict[Tuple[Optional[str], bool], asyncio.Lock] = {}
+
+
+async def get_discovery(context: Optional[str] = None, insecure: bool = False, refresh: bool = False) -> Discovery:
+    """
+    Return the discovery snapshot of a context, fetching it at most once per
+    KUBRALIS_DISCOVERY_TTL seconds. Concurrent callers share one fetch.
+    """
+    key = (context, insecure)
+    cached = _cache.get(key)
+    if not refresh and cached is not None and cached[0] > time.monotonic():
+        cache_lookup("discovery", True)
+        return cached[1]
+    cache_lookup("discovery", False)
+    lock = _locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        cached = _cache.get(key)
+        if not refresh and cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        discovery = await _fetch(context, insecure)
+        _cache[key] = (time.monotonic() + DISCOVERY_TTL, discovery)
+        return discovery
+
+
+def invalidate(context: Optional[str] = None) -> None:
+    """Forget discovery for a context (all contexts when None), e.g. after a 404."""
+    for cache in (_cache, _group_versions):
+        for key in list(cache):
+            if context is None or key[0] == context:
+                del cache[key]
+
+
+_group_versions: Dict[Tuple[Optional[str], bool, str], Tuple[float, Optional[str]]] = {}
+
+
+def preferred_group_version(context: Optional[str], group: str, insecure: bool = False) -> Optional[str]:
+    """
+    The preferred version of an API group, for blocking callers such as the
+    informer threads. Uses the discovery snapshot when one is cached, and
+    otherwise reads /apis/<group> once per KUBRALIS_DISCOVERY_TTL seconds.
+    None if the group is not served.
+    """
+    cached = _cache.get((context, insecure))
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1].preferred_version(group)
+    key = (context, insecure, group)
+    known = _group_versions.get(key)
+    if known is not None and known[0] > time.monotonic():
+        return known[1]
+    try:
+        document = decode(api_request(get_api_client(context, insecure), "GET", f"/apis/{group}",
+                                       _request_timeout=request_timeout(get_context_options(context).timeout)))
+        version = (document.get("preferredVersion") or {}).get("version")
+    except exceptions.ApiException as e:
+        if e.status != 404:
+            raise
+        version = None
+    _group_versions[key] = (time.monotonic() + DISCOVERY_TTL, version)
+    return version
@@ -0,0 +1,148 @@
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Tuple, Any, Callable, AsyncIterator
+
+from k8s.client_pool import get_context_options
+from k8s.metrics import record_body
+
+_NO_TIMEOUT = object()
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("KUBRALIS_WORKER_THREADS", "32")),
+    thread_name_prefix="k8s-call",
+)
+_semaphores: Dict[Tuple[Optional[str], int], asyncio.Semaphore] = {}
+
+
+def _semaphore(context: Optional[str]) -> asyncio.Semaphore:
+    # Keyed by the limit too, so configure_context() changes apply to new calls.
+    key = (context, get_context_options(context).max_concurrency)
+    semaphore = _semaphores.get(key)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(key[1])
+        _semaphores[key] = semaphore
+    return semaphore
+
+
+def request_timeout(timeout: Any) -> Any:
+    """
+    A _request_timeout the kubernetes client honours. It only applies an
+    int or a (connect, read) tuple and silently ignores a float, so a float
+    becomes (timeout, timeout).
+    """
+    if isinstance(timeout, float):
+        return (timeout, timeout)
+    return timeout
+
+
+async def call(
+    context: Optional[str],
+    func: Callable[..., Any],
+    *args: Any,
+    timeout: Any = _NO_TIMEOUT,
+    **kwargs: Any
+) -> Any:
+    """
+    Run a blocking kubernetes client call on the worker pool.
+
+    At most max_concurrency calls per context run at once; the rest wait
+    without holding a thread. The timeout (the context's default unless
+    given, None to disable) is one deadline for waiting on a slot and for
+    the result, and also bounds the underlying HTTP request, so a call to
+    a server that never answers frees its worker thread and slot.
+    """
+    if timeout is _NO_TIMEOUT:
+        timeout = get_context_options(context).timeout
+    if timeout is not None:
+        kwargs.setdefault("_request_timeout", timeout)
+    if "_request_timeout" in kwargs:
+        kwargs["_request_timeout"] = request_timeout(kwargs["_request_timeout"])
+
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphore(context)
+    async with asyncio.timeout(timeout):
+        await semaphore.acquire()
+        # The slot is given back when the thread finishes, not when the
+        # caller stops waiting, so abandoned calls still count against the
+        # limit until their HTTP request times out.
+        try:
+            task = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+            future = _executor.submit(task)
+        except BaseException:
+            semaphore.release()
+            raise
+        future.add_done_callback(lambda _: _release_threadsafe(loop, semaphore))
+        return await asyncio.wrap_future(future)
+
+
+def _release_threadsafe(loop: asyncio.AbstractEventLoop, semaphore: asyncio.Semaphore) -> None:
+    try:
+        loop.call_soon_threadsafe(semaphore.release)
+    except RuntimeError:
+        # The event loop is already closed; nobody is left waiting.
+        pass
+
+
+_STREAM_END = object()
+
+
+async def stream(
+    context: Optional[str],
+    func: Callable[..., Any],
+    *args: Any,
+    chunk_size: int = 64 * 1024,
+    max_buffered_chunks: int = 4,
+    **kwargs: Any
+) -> AsyncIterator[bytes]:
+    """
+    Start a kubernetes client call with _preload_content=False and yield its
+    body in chunks as they arrive.
+
+    The body is pumped by a dedicated thread into a small bounded queue, so
+    at most max_buffered_chunks chunks are held in memory and a slow
+    consumer applies backpressure all the way to the socket. Leaving the
+    loop early (or being cancelled) closes the response, which also stops
+    the pump thread. kwargs may carry _request_timeout, e.g. (connect, read)
+    for long-lived follow streams.
+    """
+    response = await call(context, func, *args, _preload_content=False, **kwargs)
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffered_chunks)
+
+    def put(item: Any) -> bool:
+        try:
+            asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+            return True
+        except Exception:
+            return False
+
+    def pump() -> None:
+        try:
+            for chunk in response.stream(chunk_size, decode_content=True):
+                record_body(response, len(chunk))
+                if chunk and not put(chunk):
+                    return
+        except BaseException as e:
+            put(e)
+            return
+        put(_STREAM_END)
+
+    threading.Thread(target=pump, name="k8s-stream", daemon=True).start()
+    try:
+        while True:
+            item = await queue.get()
+            if item is _STREAM_END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        response.close()
+        response.release_conn()
+        # Unblock the pump if it is waiting on a full queue.
+        while not queue.empty():
+            queue.get_nowait()
@@ -0,0 +1,124 @@
+import asyncio
+import base64
+import binascii
+import fnmatch
+import json
+from typing import Optional, List, Dict, Any, Callable, Awaitable, Union
+
+from k8s.client_pool import get_context_options, list_context_names
+
+ContextSpec = Union[str, List[str]]
+
+
+def resolve_contexts(contexts: ContextSpec) -> List[str]:
+    """
+    Expand a contexts argument into kubeconfig context names: "all", a
+    single name or glob ("wds*"), or a list of names and globs. Names that
+    match nothing are kept so they show up as per-context errors.
+    """
+    patterns = [contexts] if isinstance(contexts, str) else list(contexts)
+    known = list_context_names()
+    resolved: List[str] = []
+    for pattern in patterns:
+        if pattern == "all":
+            matches = known
+        elif any(ch in pattern for ch in "*?["):
+            matches = fnmatch.filter(known, pattern)
+        else:
+            matches = [pattern]
+        for name in matches:
+            if name not in resolved:
+                resolved.append(name)
+    return resolved
+
+
+def encode_continue(tokens: Dict[str, str]) -> str:
+    """Pack per-context continue tokens into one opaque continue token."""
+    data = json.dumps(tokens, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(data).decode()
+
+
+def decode_continue(token: str) -> Dict[str, str]:
+    """Unpack a token from encode_continue; raises ValueError if it is not one."""
+    try:
+        tokens = json.loads(base64.urlsafe_b64decode(token.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        tokens = None
+    if not isinstance(tokens, dict) or not all(isinstance(v, str) for v in tokens.values()):
+        raise ValueError("continue_token is not a multi-context continue token; "
+                         "pass back the \"continue\" value of the previous contexts call")
+    return tokens
+
+
+def _tag(item: Any, context: str) -> Any:
+    if isinstance(item, dict):
+        return {**item, "context": context}
+    return {"context": context, "value": item}
+
+
+def _failure(context: str, outcome: Any) -> Optional[Dict[str, Any]]:
+    if isinstance(outcome, asyncio.TimeoutError):
+        return {"error": "Timeout", "message": f"Context '{context}' did not answer in time"}
+    if isinstance(outcome, BaseException):
+        return {"error": type(outcome).__name__, "message": str(outcome)}
+    if isinstance(outcome, dict) and "error" in outcome:
+        return outcome
+    return None
+
+
+async def fan_out(
+    contexts: ContextSpec,
+    fetch: Callable[[str, Optional[str]], Awaitable[Any]],
+    items_key: str = "items",
+    timeout: Optional[float] = None,
+    continue_token: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Run fetch(context, continue_token) for every context concurrently and
+    merge the results.
+
+    Each context gets its own timeout (the context's call timeout unless
+    given). Items from every context are concatenated and tagged with a
+    "context" key; a context that fails or times out is reported under
+    "errors" instead of failing the whole call. When results are paged,
+    "continue" is one opaque token holding every context's own token; pass
+    it back as continue_token to fetch the next page of only the contexts
+    that have more. A context that fails mid-way keeps its token, so the
+    next call retries its page.
+    """
+    names = resolve_contexts(contexts)
+    tokens: Dict[str, str] = {}
+    if continue_token:
+        tokens = decode_continue(continue_token)
+        names = [name for name in names if name in tokens]
+
+    async def run(name: str) -> Any:
+        limit = timeout if timeout is not None else get_context_options(name).timeout
+        return await asyncio.wait_for(fetch(name, tokens.get(name)), limit)
+
+    outcomes = await asyncio.gather(*(run(name) for name in names), return_exceptions=True)
+
+    items: List[Any] = []
+    errors: Dict[str, Any] = {}
+    continues: Dict[str, str] = {}
+    for name, outcome in zip(names, outcomes):
+        failure = _failure(name, outcome)
+        if failure is not None:
+            errors[name] = failure
+            if name in tokens:
+                continues[name] = tokens[name]
+            continue
+        if isinstance(outcome, dict):
+            if outcome.get("continue"):
+                continues[name] = outcome["continue"]
+            outcome = outcome.get(items_key, [])
+        items.extend(_tag(item, name) for item in outcome)
+
+    result = {
+        "contexts": names,
+        items_key: items,
+        "errors": errors,
+    }
+    if continues:
+        result["continue"] = encode_continue(continues)
+    return result
@@ -0,0 +1,322 @@
+import logging
+import os
+import threading
+import time
+from typing import Optional, List, Dict, Tuple, Any, Callable
+
+from k8s.client_pool import get_api_client
+from k8s.discovery import preferred_group_version
+from k8s.lazy import lazy_import
+from k8s.metrics import cache_lookup
+
+client = lazy_import("kubernetes.client")
+watch = lazy_import("kubernetes.watch")
+
+logger = logging.getLogger(__name__)
+
+RELIST_CHUNK_SIZE = 500
+
+
+def _core_list(method: str) -> Callable[[Optional[str]], Tuple[Callable[..., Any], Dict[str, Any]]]:
+    def factory(context: Optional[str]):
+        return getattr(client.CoreV1Api(get_api_client(context)), method), {}
+    return factory
+
+
+def _binding_policy_list(context: Optional[str]):
+    api = client.CustomObjectsApi(get_api_client(context, insecure=True))
+    group = "control.kubestellar.io"
+    return api.list_cluster_custom_object, {
+        "group": group,
+        # Whatever the hub serves (v1alpha1 if it serves none yet, so the informer keeps retrying).
+        "version": preferred_group_version(context, group, insecure=True) or "v1alpha1",
+        "plural": "bindingpolicies",
+    }
+
+
+def _managed_cluster_list(context: Optional[str]):
+    api = client.CustomObjectsApi(get_api_client(context, insecure=True))
+    return api.list_cluster_custom_object, {
+        "group": "cluster.open-cluster-management.io",
+        "version": "v1",
+        "plural": "managedclusters",
+    }
+
+
+# resource name -> factory returning the LIST function (and its arguments)
+# used for both the initial list and the watch
+RESOURCES: Dict[str, Callable[[Optional[str]], Tuple[Callable[..., Any], Dict[str, Any]]]] = {
+    "nodes": _core_list("list_node"),
+    "namespaces": _core_list("list_namespace"),
+    "pods": _core_list("list_pod_for_all_namespaces"),
+    "bindingpolicies": _binding_policy_list,
+    "managedclusters": _managed_cluster_list,
+}
+
+# Called as handler(event_type, obj) from the informer thread: "ADDED",
+# "MODIFIED" or "DELETED" with one object, or "REPLACED" with the list of
+# all objects after a (re)list.
+Handler = Callable[[str, Any], None]
+
+
+def _cache_settings() -> Tuple[frozenset, float]:
+    """
+    KUBRALIS_CACHE enables the cache: "all" (or "1"/"true") for every
+    resource, or a comma separated subset such as "nodes,bindingpolicies".
+    KUBRALIS_CACHE_MAX_STALENESS is the default staleness bound in seconds.
+    """
+    raw = os.environ.get("KUBRALIS_CACHE", "").strip().lower()
+    if raw in ("", "0", "false", "no", "off"):
+        enabled = frozenset()
+    elif raw in ("1", "true", "yes", "on", "all"):
+        enabled = frozenset(RESOURCES)
+    else:
+        enabled = frozenset(r.strip() for r in raw.split(",") if r.strip() in RESOURCES)
+    return enabled, float(os.environ.get("KUBRALIS_CACHE_MAX_STALENESS", "30"))
+
+
+_enabled_resources, _max_staleness = _cache_settings()
+
+
+def _metadata(obj: Any) -> Tuple[Optional[str], str, Optional[str]]:
+    """(namespace, name, resourceVersion) of a typed model or a raw dict."""
+    if isinstance(obj, dict):
+        metadata = obj.get("metadata") or {}
+        return metadata.get("namespace"), metadata.get("name"), metadata.get("resourceVersion")
+    return obj.metadata.namespace, obj.metadata.name, obj.metadata.resource_version
+
+
+class Informer:
+    """
+    Keeps a local copy of one resource type in one context up to date with
+    a single list+watch, in the style of client-go informers.
+
+    The store is replaced wholesale on every (re)list and updated in place
+    from watch events. A 410 Gone from the watch triggers a fresh list.
+    """
+
+    def __init__(self, context: Optional[str], resource: str, max_staleness: float = _max_staleness):
+        self.context = context
+        self.resource = resource
+        self.max_staleness = max_staleness
+        self._store: Dict[Tuple[Optional[str], str], Any] = {}
+        self._resource_version: Optional[str] = None
+        self._synced_at: Optional[float] = None
+        self._stopped = threading.Event()
+        self._watch: Optional[watch.Watch] = None
+        self._handlers: List[Handler] = []
+        # Guards the store against handler registration, so a new handler
+        # sees every change exactly once after its initial snapshot.
+        self._store_lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name=f"informer-{resource}-{context}", daemon=True
+        )
+
+    def start(self) -> "Informer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._watch is not None:
+            self._watch.stop()
+
+    def add_handler(self, handler: Handler) -> None:
+        """
+        Register a handler for store changes. If the store has synced it
+        is first called with "REPLACED" and the current objects. Handlers
+        run on the informer thread and must be quick.
+        """
+        with self._store_lock:
+            self._handlers.append(handler)
+            if self._synced_at is not None:
+                handler("REPLACED", list(self._store.values()))
+
+    def _notify(self, event_type: str, obj: Any) -> None:
+        for handler in self._handlers:
+            try:
+                handler(event_type, obj)
+            except Exception:
+                logger.exception("informer %s/%s: handler failed", self.context, self.resource)
+
+    def staleness(self) -> Optional[float]:
+        """Seconds since the store was last known to be current, None before the first sync."""
+        if self._synced_at is None:
+            return None
+        return time.monotonic() - self._synced_at
+
+    def is_fresh(self, max_staleness: Optional[float] = None) -> bool:
+        """Whether the store has synced and lags by no more than max_staleness."""
+        staleness = self.staleness()
+        bound = self.max_staleness if max_staleness is None else max_staleness
+        return staleness is not None and staleness <= bound
+
+    def get(self, name: str, namespace: Optional[str] = None, max_staleness: Optional[float] = None) -> Any:
+        """
+        Return the cached object, or None when it is absent or the store is
+        older than max_staleness; callers then fall back to a live read.
+        """
+        if not self.is_fresh(max_staleness):
+            return None
+        return self._store.get((namespace, name))
+
+    def list(self, max_staleness: Optional[float] = None) -> Optional[List[Any]]:
+        """All cached objects, or None when the store is older than max_staleness."""
+        if not self.is_fresh(max_staleness):
+            return None
+        return list(self._store.values())
+
+    def _mark_synced(self) -> None:
+        self._synced_at = time.monotonic()
+
+    def _relist(self) -> None:
+        func, kwargs = RESOURCES[self.resource](self.context)
+        store = {}
+        continue_token = None
+        resource_version = None
+        while True:
+            page_kwargs = dict(kwargs, limit=RELIST_CHUNK_SIZE)
+            if continue_token:
+                page_kwargs["_continue"] = continue_token
+            response = func(**page_kwargs)
+            if isinstance(response, dict):
+                items = response.get("items") or []
+                metadata = response.get("metadata") or {}
+                continue_token = metadata.get("continue")
+                resource_version = metadata.get("resourceVersion")
+            else:
+                items = response.items or []
+                continue_token = response.metadata._continue
+                resource_version = response.metadata.resource_version
+            for item in items:
+                namespace, name, _ = _metadata(item)
+                store[(namespace, name)] = item
+            if not continue_token:
+                break
+        with self._store_lock:
+            self._store = store
+            self._resource_version = resource_version
+            self._mark_synced()
+            self._notify("REPLACED", list(store.values()))
+
+    def _watch_once(self) -> None:
+        func, kwargs = RESOURCES[self.resource](self.context)
+        # Ending the watch well inside the staleness bound doubles as a
+        # heartbeat when nothing changes and the server sends no bookmarks.
+        timeout_seconds = max(5, int(self.max_staleness // 2))
+        self._watch = watch.Watch()
+        for event in self._watch.stream(
+            func,
+            resource_version=self._resource_version,
+            allow_watch_bookmarks=True,
+            timeout_seconds=timeout_seconds,
+            _request_timeout=timeout_seconds + 15,
+            **kwargs
+        ):
+            event_type = event["type"]
+            if event_type == "BOOKMARK":
+                self._resource_version = event["raw_object"]["metadata"]["resourceVersion"]
+            else:
+                obj = event["object"]
+                namespace, name, resource_version = _metadata(obj)
+                with self._store_lock:
+                    if event_type == "DELETED":
+                        self._store.pop((namespace, name), None)
+                    else:
+                        self._store[(namespace, name)] = obj
+                    self._notify(event_type, obj)
+                if resource_version:
+                    self._resource_version = resource_version
+            self._mark_synced()
+            if self._stopped.is_set():
+                return
+        # The server closed the watch at timeout_seconds: we were current up to now.
+        self._mark_synced()
+
+    def _run(self) -> None:
+        backoff = 1.0
+        while not self._stopped.is_set():
+            try:
+                if self._resource_version is None:
+                    self._relist()
+                self._watch_once()
+                backoff = 1.0
+            except client.exceptions.ApiException as e:
+                if e.status == 410:
+                    logger.debug("informer %s/%s: resourceVersion expired, relisting", self.context, self.resource)
+                    self._resource_version = None
+                    continue
+                logger.warning("informer %s/%s: API error %s, retrying in %.0fs", self.context, self.resource, e.status, backoff)
+                self._stopped.wait(backoff)
+                backoff = min(backoff * 2, 60.0)
+            except Exception as e:
+                logger.warning("informer %s/%s: %s, retrying in %.0fs", self.context, self.resource, e, backoff)
+                self._stopped.wait(backoff)
+                backoff = min(backoff * 2, 60.0)
+
+
+_informers: Dict[Tuple[Optional[str], str], Informer] = {}
+_lock = threading.Lock()
+
+
+def get_informer(context: Optional[str], resource: str) -> Optional[Informer]:
+    """Return the running informer for a resource, starting it on first use; None when caching is off for it."""
+    if resource not in _enabled_resources:
+        return None
+    key = (context, resource)
+    with _lock:
+        informer = _informers.get(key)
+        if informer is None:
+            informer = Informer(context, resource).start()
+            _informers[key] = informer
+    return informer
+
+
+def get_cached(
+    context: Optional[str],
+    resource: str,
+    name: str,
+    namespace: Optional[str] = None,
+    live: bool = False,
+    max_staleness: Optional[float] = None
+) -> Any:
+    """
+    Look an object up in the informer cache. Returns None, meaning "read it
+    live", when live is set, caching is disabled for the resource, the
+    informer has not synced yet, the store is too stale or the object is
+    not in it.
+    """
+    if live:
+        return None
+    informer = get_informer(context, resource)
+    if informer is None:
+        return None
+    obj = informer.get(name, namespace, max_staleness)
+    cache_lookup(f"informer:{resource}", obj is not None)
+    return obj
+
+
+def list_cached(
+    context: Optional[str],
+    resource: str,
+    live: bool = False,
+    max_staleness: Optional[float] = None
+) -> Optional[List[Any]]:
+    """Every cached object of a resource, or None under the same conditions as get_cached()."""
+    if live:
+        return None
+    informer = get_informer(context, resource)
+    if informer is None:
+        return None
+    objs = informer.list(max_staleness)
+    cache_lookup(f"informer:{resource}", objs is not None)
+    return objs
+
+
+def stop_all() -> None:
+    """Stop every running informer."""
+    with _lock:
+        informers = list(_informers.values())
+        _informers.clear()
+    for informer in informers:
+        informer.stop()
@@ -0,0 +1,180 @@
+import bisect
+import copy
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Tuple, Any, Callable, Iterator
+
+from k8s.lazy import lazy_import
+
+yaml = lazy_import("yaml")
+
+KUBE_CONFIG_DEFAULT_LOCATION = "~/.kube/config"
+# Seconds to wait for another process's <kubeconfig>.lock to go away.
+LOCK_TIMEOUT = 5.0
+
+
+def kubeconfig_paths() -> Tuple[str, ...]:
+    """The kubeconfig files in KUBECONFIG order (~/.kube/config when unset)."""
+    value = os.environ.get("KUBECONFIG", KUBE_CONFIG_DEFAULT_LOCATION)
+    return tuple(os.path.expanduser(p) for p in value.split(os.pathsep) if p)
+
+
+def kubeconfig_fingerprint() -> Tuple:
+    """
+    The kubeconfig paths with their mtime, inode and size, used to detect
+    edits. The inode catches atomic replacements within one mtime tick.
+    """
+    fingerprint = []
+    for path in kubeconfig_paths():
+        try:
+            st = os.stat(path)
+            fingerprint.append((path, (st.st_mtime_ns, st.st_ino, st.st_size)))
+        except OSError:
+            fingerprint.append((path, None))
+    return tuple(fingerprint)
+
+
+def _read(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader)) or {}
+    except FileNotFoundError:
+        return {}
+
+
+class Kubeconfig:
+    """
+    The merged view of every kubeconfig file, indexed by context name.
+    Entries are merged the way kubectl does: the first file defining a
+    name wins, and current-context comes from the first file setting it.
+    """
+
+    def __init__(self, documents: List[Tuple[str, Dict[str, Any]]]):
+        self.current_context: Optional[str] = None
+        self.contexts: Dict[str, Dict[str, Any]] = {}
+        self.clusters: Dict[str, Dict[str, Any]] = {}
+        self.users: Dict[str, Dict[str, Any]] = {}
+        # context name -> file defining it
+        self.sources: Dict[str, str] = {}
+        for path, document in documents:
+            if self.current_context is None and document.get("current-context"):
+                self.current_context = document["current-context"]
+            for section, index in (("contexts", self.contexts), ("clusters", self.clusters), ("users", self.users)):
+                for entry in document.get(section) or []:
+                    name = entry.get("name")
+                    if name and name not in index:
+                        index[name] = entry
+                        if section == "contexts":
+                            self.sources[name] = path
+        self._names = sorted(self.contexts)
+
+    def names(self) -> List[str]:
+        return list(self._names)
+
+    def with_prefix(self, prefix: str) -> List[str]:
+        """Context names starting with prefix, found by bisection over the sorted names."""
+        start = bisect.bisect_left(self._names, prefix)
+        end = start
+        while end < len(self._names) and self._names[end].startswith(prefix):
+            end += 1
+        return self._names[start:end]
+
+    def context(self, name: str) -> Optional[Dict[str, Any]]:
+        return self.contexts.get(name)
+
+
+_cache: Tuple[Tuple, Optional[Kubeconfig]] = ((), None)
+_cache_lock = threading.Lock()
+_write_lock = threading.Lock()
+
+
+def get_kubeconfig() -> Kubeconfig:
+    """
+    The parsed kubeconfig, re-read only when one of its files changes on
+    disk (by mtime), so large fleet kubeconfigs are not parsed per call.
+    """
+    global _cache
+    fingerprint = kubeconfig_fingerprint()
+    with _cache_lock:
+        cached_fingerprint, model = _cache
+        if model is None or cached_fingerprint != fingerprint:
+            model = Kubeconfig([(path, _read(path)) for path in kubeconfig_paths()])
+            _cache = (fingerprint, model)
+        return model
+
+
+@contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    """
+    Lock path the way client-go (and so kubectl) does: create <path>.lock
+    with O_CREAT|O_EXCL and remove it when done. Waits up to
+    LOCK_TIMEOUT seconds for another holder; raises TimeoutError after that.
+    """
+    lock_path = path + ".lock"
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    delay = 0.01
+    while True:
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600))
+            break
+        except FileExistsError:
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Kubeconfig {path} is locked: {lock_path} exists; "
+                                   f"remove it if no kubectl or Kubralis process is editing the file")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.2)
+    try:
+        yield
+    finally:
+        try:
+            os.unlink(lock_path)
+        except FileNotFoundError:
+            pass
+
+
+def _write_atomic(path: str, document: Dict[str, Any]) -> None:
+    """Write to a temporary file next to path and rename it into place."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o600
+    fd, tmp_path = tempfile.mkstemp(prefix=".kubeconfig-", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            yaml.dump(document, f, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper), default_flow_style=False, sort_keys=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def update_kubeconfig(path: str, mutate: Callable[[Dict[str, Any]], Any]) -> Any:
+    """
+    Apply mutate() to one kubeconfig file and persist it atomically.
+
+    The file is re-read under an in-process lock and a file lock, so
+    concurrent editors never lose each other's changes, and written to a
+    temporary file renamed over the original, so readers never see a
+    partial file. Returns whatever mutate() returns.
+    """
+    with _write_lock, _file_lock(path):
+        document = _read(path)
+        updated = copy.deepcopy(document)
+        result = mutate(updated)
+        if updated != document:
+            updated.setdefault("apiVersion", "v1")
+            updated.setdefault("kind", "Config")
+            _write_atomic(path, updated)
+    return result
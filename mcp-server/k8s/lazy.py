@@ -0,0 +1,39 @@
+import importlib
+import sys
+import threading
+import types
+from typing import Any, List
+
+
+class LazyModule(types.ModuleType):
+    """
+    A stand-in for a module that is imported on first attribute access, so
+    heavy packages (the kubernetes client, yaml) are only loaded by the
+    first tool call that needs them instead of at server startup.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _load(self) -> types.ModuleType:
+        with self.__dict__["_lazy_lock"]:
+            module = importlib.import_module(self.__name__)
+            # Copy the real module's namespace in, so later lookups are
+            # plain attribute hits instead of __getattr__ calls.
+            self.__dict__.update(module.__dict__)
+        return module
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._load(), name)
+
+    def __dir__(self) -> List[str]:
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """The module if it is already imported, otherwise a LazyModule for it."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
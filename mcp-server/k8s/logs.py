@@ -0,0 +1,122 @@
+import codecs
+import os
+import re
+from collections import deque
+from typing import Optional, AsyncIterator, Deque
+
+# Upper bound on the log text a tool keeps in memory and returns, whatever
+# the caller asked for. Older output is dropped first.
+MAX_LOG_BYTES = int(os.environ.get("KUBRALIS_MAX_LOG_BYTES", str(4 * 1024 * 1024)))
+
+
+class TailBuffer:
+    """
+    Keeps the last max_bytes of a byte stream. Memory stays bounded by
+    max_bytes no matter how much is written.
+    """
+
+    def __init__(self, max_bytes: int = MAX_LOG_BYTES):
+        self.max_bytes = max_bytes
+        self.dropped = 0
+        self._buffer = bytearray()
+
+    def write(self, chunk: bytes) -> None:
+        self._buffer += chunk
+        excess = len(self._buffer) - self.max_bytes
+        if excess > 0:
+            del self._buffer[:excess]
+            self.dropped += excess
+
+    def text(self) -> str:
+        """The retained bytes as text, prefixed with a marker when older output was dropped."""
+        data = bytes(self._buffer)
+        if self.dropped:
+            dropped = self.dropped
+            # Start on a line boundary rather than mid-line or mid-character.
+            newline = data.find(b"\n")
+            if newline != -1:
+                dropped += newline + 1
+                data = data[newline + 1:]
+            return f"[... {dropped} earlier bytes truncated ...]\n" + data.decode("utf-8", errors="replace")
+        return data.decode("utf-8", errors="replace")
+
+
+class ChunkDecoder:
+    """Decodes UTF-8 chunk by chunk without splitting multi-byte characters."""
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def decode(self, chunk: bytes, final: bool = False) -> str:
+        return self._decoder.decode(chunk, final)
+
+
+def clamp_bytes(limit_bytes: Optional[int]) -> int:
+    """The effective in-memory bound for a caller-supplied byte limit."""
+    if limit_bytes is None or limit_bytes <= 0:
+        return MAX_LOG_BYTES
+    return min(limit_bytes, MAX_LOG_BYTES)
+
+
+async def collect_lines(
+    chunks: AsyncIterator[bytes],
+    pattern: Optional[str] = None,
+    tail_lines: Optional[int] = None,
+    max_bytes: int = MAX_LOG_BYTES
+) -> str:
+    """
+    Reassemble streamed chunks into lines and keep only the window asked
+    for: lines matching the pattern regex (if any), then the last
+    tail_lines of those (if set), never more than max_bytes in total.
+    Only the current partial line and the retained window are held in
+    memory; the tail_lines window is also trimmed to the lines that can
+    still fall within max_bytes.
+    """
+    regex = re.compile(pattern.encode()) if pattern else None
+    lines: Optional[Deque[bytes]] = deque() if tail_lines else None
+    # Sizes of the oldest tail_lines lines that fell out of the last
+    # max_bytes; only their sizes are kept, for the truncation marker.
+    trimmed: Deque[int] = deque()
+    retained = 0
+    buffer = TailBuffer(max_bytes)
+    partial = b""
+
+    def keep(line: bytes) -> None:
+        nonlocal retained
+        if regex is not None and not regex.search(line):
+            return
+        if lines is None:
+            buffer.write(line)
+            return
+        if len(trimmed) + len(lines) == tail_lines:
+            if trimmed:
+                trimmed.popleft()
+            else:
+                retained -= len(lines.popleft())
+        lines.append(line)
+        retained += len(line)
+        while retained - len(lines[0]) > max_bytes:
+            trimmed.append(len(lines[0]))
+            retained -= len(lines.popleft())
+
+    async for chunk in chunks:
+        data = partial + chunk
+        start = 0
+        while True:
+            end = data.find(b"\n", start)
+            if end == -1:
+                break
+            keep(data[start:end + 1])
+            start = end + 1
+        partial = data[start:]
+        if len(partial) > max_bytes:
+            # A single line longer than the whole budget; keep its end.
+            partial = partial[-max_bytes:]
+    if partial:
+        keep(partial)
+
+    if lines is not None:
+        for line in lines:
+            buffer.write(line)
+        buffer.dropped += sum(trimmed)
+    return buffer.text()
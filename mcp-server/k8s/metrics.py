@@ -0,0 +1,427 @@
+import bisect
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, List, Dict, Tuple, Any, Callable, Deque
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Tool calls and API requests slower than these are logged and kept in
+# the snapshot's slowCalls.
+SLOW_TOOL_SECONDS = float(os.environ.get("KUBRALIS_SLOW_TOOL_MS", "2000")) / 1000
+SLOW_REQUEST_SECONDS = float(os.environ.get("KUBRALIS_SLOW_REQUEST_MS", "1000")) / 1000
+# Upper bounds (seconds) of the latency histogram buckets.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CURRENT_CONTEXT = "current-context"
+_SLOW_CALLS_KEPT = 50
+
+# (context, verb, resource)
+RequestLabels = Tuple[str, str, str]
+
+
+class Histogram:
+    """Latency counts per bucket, with sum, count, min and max."""
+    __slots__ = ("counts", "sum", "count", "min", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Estimate of the q-quantile, interpolated within its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = max(self.min, BUCKETS[i - 1] if i > 0 else 0.0)
+                upper = min(self.max, BUCKETS[i]) if i < len(BUCKETS) else self.max
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "meanMs": round(self.sum / self.count * 1000, 3) if self.count else 0.0,
+            "p50Ms": round(self.quantile(0.5) * 1000, 3),
+            "p90Ms": round(self.quantile(0.9) * 1000, 3),
+            "p99Ms": round(self.quantile(0.99) * 1000, 3),
+            "maxMs": round(self.max * 1000, 3),
+        }
+
+
+class Registry:
+    """Every metric of the process, guarded by one lock (updates are a few dict operations)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Gauges; reset() leaves them alone so calls in progress still balance.
+        self.tools_in_flight: Dict[str, int] = {}
+        self.requests_in_flight: Dict[str, int] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.time()
+            self.tool_latency: Dict[str, Histogram] = {}
+            # (tool, outcome) -> calls; outcome is ok, error (an error result) or exception
+            self.tool_calls: Dict[Tuple[str, str], int] = {}
+            self.request_latency: Dict[RequestLabels, Histogram] = {}
+            # labels + (status code,) -> requests
+            self.request_codes: Dict[Tuple[str, str, str, str], int] = {}
+            self.response_bytes: Dict[RequestLabels, int] = {}
+            # (cache, "hit" or "miss") -> lookups
+            self.cache: Dict[Tuple[str, str], int] = {}
+            # (context, status code or error type) -> retried attempts
+            self.retries: Dict[Tuple[str, str], int] = {}
+            self.circuit_opens: Dict[str, int] = {}
+            self.slow_calls: Deque[Dict[str, Any]] = deque(maxlen=_SLOW_CALLS_KEPT)
+
+    def _slow(self, kind: str, name: str, seconds: float, outcome: str) -> None:
+        self.slow_calls.append({"kind": kind, "name": name, "durationMs": round(seconds * 1000, 1),
+                                "outcome": outcome, "at": time.time()})
+
+    def tool_started(self, tool: str) -> None:
+        with self._lock:
+            self.tools_in_flight[tool] = self.tools_in_flight.get(tool, 0) + 1
+
+    def tool_finished(self, tool: str, seconds: float, outcome: str) -> None:
+        with self._lock:
+            self.tools_in_flight[tool] -= 1
+            histogram = self.tool_latency.get(tool)
+            if histogram is None:
+                histogram = self.tool_latency[tool] = Histogram()
+            histogram.observe(seconds)
+            key = (tool, outcome)
+            self.tool_calls[key] = self.tool_calls.get(key, 0) + 1
+            if seconds >= SLOW_TOOL_SECONDS:
+                self._slow("tool", tool, seconds, outcome)
+        if seconds >= SLOW_TOOL_SECONDS:
+            logger.warning("Slow tool call %s took %.0f ms (%s)", tool, seconds * 1000, outcome,
+                           extra={"tool": tool, "durationMs": round(seconds * 1000, 1), "outcome": outcome})
+
+    def request_started(self, context: str) -> None:
+        with self._lock:
+            self.requests_in_flight[context] = self.requests_in_flight.get(context, 0) + 1
+
+    def request_finished(self, labels: RequestLabels, seconds: float, code: str) -> None:
+        with self._lock:
+            self.requests_in_flight[labels[0]] -= 1
+            histogram = self.request_latency.get(labels)
+            if histogram is None:
+                histogram = self.request_latency[labels] = Histogram()
+            histogram.observe(seconds)
+            key = labels + (code,)
+            self.request_codes[key] = self.request_codes.get(key, 0) + 1
+            if seconds >= SLOW_REQUEST_SECONDS:
+                self._slow("request", " ".join(labels), seconds, code)
+        if seconds >= SLOW_REQUEST_SECONDS:
+            logger.warning("Slow API request %s %s on %s took %.0f ms (%s)", labels[1], labels[2], labels[0],
+                           seconds * 1000, code,
+                           extra={"context": labels[0], "verb": labels[1], "resource": labels[2],
+                                  "durationMs": round(seconds * 1000, 1), "code": code})
+
+    def add_bytes(self, labels: RequestLabels, size: int) -> None:
+        with self._lock:
+            self.response_bytes[labels] = self.response_bytes.get(labels, 0) + size
+
+    def retry(self, context: str, reason: str) -> None:
+        key = (context, reason)
+        with self._lock:
+            self.retries[key] = self.retries.get(key, 0) + 1
+
+    def circuit_open(self, context: str) -> None:
+        with self._lock:
+            self.circuit_opens[context] = self.circuit_opens.get(context, 0) + 1
+
+    def cache_lookup(self, cache: str, hit: bool) -> None:
+        key = (cache, "hit" if hit else "miss")
+        with self._lock:
+            self.cache[key] = self.cache.get(key, 0) + 1
+
+
+_registry = Registry()
+
+
+def instrument_tool(name: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap a tool function so every call is timed and counted. The wrapper
+    keeps fn's signature (through __wrapped__), so the tool schema is the same.
+    """
+    def outcome_of(result: Any) -> str:
+        return "error" if isinstance(result, dict) and "error" in result else "ok"
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def timed(*args, **kwargs):
+            _registry.tool_started(name)
+            started = time.perf_counter()
+            outcome = "exception"
+            try:
+                result = await fn(*args, **kwargs)
+                outcome = outcome_of(result)
+                return result
+            finally:
+                _registry.tool_finished(name, time.perf_counter() - started, outcome)
+    else:
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            _registry.tool_started(name)
+            started = time.perf_counter()
+            outcome = "exception"
+            try:
+                result = fn(*args, **kwargs)
+                outcome = outcome_of(result)
+                return result
+            finally:
+                _registry.tool_finished(name, time.perf_counter() - started, outcome)
+    return timed
+
+
+def request_labels(method: str, url: str, query_params: Any = None) -> Tuple[str, str]:
+    """
+    (verb, resource) of an API request, e.g. ("list", "pods") or
+    ("get", "pods/log"). Discovery requests are ("get", "discovery").
+    """
+    parts = [p for p in urlsplit(url).path.split("/") if p]
+    # Skip any proxy prefix in front of /api or /apis.
+    for i, part in enumerate(parts):
+        if part == "api":
+            rest = parts[i + 2:]
+            break
+        if part == "apis":
+            rest = parts[i + 3:]
+            break
+    else:
+        return method.lower(), parts[0] if parts else ""
+    if not rest:
+        return "get", "discovery"
+    if len(rest) >= 3 and rest[0] == "namespaces":
+        rest = rest[2:]
+    resource = rest[0]
+    if len(rest) > 2:
+        resource = f"{resource}/{rest[2]}"
+    method = method.upper()
+    if method == "GET":
+        if any(key == "watch" and str(value).lower() in ("true", "1") for key, value in query_params or ()):
+            return "watch", resource
+        return ("get" if len(rest) > 1 else "list"), resource
+    return {"POST": "create", "PUT": "update", "PATCH": "patch", "DELETE": "delete"}.get(method, method.lower()), resource
+
+
+def instrument_request(request: Callable[..., Any], context: Optional[str]) -> Callable[..., Any]:
+    """
+    Wrap a RESTClientObject.request so every HTTP request of a context is
+    timed and counted by verb, resource and status code. Bodies read later
+    (_preload_content=False) are counted by record_body() as they are read.
+    """
+    context_label = context or CURRENT_CONTEXT
+
+    @functools.wraps(request)
+    def timed(method, url, query_params=None, headers=None, body=None, post_params=None,
+              _preload_content=True, _request_timeout=None):
+        verb, resource = request_labels(method, url, query_params)
+        labels = (context_label, verb, resource)
+        _registry.request_started(context_label)
+        started = time.perf_counter()
+        code = "error"
+        try:
+            response = request(method, url, query_params=query_params, headers=headers, body=body,
+                               post_params=post_params, _preload_content=_preload_content,
+                               _request_timeout=_request_timeout)
+            code = str(response.status)
+            if _preload_content:
+                _registry.add_bytes(labels, len(response.data or b""))
+            else:
+                response.kubralis_labels = labels
+            return response
+        except Exception as e:
+            # ApiException carries the status; connection errors do not.
+            code = str(getattr(e, "status", None) or type(e).__name__)
+            raise
+        finally:
+            _registry.request_finished(labels, time.perf_counter() - started, code)
+
+    return timed
+
+
+def record_body(response: Any, size: int) -> None:
+    """Count body bytes read from an instrumented _preload_content=False response."""
+    labels = getattr(response, "kubralis_labels", None)
+    if labels is not None and size:
+        _registry.add_bytes(labels, size)
+
+
+def record_retry(context: str, reason: str) -> None:
+    """Count a retried API request attempt."""
+    _registry.retry(context, reason)
+
+
+def record_circuit_open(context: str) -> None:
+    """Count a context's circuit breaker opening."""
+    _registry.circuit_open(context)
+
+
+def cache_lookup(cache: str, hit: bool) -> None:
+    """Count a lookup in a named cache (e.g. "informer:pods" or "discovery")."""
+    _registry.cache_lookup(cache, hit)
+
+
+def reset() -> None:
+    _registry.reset()
+
+
+def snapshot() -> Dict[str, Any]:
+    """All metrics as one JSON-friendly dict."""
+    r = _registry
+    with r._lock:
+        tools = {}
+        for tool, histogram in sorted(r.tool_latency.items()):
+            tools[tool] = {
+                **histogram.summary(),
+                "errors": r.tool_calls.get((tool, "error"), 0),
+                "exceptions": r.tool_calls.get((tool, "exception"), 0),
+                "inFlight": r.tools_in_flight.get(tool, 0),
+            }
+        requests = []
+        for labels, histogram in sorted(r.request_latency.items()):
+            codes = {key[3]: n for key, n in r.request_codes.items() if key[:3] == labels}
+            requests.append({
+                "context": labels[0], "verb": labels[1], "resource": labels[2],
+                **histogram.summary(),
+                "bytes": r.response_bytes.get(labels, 0),
+                "codes": codes,
+            })
+        caches: Dict[str, Dict[str, Any]] = {}
+        for (cache, result), n in sorted(r.cache.items()):
+            caches.setdefault(cache, {"hits": 0, "misses": 0})["hits" if result == "hit" else "misses"] = n
+        for stats in caches.values():
+            total = stats["hits"] + stats["misses"]
+            stats["hitRate"] = round(stats["hits"] / total, 4) if total else None
+        retries: Dict[str, Dict[str, int]] = {}
+        for (context, reason), n in sorted(r.retries.items()):
+            retries.setdefault(context, {})[reason] = n
+        return {
+            "uptimeSeconds": round(time.time() - r.started, 1),
+            "tools": tools,
+            "apiRequests": requests,
+            "caches": caches,
+            "retries": retries,
+            "circuitOpens": dict(r.circuit_opens),
+            "inFlight": {
+                "tools": sum(r.tools_in_flight.values()),
+                "requests": {context: n for context, n in r.requests_in_flight.items() if n},
+            },
+            "slowCalls": list(r.slow_calls),
+        }
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[Any, ...]) -> str:
+    return ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+
+
+def _histogram_lines(metric: str, names: Tuple[str, ...], histograms: Dict[Tuple, Histogram]) -> List[str]:
+    lines = []
+    for values, histogram in sorted(histograms.items()):
+        labels = _labels(names, values)
+        cumulative = 0
+        for bound, n in zip(BUCKETS + (float("inf"),), histogram.counts):
+            cumulative += n
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f"{metric}_sum{{{labels}}} {histogram.sum}")
+        lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+    return lines
+
+
+def render_prometheus() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    r = _registry
+    out: List[str] = []
+
+    def family(name: str, kind: str, help_text: str, lines: List[str]) -> None:
+        out.append(f"# HELP {name} {help_text}")
+        out.append(f"# TYPE {name} {kind}")
+        out.extend(lines)
+
+    with r._lock:
+        family("kubralis_tool_duration_seconds", "histogram", "Tool call latency.",
+               _histogram_lines("kubralis_tool_duration_seconds", ("tool",),
+                                {(tool,): h for tool, h in r.tool_latency.items()}))
+        family("kubralis_tool_calls_total", "counter", "Tool calls by outcome.",
+               [f"kubralis_tool_calls_total{{{_labels(('tool', 'outcome'), key)}}} {n}"
+                for key, n in sorted(r.tool_calls.items())])
+        family("kubralis_tools_in_flight", "gauge", "Tool calls in progress.",
+               [f"kubralis_tools_in_flight{{{_labels(('tool',), (tool,))}}} {n}"
+                for tool, n in sorted(r.tools_in_flight.items())])
+        family("kubralis_api_request_duration_seconds", "histogram", "Kubernetes API request latency.",
+               _histogram_lines("kubralis_api_request_duration_seconds", ("context", "verb", "resource"),
+                                r.request_latency))
+        family("kubralis_api_requests_total", "counter", "Kubernetes API requests by status code.",
+               [f"kubralis_api_requests_total{{{_labels(('context', 'verb', 'resource', 'code'), key)}}} {n}"
+                for key, n in sorted(r.request_codes.items())])
+        family("kubralis_api_response_bytes_total", "counter", "Kubernetes API response body bytes.",
+               [f"kubralis_api_response_bytes_total{{{_labels(('context', 'verb', 'resource'), key)}}} {n}"
+                for key, n in sorted(r.response_bytes.items())])
+        family("kubralis_api_requests_in_flight", "gauge", "Kubernetes API requests in progress.",
+               [f"kubralis_api_requests_in_flight{{{_labels(('context',), (context,))}}} {n}"
+                for context, n in sorted(r.requests_in_flight.items())])
+        family("kubralis_api_retries_total", "counter", "Retried Kubernetes API request attempts.",
+               [f"kubralis_api_retries_total{{{_labels(('context', 'reason'), key)}}} {n}"
+                for key, n in sorted(r.retries.items())])
+        family("kubralis_circuit_opens_total", "counter", "Times a context's circuit breaker opened.",
+               [f"kubralis_circuit_opens_total{{{_labels(('context',), (context,))}}} {n}"
+                for context, n in sorted(r.circuit_opens.items())])
+        family("kubralis_cache_lookups_total", "counter", "Cache lookups by result.",
+               [f"kubralis_cache_lookups_total{{{_labels(('cache', 'result'), key)}}} {n}"
+                for key, n in sorted(r.cache.items())])
+    return "\n".join(out) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def serve_prometheus(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve render_prometheus() at http://host:port/metrics from a background thread."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info("Serving Prometheus metrics on http://%s:%d/metrics", host, server.server_address[1])
+    return server
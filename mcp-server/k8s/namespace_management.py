@@ -1,15 +1,19 @@
-from mcp.server.fastmcp import FastMCP
+from typing import Optional, List, Dict, Any, Union
 
-from kubernetes import client, config
-from typing import Optional, List, Dict, Any
-import yaml
-mcp = FastMCP("Kubestellar  MCP")
+from k8s.client_pool import get_api_client
+from k8s.cursors import cursor_result
+from k8s.dispatch import call
+from k8s.fanout import fan_out
+from k8s.informer import get_cached
+from k8s.lazy import lazy_import
+from k8s.pagination import list_collection
+from k8s.raw import accept_override, output_converter, read_object, render_cached
+from mcp_instance import mcp
+
+client = lazy_import("kubernetes.client")
+yaml = lazy_import("yaml")
 
 
-def load_kube_config(context: Optional[str] = None):
-    """Load kubeconfig for a given context."""
-    config.load_kube_config(context=context)
-    
 @mcp.tool()
 async def create_namespace(
     namespace: str,
@@ -19,8 +23,7 @@ async def create_namespace(
     Create a namespace in the Kubernetes cluster.
     Returns the created namespace's dictionary.
     """
-    load_kube_config(context)
-    v1 = client.CoreV1Api()
+    v1 = client.CoreV1Api(get_api_client(context))
     
     namespace_manifest = {
         "apiVersion": "v1",
@@ -29,7 +32,7 @@ async def create_namespace(
     }
     
     try:
-        ns = v1.create_namespace(body=namespace_manifest)
+        ns = await call(context, v1.create_namespace, body=namespace_manifest)
         return ns.to_dict()
     except client.exceptions.ApiException as e:
         return {
@@ -47,11 +50,10 @@ async def delete_namespace(
     Delete a namespace in the Kubernetes cluster.
     Returns the status of the deletion.
     """
-    load_kube_config(context)
-    v1 = client.CoreV1Api()
+    v1 = client.CoreV1Api(get_api_client(context))
     
     try:
-        response = v1.delete_namespace(name=namespace)
+        response = await call(context, v1.delete_namespace, name=namespace)
         return response.to_dict()
     except client.exceptions.ApiException as e:
         return {
@@ -62,18 +64,43 @@ async def delete_namespace(
 
 @mcp.tool()
 async def list_namespaces(
-    context: Optional[str] = None
-) -> List[Dict[str, Any]]:
+    context: Optional[str] = None,
+    limit: Optional[int] = None,
+    continue_token: Optional[str] = None,
+    output: str = "object",
+    fields: Optional[List[str]] = None,
+    contexts: Optional[Union[str, List[str]]] = None,
+    use_cursor: bool = True
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
     List all namespaces in the Kubernetes cluster.
-    Returns a list of namespace dictionaries.
+    Returns a list of namespace dictionaries. When limit or continue_token is
+    given, returns one page as {"items", "continue", "remainingItemCount"};
+    pass "continue" back as continue_token to get the next page.
+    output="json" returns the API's own JSON instead of the client model
+    dump, output="table" returns compact kubectl-style rows and
+    output="metadata" returns only object metadata; fields (e.g.
+    ["metadata.name", "status.phase"]) keeps only those paths.
+    contexts ("all", a glob such as "wds*", or a list of names) queries
+    several contexts concurrently and returns {"contexts", "items",
+    "errors"} with every item tagged by its "context"; when paged, its
+    "continue" token covers every context and pages them all together.
+    Results larger than KUBRALIS_CURSOR_THRESHOLD come back as a first
+    slice plus a "cursor" for read_cursor, unless use_cursor=False.
     """
-    load_kube_config(context)
-    v1 = client.CoreV1Api()
+    if contexts:
+        result = await fan_out(contexts, lambda ctx, token: list_namespaces(
+            context=ctx, limit=limit, continue_token=token, output=output, fields=fields,
+            use_cursor=False), continue_token=continue_token)
+        return cursor_result(result, "list_namespaces") if use_cursor else result
+    raw, convert = output_converter(output, fields)
+    v1 = client.CoreV1Api(get_api_client(context))
     
     try:
-        namespaces = v1.list_namespace()
-        return [ns.to_dict() for ns in namespaces.items]
+        list_func = accept_override(v1.list_namespace, "/api/v1/namespaces", output)
+        result = await list_collection(context, list_func, convert, raw=raw,
+                                       limit=limit, continue_token=continue_token)
+        return cursor_result(result, "list_namespaces") if use_cursor else result
     except client.exceptions.ApiException as e:
         return {
             "error": f"Kubernetes API error: {e.status}",
@@ -91,8 +118,7 @@ async def create_labelled_namespace(
     Create a labeled namespace in the Kubernetes cluster.
     Returns the created namespace's dictionary with labels.
     """
-    load_kube_config(context)
-    v1 = client.CoreV1Api()
+    v1 = client.CoreV1Api(get_api_client(context))
     
     namespace_manifest = {
         "apiVersion": "v1",
@@ -104,7 +130,7 @@ async def create_labelled_namespace(
     }
     
     try:
-        ns = v1.create_namespace(body=namespace_manifest)
+        ns = await call(context, v1.create_namespace, body=namespace_manifest)
         return ns.to_dict()
     except client.exceptions.ApiException as e:
         return {
@@ -116,18 +142,26 @@ async def create_labelled_namespace(
 @mcp.tool()
 async def get_namespace_details(
     namespace: str,
-    context: Optional[str] = None
+    context: Optional[str] = None,
+    live: bool = False,
+    output: str = "object",
+    fields: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """
     Get details of a specific namespace in the Kubernetes cluster.
-    Returns the namespace's dictionary.
+    Returns the namespace's dictionary. Served from the informer cache when
+    enabled; set live=True to always read from the API server.
+    output="json" returns the API's own JSON instead of the client model
+    dump, and fields (e.g. ["metadata.name", "status.phase"]) keeps only
+    those paths.
     """
-    load_kube_config(context)
-    v1 = client.CoreV1Api()
+    ns = get_cached(context, "namespaces", namespace, live=live)
+    if ns is not None:
+        return render_cached(ns, output, fields)
+    v1 = client.CoreV1Api(get_api_client(context))
     
     try:
-        ns = v1.read_namespace(name=namespace)
-        return ns.to_dict()
+        return await read_object(context, v1.read_namespace, output, fields, name=namespace)
     except client.exceptions.ApiException as e:
         return {
             "error": f"Kubernetes API error: {e.status}",
@@ -137,17 +171,21 @@ async def get_namespace_details(
 @mcp.tool()
 async def get_namespace_status(
     namespace: str,
-    context: Optional[str] = None
+    context: Optional[str] = None,
+    live: bool = False
 ) -> Dict[str, Any]:
     """
     Get the status of a specific namespace in the Kubernetes cluster.
-    Returns the namespace's status as a dictionary.
+    Returns the namespace's status as a dictionary. Served from the informer
+    cache when enabled; set live=True to always read from the API server.
     """
-    load_kube_config(context)
-    v1 = client.CoreV1Api()
+    ns = get_cached(context, "namespaces", namespace, live=live)
+    if ns is not None:
+        return ns.status.to_dict()
+    v1 = client.CoreV1Api(get_api_client(context))
     
     try:
-        ns = v1.read_namespace(name=namespace)
+        ns = await call(context, v1.read_namespace, name=namespace)
         return ns.status.to_dict()
     except client.exceptions.ApiException as e:
         return {
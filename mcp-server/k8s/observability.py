@@ -0,0 +1,121 @@
+import json
+import logging
+import os
+import sys
+import time
+from typing import Optional, Dict, Any
+
+from k8s.lazy import lazy_import
+from k8s.metrics import render_prometheus, reset, serve_prometheus, snapshot
+from k8s.resilience import breaker_states
+from mcp_instance import mcp
+
+yaml = lazy_import("yaml")
+
+# Loggers of this server. stdout carries the stdio MCP channel, so they
+# only ever write to stderr.
+LOGGERS = ("k8s", "kubestellar")
+
+# Attributes every LogRecord has; anything else was passed through extra=.
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with any extra= fields at the top level."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(level: Optional[str] = None, log_format: Optional[str] = None) -> None:
+    """
+    Send this server's logs to stderr. level and log_format default to
+    KUBRALIS_LOG_LEVEL (default WARNING) and KUBRALIS_LOG_FORMAT ("text" or "json").
+    """
+    level = (level or os.environ.get("KUBRALIS_LOG_LEVEL", "WARNING")).upper()
+    log_format = (log_format or os.environ.get("KUBRALIS_LOG_FORMAT", "text")).lower()
+    handler = logging.StreamHandler(sys.stderr)
+    if log_format == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        formatter = logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        formatter.converter = time.gmtime
+        handler.setFormatter(formatter)
+    for name in LOGGERS:
+        logger = logging.getLogger(name)
+        for old in list(logger.handlers):
+            logger.removeHandler(old)
+        logger.addHandler(handler)
+        logger.setLevel(level)
+        # FastMCP puts its own handler on the root logger; don't log twice.
+        logger.propagate = False
+
+
+class LazyYaml:
+    """
+    Renders obj as YAML only when formatted, so
+    logger.debug("... %s", LazyYaml(obj)) costs nothing unless debug logging is on.
+    """
+    __slots__ = ("obj",)
+
+    def __init__(self, obj: Any):
+        self.obj = obj
+
+    def __str__(self) -> str:
+        return yaml.dump(self.obj, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper), sort_keys=False)
+
+
+def start_metrics_endpoint() -> None:
+    """Serve Prometheus metrics when KUBRALIS_METRICS_PORT is set."""
+    port = os.environ.get("KUBRALIS_METRICS_PORT")
+    if port:
+        serve_prometheus(int(port), os.environ.get("KUBRALIS_METRICS_HOST", "127.0.0.1"))
+
+
+@mcp.tool()
+async def get_server_metrics(output_format: str = "json", reset_after: bool = False) -> Any:
+    """
+    Report this server's own metrics: per-tool latency and error counts,
+    Kubernetes API requests by context, verb and resource (latency, status
+    codes, response bytes, retries), cache hit rates, circuit breaker states,
+    in-flight calls and recent slow calls.
+
+    Args:
+        output_format: "json" (default) or "prometheus" for the Prometheus text format
+        reset_after: Clear all metrics after reading them
+
+    Returns:
+        Dictionary of metrics, or the Prometheus text
+    """
+    if output_format not in ("json", "prometheus"):
+        return {
+            "error": "Invalid output format",
+            "message": "output_format must be one of: json, prometheus"
+        }
+    result = render_prometheus() if output_format == "prometheus" else {**snapshot(), "circuits": breaker_states()}
+    if reset_after:
+        reset()
+    return result
+
+
+@mcp.resource("kubralis://metrics", name="metrics", description="Server metrics as JSON",
+              mime_type="application/json")
+def metrics_resource() -> str:
+    return json.dumps({**snapshot(), "circuits": breaker_states()})
+
+
+@mcp.resource("kubralis://metrics/prometheus", name="metrics-prometheus",
+              description="Server metrics in the Prometheus text format", mime_type="text/plain")
+def prometheus_resource() -> str:
+    return render_prometheus()
@@ -0,0 +1,94 @@
+from typing import Optional, List, Dict, Any, Callable, AsyncIterator, Tuple
+
+from k8s.dispatch import call
+from k8s.raw import call_raw
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+def _split_list(response: Any) -> Tuple[List[Any], Optional[str], Optional[int]]:
+    """Items, continue token and remaining count of a typed or dict list response."""
+    if isinstance(response, dict):
+        metadata = response.get("metadata") or {}
+        if response.get("kind") == "Table":
+            # Server-side Table: turn each row into a {column name: cell} dict.
+            columns = [column["name"] for column in response.get("columnDefinitions") or []]
+            items = [dict(zip(columns, row.get("cells") or [])) for row in response.get("rows") or []]
+        else:
+            items = response.get("items") or []
+        return items, metadata.get("continue") or None, metadata.get("remainingItemCount")
+    metadata = response.metadata
+    return response.items or [], metadata._continue or None, metadata.remaining_item_count
+
+
+async def list_page(
+    context: Optional[str],
+    func: Callable[..., Any],
+    limit: Optional[int] = None,
+    continue_token: Optional[str] = None,
+    raw: bool = False,
+    **kwargs: Any
+) -> Tuple[List[Any], Optional[str], Optional[int]]:
+    """
+    Fetch a single page of a LIST call.
+    Returns (items, continue token for the next page or None, remaining item count).
+    With raw=True the items are plain JSON dicts instead of model objects.
+    """
+    if limit:
+        kwargs["limit"] = limit
+    if continue_token:
+        kwargs["_continue"] = continue_token
+    response = await (call_raw if raw else call)(context, func, **kwargs)
+    return _split_list(response)
+
+
+async def iter_chunks(
+    context: Optional[str],
+    func: Callable[..., Any],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    raw: bool = False,
+    **kwargs: Any
+) -> AsyncIterator[List[Any]]:
+    """
+    Walk a whole collection chunk_size items at a time, following continue
+    tokens, so only one chunk of API objects is alive at once.
+    """
+    continue_token = None
+    while True:
+        items, continue_token, _ = await list_page(context, func, chunk_size, continue_token, raw, **kwargs)
+        yield items
+        if not continue_token:
+            return
+
+
+def page_result(items: List[Any], continue_token: Optional[str], remaining: Optional[int]) -> Dict[str, Any]:
+    """Shape a single page for a tool response."""
+    return {
+        "items": items,
+        "continue": continue_token,
+        "remainingItemCount": remaining,
+    }
+
+
+async def list_collection(
+    context: Optional[str],
+    func: Callable[..., Any],
+    convert: Callable[[Any], Any],
+    limit: Optional[int] = None,
+    continue_token: Optional[str] = None,
+    raw: bool = False,
+    **kwargs: Any
+) -> Any:
+    """
+    Backing for the list tools. With limit or continue_token returns one
+    page_result(); otherwise returns every converted item as a list, still
+    fetched from the API server in DEFAULT_CHUNK_SIZE chunks.
+    """
+    if limit or continue_token:
+        items, continue_token, remaining = await list_page(context, func, limit, continue_token, raw, **kwargs)
+        return page_result([convert(item) for item in items], continue_token, remaining)
+
+    results = []
+    async for chunk in iter_chunks(context, func, raw=raw, **kwargs):
+        results.extend(convert(item) for item in chunk)
+    return results
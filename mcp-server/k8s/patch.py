@@ -0,0 +1,77 @@
+from typing import List, Dict, Any
+
+PATCH_TYPES = ("json", "merge")
+
+CONTENT_TYPES = {
+    "json": "application/json-patch+json",
+    "merge": "application/merge-patch+json",
+}
+
+_MISSING = object()
+
+
+def _pointer(path: str, token: Any) -> str:
+    return f"{path}/{str(token).replace('~', '~0').replace('/', '~1')}"
+
+
+def diff(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """
+    A minimal RFC 6902 JSON patch turning old into new, with the previous
+    value of every replaced or removed path under "old" (strip it before
+    sending). Dicts are diffed key by key and lists element by element;
+    a list that grows or shrinks only gains or loses elements at its end.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key, value in old.items():
+            if key not in new:
+                ops.append({"op": "remove", "path": _pointer(path, key), "old": value})
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": _pointer(path, key), "value": value})
+            else:
+                ops.extend(diff(old[key], value, _pointer(path, key)))
+        return ops
+    if isinstance(old, list) and isinstance(new, list):
+        ops = []
+        for i in range(min(len(old), len(new))):
+            ops.extend(diff(old[i], new[i], _pointer(path, i)))
+        for i in range(len(old), len(new)):
+            ops.append({"op": "add", "path": _pointer(path, "-"), "value": new[i]})
+        # Remove from the end so earlier indices stay valid.
+        for i in range(len(old) - 1, len(new) - 1, -1):
+            ops.append({"op": "remove", "path": _pointer(path, i), "old": old[i]})
+        return ops
+    if old == new and type(old) is type(new):
+        return []
+    return [{"op": "replace", "path": path, "value": new, "old": old}]
+
+
+def json_patch(ops: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The operations of diff() as they are sent, without the "old" values."""
+    return [{k: v for k, v in op.items() if k != "old"} for op in ops]
+
+
+def merge_patch(old: Any, new: Any) -> Any:
+    """
+    A minimal RFC 7386 JSON merge patch turning old into new. Removed keys
+    are set to null; lists cannot be merged and are sent whole. Returns
+    None when nothing changed.
+    """
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return None if old == new and type(old) is type(new) else new
+    patch = {}
+    for key in old:
+        if key not in new:
+            patch[key] = None
+    for key, value in new.items():
+        previous = old.get(key, _MISSING)
+        if previous is _MISSING:
+            patch[key] = value
+        elif isinstance(previous, dict) and isinstance(value, dict):
+            nested = merge_patch(previous, value)
+            if nested is not None:
+                patch[key] = nested
+        elif previous != value or type(previous) is not type(value):
+            patch[key] = value
+    return patch or None
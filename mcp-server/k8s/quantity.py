@@ -0,0 +1,68 @@
+import functools
+import math
+import re
+from array import array
+from typing import Optional, List, Dict, Any, Iterable
+
+_BINARY = {"Ki": 2 ** 10, "Mi": 2 ** 20, "Gi": 2 ** 30, "Ti": 2 ** 40, "Pi": 2 ** 50, "Ei": 2 ** 60}
+# Decimal suffixes as powers of ten, applied through the float literal so
+# "3800m" is exactly 3.8.
+_DECIMAL = {"n": -9, "u": -6, "m": -3, "": 0, "k": 3, "M": 6, "G": 9, "T": 12, "P": 15, "E": 18}
+_QUANTITY = re.compile(r"^([+-]?(?:\d+\.?\d*|\.\d+))(?:([eE][+-]?\d+)|(Ki|Mi|Gi|Ti|Pi|Ei|[numkMGTPE])?)$")
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_quantity(value: str) -> float:
+    """
+    A Kubernetes resource quantity ("3800m", "15Gi", "1e3", "110") as a
+    float in base units: cores for CPU, bytes for memory and storage.
+    Memoized, since a fleet repeats the same few values on every node.
+    Raises ValueError for anything that is not a quantity.
+    """
+    match = _QUANTITY.match(str(value).strip())
+    if match is None:
+        raise ValueError(f"Invalid quantity: {value!r}")
+    number, exponent, suffix = match.groups()
+    if exponent:
+        return float(number + exponent)
+    if suffix in _BINARY:
+        return float(number) * _BINARY[suffix]
+    return float(f"{number}e{_DECIMAL[suffix or '']}")
+
+
+def quantity_or_zero(value: Any) -> float:
+    """parse_quantity(), with missing or malformed values counted as 0."""
+    if value is None:
+        return 0.0
+    try:
+        return parse_quantity(value)
+    except ValueError:
+        return 0.0
+
+
+def percentile(sorted_values: "array", q: float) -> Optional[float]:
+    """Nearest-rank q-th percentile (0-100) of an already sorted column."""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarize_column(values: Iterable[float], percentiles: List[float]) -> Dict[str, Any]:
+    """Total, min, max and percentiles of a column of numbers."""
+    column = array("d", sorted(values))
+    summary: Dict[str, Any] = {
+        "total": round_quantity(sum(column)),
+        "min": round_quantity(column[0]) if column else None,
+        "max": round_quantity(column[-1]) if column else None,
+    }
+    for q in percentiles:
+        summary[f"p{q:g}"] = round_quantity(percentile(column, q))
+    return summary
+
+
+def round_quantity(value: Optional[float]) -> Optional[float]:
+    """Whole numbers as int, others to three decimals, for compact JSON."""
+    if value is None:
+        return None
+    return int(value) if value == int(value) else round(value, 3)
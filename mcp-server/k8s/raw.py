@@ -0,0 +1,216 @@
+import functools
+import json
+from typing import Optional, List, Dict, Any, Callable, Tuple
+
+try:
+    import orjson
+    loads: Callable[[bytes], Any] = orjson.loads
+except ImportError:
+    loads = json.loads
+
+from k8s.dispatch import call
+from k8s.lazy import lazy_import
+from k8s.metrics import record_body
+
+client = lazy_import("kubernetes.client")
+
+OUTPUT_MODES = ("object", "json", "table", "metadata")
+
+# Output modes the API server renders itself, selected through the Accept header.
+ACCEPT_HEADERS = {
+    "table": "application/json;as=Table;v=v1;g=meta.k8s.io,application/json",
+    "metadata": "application/json;as=PartialObjectMetadataList;v=v1;g=meta.k8s.io,application/json",
+}
+
+@functools.lru_cache(maxsize=None)
+def _serializer() -> "client.ApiClient":
+    # Only used for its model -> JSON serializer, never for requests.
+    return client.ApiClient()
+
+
+def decode(response: Any) -> Any:
+    """Decode the body of a _preload_content=False response in one pass."""
+    try:
+        data = response.data
+        record_body(response, len(data))
+        return loads(data)
+    finally:
+        response.release_conn()
+
+
+def api_request(
+    api_client: "client.ApiClient",
+    method: str,
+    path: str,
+    query: Optional[List[Tuple[str, Any]]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    body: Any = None,
+    _preload_content: bool = False,
+    _request_timeout: Any = None
+) -> Any:
+    """
+    Issue an arbitrary request through an ApiClient, for the cases the
+    generated API methods cannot express (custom Accept or Content-Type
+    headers, proxy subresources). Blocking; run it through dispatch.call().
+    Returns the undecoded urllib3 response unless _preload_content is set.
+    """
+    header_params = {"Accept": "application/json"}
+    if headers:
+        header_params.update(headers)
+    return api_client.call_api(
+        path, method,
+        query_params=query or [],
+        header_params=header_params,
+        body=body,
+        auth_settings=["BearerToken"],
+        response_type="object" if _preload_content else None,
+        _return_http_data_only=True,
+        _preload_content=_preload_content,
+        _request_timeout=_request_timeout,
+    )
+
+
+def accept_override(func: Callable[..., Any], path: str, output: str) -> Callable[..., Any]:
+    """
+    For the "table" and "metadata" output modes, replace a generated list_*
+    method with one that GETs path with the matching Accept header. The
+    replacement understands the same paging and selector keyword arguments,
+    so it plugs into k8s.pagination unchanged. Other modes get func back.
+    """
+    accept = ACCEPT_HEADERS.get(output)
+    if accept is None:
+        return func
+    api_client = func.__self__.api_client
+
+    def list_with_accept(limit=None, _continue=None, label_selector=None, field_selector=None,
+                         _preload_content=True, _request_timeout=None, **path_params):
+        query = []
+        if limit:
+            query.append(("limit", limit))
+        if _continue:
+            query.append(("continue", _continue))
+        if label_selector:
+            query.append(("labelSelector", label_selector))
+        if field_selector:
+            query.append(("fieldSelector", field_selector))
+        if output == "table":
+            # Cells only; the embedded object would undo the savings.
+            query.append(("includeObject", "None"))
+        return api_request(api_client, "GET", path.format(**path_params), query,
+                           headers={"Accept": accept}, _preload_content=_preload_content,
+                           _request_timeout=_request_timeout)
+
+    return list_with_accept
+
+
+async def call_raw(context: Optional[str], func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Like dispatch.call(), but skips the OpenAPI model layer: the response is
+    decoded straight from JSON into plain dicts using the API's own
+    (camelCase) field names. The body is read on the worker thread, so the
+    connection is back in the pool before the call's concurrency slot is.
+    """
+    return await call(context, _call_decoded, func, *args, _preload_content=False, **kwargs)
+
+
+def _call_decoded(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    return decode(func(*args, **kwargs))
+
+
+def compile_fields(fields: List[str]) -> Dict[str, Any]:
+    """
+    Turn dotted paths like ["metadata.name", "status.phase"] into a nested
+    dict of keys to keep, where None marks "keep the whole value".
+    """
+    tree: Dict[str, Any] = {}
+    for field in fields:
+        node = tree
+        parts = field.split(".")
+        for i, part in enumerate(parts):
+            last = i == len(parts) - 1
+            if last:
+                node[part] = None
+            elif node.get(part, {}) is None:
+                # A shorter path already keeps this whole subtree.
+                break
+            else:
+                node = node.setdefault(part, {})
+    return tree
+
+
+def project(obj: Any, tree: Optional[Dict[str, Any]]) -> Any:
+    """
+    Keep only the paths in a compile_fields() tree. Lists are projected
+    element by element, so "spec.containers.image" keeps the image of every
+    container. Missing paths are left out rather than filled with None.
+    """
+    if tree is None:
+        return obj
+    if isinstance(obj, list):
+        return [project(item, tree) for item in obj]
+    if not isinstance(obj, dict):
+        return obj
+    result = {}
+    for key, subtree in tree.items():
+        if key in obj:
+            result[key] = project(obj[key], subtree)
+    return result
+
+
+def output_converter(output: str = "object", fields: Optional[List[str]] = None) -> Tuple[bool, Callable[[Any], Any]]:
+    """
+    Pick how a tool renders API objects. Returns (raw, convert): whether
+    the response should be fetched as raw JSON, and the function applied to
+    each object.
+
+    "object" keeps the historical model .to_dict() output (snake_case keys).
+    "json" returns the API's JSON as-is, which skips building model objects
+    entirely. Passing fields implies "json" and keeps only those paths.
+    "table" (one {column: cell} dict per row, as kubectl get prints) and
+    "metadata" (metadata only, without managedFields) are rendered by the
+    API server and need the list method wrapped with accept_override().
+    """
+    if output not in OUTPUT_MODES:
+        raise ValueError(f"Unknown output mode '{output}'; expected one of {', '.join(OUTPUT_MODES)}")
+    if output == "object" and not fields:
+        return False, lambda obj: obj.to_dict()
+    tree = compile_fields(fields) if fields else None
+    if output == "metadata":
+        return True, lambda obj: project(_strip_managed_fields(obj), tree)
+    return True, lambda obj: project(obj, tree)
+
+
+def _strip_managed_fields(obj: Dict[str, Any]) -> Dict[str, Any]:
+    metadata = obj.get("metadata")
+    if metadata and "managedFields" in metadata:
+        obj["metadata"] = {k: v for k, v in metadata.items() if k != "managedFields"}
+    return obj
+
+
+def _reject_list_only(output: str) -> None:
+    if output in ACCEPT_HEADERS:
+        raise ValueError(f"Output mode '{output}' is only supported by list tools")
+
+
+def render_cached(obj: Any, output: str = "object", fields: Optional[List[str]] = None) -> Any:
+    """Render a model object (e.g. from the informer cache) the way output_converter() would."""
+    _reject_list_only(output)
+    raw, convert = output_converter(output, fields)
+    if raw and not isinstance(obj, dict):
+        obj = _serializer().sanitize_for_serialization(obj)
+    return convert(obj)
+
+
+async def read_object(
+    context: Optional[str],
+    func: Callable[..., Any],
+    output: str = "object",
+    fields: Optional[List[str]] = None,
+    **kwargs: Any
+) -> Any:
+    """Fetch a single object and render it according to output/fields."""
+    _reject_list_only(output)
+    raw, convert = output_converter(output, fields)
+    if raw:
+        return convert(await call_raw(context, func, **kwargs))
+    return convert(await call(context, func, **kwargs))
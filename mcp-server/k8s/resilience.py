@@ -0,0 +1,236 @@
+import email.utils
+import functools
+import logging
+import random
+import threading
+import time
+from typing import Optional, Dict, Tuple, Any, Callable
+
+from k8s.lazy import lazy_import
+from k8s.metrics import CURRENT_CONTEXT, record_retry, record_circuit_open
+
+exceptions = lazy_import("kubernetes.client.exceptions")
+urllib3_exceptions = lazy_import("urllib3.exceptions")
+
+logger = logging.getLogger(__name__)
+
+# Retrying these cannot apply a change twice.
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+BACKOFF_BASE = 0.2
+BACKOFF_MAX = 10.0
+
+
+class TokenBucket:
+    """
+    client-go style rate limiter: qps tokens a second, at most burst saved
+    up. take() reserves a token and sleeps until it is due, so waiters are
+    served in order without polling.
+    """
+
+    def __init__(self, qps: float, burst: int):
+        self.qps = qps
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> float:
+        """Take one token, sleeping until it is available. Returns the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.qps)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.qps if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class CircuitBreaker:
+    """
+    Opens after threshold consecutive failed requests and then fails
+    requests immediately for cooldown seconds. After that one probe request
+    is let through: success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> Optional[float]:
+        """None if a request may go ahead, otherwise the seconds until the next probe."""
+        with self._lock:
+            if self.opened_at is None:
+                return None
+            remaining = self.opened_at + self.cooldown - time.monotonic()
+            if remaining > 0 or self._probing:
+                return max(remaining, 0.0)
+            self._probing = True
+            return None
+
+    def record(self, ok: bool) -> bool:
+        """Record a request's outcome. Returns True when this failure opened the circuit."""
+        with self._lock:
+            self._probing = False
+            if ok:
+                self.failures = 0
+                self.opened_at = None
+                return False
+            self.failures += 1
+            if self.failures < self.threshold:
+                return False
+            was_closed = self.opened_at is None
+            self.opened_at = time.monotonic()
+            return was_closed
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if self._probing or time.monotonic() >= self.opened_at + self.cooldown else "open"
+
+
+_limiters: Dict[Tuple[Optional[str], float, int], TokenBucket] = {}
+_breakers: Dict[Optional[str], CircuitBreaker] = {}
+_lock = threading.Lock()
+
+
+def _limiter(context: Optional[str], qps: float, burst: int) -> Optional[TokenBucket]:
+    if qps <= 0:
+        return None
+    # Keyed by the settings too, so configure_context() changes apply to new clients.
+    key = (context, qps, burst)
+    with _lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = TokenBucket(qps, burst)
+    return limiter
+
+
+def _breaker(context: Optional[str], threshold: int, cooldown: float) -> Optional[CircuitBreaker]:
+    if threshold <= 0:
+        return None
+    with _lock:
+        breaker = _breakers.get(context)
+        if breaker is None or (breaker.threshold, breaker.cooldown) != (threshold, cooldown):
+            breaker = _breakers[context] = CircuitBreaker(threshold, cooldown)
+    return breaker
+
+
+def breaker_states() -> Dict[str, str]:
+    """Circuit state of every context that has made a request."""
+    with _lock:
+        return {context or CURRENT_CONTEXT: breaker.state for context, breaker in _breakers.items()}
+
+
+def _retry_after(e: Exception) -> Optional[float]:
+    headers = getattr(e, "headers", None)
+    value = headers.get("Retry-After") if headers else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_connection_error(e: Exception) -> bool:
+    # Refused or reset connections; timeouts are left to the caller's deadline.
+    if isinstance(e, urllib3_exceptions.MaxRetryError):
+        e = e.reason
+    return isinstance(e, (urllib3_exceptions.NewConnectionError, urllib3_exceptions.ProtocolError))
+
+
+def _is_failure(e: Exception) -> bool:
+    """Whether an error says the context is unhealthy (not e.g. a 404 or 409)."""
+    if isinstance(e, exceptions.ApiException):
+        return e.status is not None and (e.status == 429 or e.status >= 500)
+    return True
+
+
+def _deadline(started: float, request_timeout: Any) -> Optional[float]:
+    if isinstance(request_timeout, (int, float)):
+        return started + request_timeout
+    if isinstance(request_timeout, tuple):
+        return started + sum(t for t in request_timeout if t)
+    return None
+
+
+def resilient_request(
+    request: Callable[..., Any],
+    context: Optional[str],
+    qps: float,
+    burst: int,
+    max_retries: int,
+    breaker_threshold: int,
+    breaker_cooldown: float
+) -> Callable[..., Any]:
+    """
+    Wrap a RESTClientObject.request with the context's rate limiter,
+    retries and circuit breaker.
+
+    Every attempt takes a token from the context's bucket. Idempotent
+    requests that fail with 429, a 5xx or a refused/reset connection are
+    retried up to max_retries times with jittered exponential backoff, or
+    after the server's Retry-After, as long as that fits in the request
+    timeout. While the circuit is open requests fail at once with a 503
+    ApiException.
+    """
+    limiter = _limiter(context, qps, burst)
+    breaker = _breaker(context, breaker_threshold, breaker_cooldown)
+    context_label = context or CURRENT_CONTEXT
+
+    @functools.wraps(request)
+    def guarded(method, url, query_params=None, headers=None, body=None, post_params=None,
+                _preload_content=True, _request_timeout=None):
+        if breaker is not None:
+            wait = breaker.allow()
+            if wait is not None:
+                raise exceptions.ApiException(
+                    status=503,
+                    reason=f"Context '{context_label}' is failing; circuit open, retry in {wait:.1f}s")
+        retries = max_retries if method.upper() in IDEMPOTENT_METHODS else 0
+        deadline = _deadline(time.monotonic(), _request_timeout)
+        attempt = 0
+        while True:
+            if limiter is not None:
+                limiter.take()
+            try:
+                response = request(method, url, query_params=query_params, headers=headers, body=body,
+                                   post_params=post_params, _preload_content=_preload_content,
+                                   _request_timeout=_request_timeout)
+            except Exception as e:
+                retryable = isinstance(e, exceptions.ApiException) and e.status in RETRY_STATUSES \
+                    or _is_connection_error(e)
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+                if retryable and attempt < retries and delay <= BACKOFF_MAX \
+                        and (deadline is None or time.monotonic() + delay < deadline):
+                    attempt += 1
+                    reason = str(getattr(e, "status", None) or type(e).__name__)
+                    record_retry(context_label, reason)
+                    logger.info("Retrying %s %s on %s in %.2fs (attempt %d, %s)", method, url, context_label,
+                                delay, attempt, reason)
+                    time.sleep(delay)
+                    continue
+                if breaker is not None and breaker.record(not _is_failure(e)):
+                    record_circuit_open(context_label)
+                    logger.warning("Opening circuit for context %s after %d failed requests", context_label,
+                                   breaker.failures)
+                raise
+            if breaker is not None:
+                breaker.record(True)
+            return response
+
+    return guarded
@@ -1,37 +1,101 @@
-from mcp.server.fastmcp import FastMCP
+import asyncio
+import contextlib
+import copy
+import heapq
+import time
+import uuid
+from array import array
 
-from kubernetes import client, config
-from typing import Optional, List, Dict, Any
-import yaml
-mcp = FastMCP("Kubestellar  MCP")
+from mcp.server.fastmcp import Context
 
+from typing import Optional, List, Dict, Tuple, Any, Union
+
+from k8s.client_pool import get_api_client, get_context_options
+from k8s.cursors import cursor_result, stash_object
+from k8s.dispatch import call, stream
+from k8s.fanout import fan_out
+from k8s.informer import get_cached
+from k8s.lazy import lazy_import
+from k8s.logs import TailBuffer, ChunkDecoder, clamp_bytes
+from k8s.pagination import iter_chunks, list_collection
+from k8s.quantity import percentile, quantity_or_zero, round_quantity
+from k8s.raw import accept_override, call_raw, output_converter, read_object, render_cached
+from k8s.watching import list_resource_version, resource_version_of, watch_events
+from mcp_instance import mcp
+
+client = lazy_import("kubernetes.client")
+yaml = lazy_import("yaml")
 
-def load_kube_config(context: Optional[str] = None):
-    """Load kubeconfig for a given context."""
-    config.load_kube_config(context=context)
 
 @mcp.tool()
 async def list_pods(namespace: str = "default", label_selector: Optional[str] = None,
-              field_selector: Optional[str] = None, context: Optional[str] = None) -> List[Dict[str, Any]]:
+              field_selector: Optional[str] = None, context: Optional[str] = None,
+              limit: Optional[int] = None, continue_token: Optional[str] = None,
+              output: str = "object", fields: Optional[List[str]] = None,
+              contexts: Optional[Union[str, List[str]]] = None,
+              use_cursor: bool = True) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
     List pods in a namespace.
-    Returns a list of pod dictionaries.
+    Returns a list of pod dictionaries. When limit or continue_token is
+    given, returns one page as {"items", "continue", "remainingItemCount"};
+    pass "continue" back as continue_token to get the next page.
+    output="json" returns the API's own JSON instead of the client model
+    dump, output="table" returns compact kubectl-style rows and
+    output="metadata" returns only object metadata; fields (e.g.
+    ["metadata.name", "status.phase"]) keeps only those paths.
+    contexts ("all", a glob such as "wds*", or a list of names) queries
+    several contexts concurrently and returns {"contexts", "items",
+    "errors"} with every item tagged by its "context"; when paged, its
+    "continue" token covers every context and pages them all together.
+    Results larger than KUBRALIS_CURSOR_THRESHOLD come back as a first
+    slice plus a "cursor" for read_cursor, unless use_cursor=False.
     """
-    load_kube_config(context)
-    v1 = client.CoreV1Api()
-    pods = v1.list_namespaced_pod(namespace=namespace, label_selector=label_selector, field_selector=field_selector)
-    return [pod.to_dict() for pod in pods.items]
+    if contexts:
+        result = await fan_out(contexts, lambda ctx, token: list_pods(
+            namespace, label_selector, field_selector, context=ctx, limit=limit, continue_token=token,
+            output=output, fields=fields, use_cursor=False), continue_token=continue_token)
+        return cursor_result(result, "list_pods") if use_cursor else result
+    raw, convert = output_converter(output, fields)
+    v1 = client.CoreV1Api(get_api_client(context))
+    list_func = accept_override(v1.list_namespaced_pod, "/api/v1/namespaces/{namespace}/pods", output)
+    result = await list_collection(context, list_func, convert, raw=raw,
+                                   limit=limit, continue_token=continue_token,
+                                   namespace=namespace, label_selector=label_selector, field_selector=field_selector)
+    return cursor_result(result, "list_pods") if use_cursor else result
 
 @mcp.tool()
-async def get_nodes(context: Optional[str] = None) -> List[Dict[str, Any]]:
+async def get_nodes(context: Optional[str] = None, limit: Optional[int] = None,
+                    continue_token: Optional[str] = None, output: str = "object",
+                    fields: Optional[List[str]] = None,
+                    contexts: Optional[Union[str, List[str]]] = None,
+                    use_cursor: bool = True) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Get nodes in the cluster.
-    Returns a list of node dictionaries.
+    Returns a list of node dictionaries. When limit or continue_token is
+    given, returns one page as {"items", "continue", "remainingItemCount"};
+    pass "continue" back as continue_token to get the next page.
+    output="json" returns the API's own JSON instead of the client model
+    dump, output="table" returns compact kubectl-style rows and
+    output="metadata" returns only object metadata; fields (e.g.
+    ["metadata.name", "status.phase"]) keeps only those paths.
+    contexts ("all", a glob such as "wds*", or a list of names) queries
+    several contexts concurrently and returns {"contexts", "items",
+    "errors"} with every item tagged by its "context"; when paged, its
+    "continue" token covers every context and pages them all together.
+    Results larger than KUBRALIS_CURSOR_THRESHOLD come back as a first
+    slice plus a "cursor" for read_cursor, unless use_cursor=False.
     """
-    load_kube_config(context)
-    v1 = client.CoreV1Api()
-    nodes = v1.list_node()
-    return [node.to_dict() for node in nodes.items]
+    if contexts:
+        result = await fan_out(contexts, lambda ctx, token: get_nodes(
+            context=ctx, limit=limit, continue_token=token, output=output, fields=fields,
+            use_cursor=False), continue_token=continue_token)
+        return cursor_result(result, "get_nodes") if use_cursor else result
+    raw, convert = output_converter(output, fields)
+    v1 = client.CoreV1Api(get_api_client(context))
+    list_func = accept_override(v1.list_node, "/api/v1/nodes", output)
+    result = await list_collection(context, list_func, convert, raw=raw,
+                                   limit=limit, continue_token=continue_token)
+    return cursor_result(result, "get_nodes") if use_cursor else result
 
 @mcp.tool()
 async def create_pod(
@@ -44,8 +108,7 @@ async def create_pod(
     Create a pod in a specified namespace.
     Returns the created pod's dictionary.
     """
-    load_kube_config(context)
-    v1 = client.CoreV1Api()
+    v1 = client.CoreV1Api(get_api_client(context))
     
     pod_manifest = {
         "apiVersion": "v1",
@@ -55,7 +118,7 @@ async def create_pod(
             "containers": [{"name": pod_name, "image": image}]
         }
     }
-    pod = v1.create_namespaced_pod(namespace=namespace, body=pod_manifest)
+    pod = await call(context, v1.create_namespaced_pod, namespace=namespace, body=pod_manifest)
     return pod.to_dict()
 
 @mcp.tool()
@@ -68,53 +131,457 @@ async def delete_pod(
     Delete a pod in a specified namespace.
     Returns the status of the deletion.
     """
-    load_kube_config(context)
-    v1 = client.CoreV1Api()
+    v1 = client.CoreV1Api(get_api_client(context))
     
-    response = v1.delete_namespaced_pod(name=pod_name, namespace=namespace)
+    response = await call(context, v1.delete_namespaced_pod, name=pod_name, namespace=namespace)
     return response.to_dict()
 @mcp.tool()
 async def get_pod_logs(
     namespace: str,
     pod_name: str,
-    context: Optional[str] = None
+    context: Optional[str] = None,
+    container: Optional[str] = None,
+    all_containers: bool = False,
+    previous: bool = False,
+    tail_lines: Optional[int] = None,
+    since_seconds: Optional[int] = None,
+    limit_bytes: Optional[int] = None,
+    timestamps: bool = False,
+    follow: bool = False,
+    follow_seconds: int = 60,
+    ctx: Context = None
 ) -> str:
     """
     Get logs from a specified pod in a namespace.
     Returns the logs as a string.
+
+    container picks one container; all_containers=True returns every
+    container's log, each under a "==> name <==" header. previous=True reads
+    the previous (terminated) instance. tail_lines, since_seconds and
+    limit_bytes are applied by the API server. The returned text never
+    exceeds KUBRALIS_MAX_LOG_BYTES; when it would, the oldest output is
+    dropped and a truncation marker is added.
+
+    follow=True keeps the stream open for up to follow_seconds, sending new
+    output to the client as progress notifications while it arrives, then
+    returns the tail that was collected.
     """
-    load_kube_config(context)
-    v1 = client.CoreV1Api()
-    
-    logs = v1.read_namespaced_pod_log(name=pod_name, namespace=namespace)
-    return logs
+    v1 = client.CoreV1Api(get_api_client(context))
+    log_kwargs = {
+        "previous": previous,
+        "tail_lines": tail_lines,
+        "since_seconds": since_seconds,
+        "limit_bytes": limit_bytes,
+        "timestamps": timestamps,
+    }
+    # Keep explicit zeros (tail_lines=0 is a valid request); drop unset values and false flags.
+    log_kwargs = {k: v for k, v in log_kwargs.items() if v is not None and v is not False}
+
+    if all_containers:
+        if follow:
+            raise ValueError("follow needs a single container; pass container instead of all_containers")
+        pod = await call(context, v1.read_namespaced_pod, name=pod_name, namespace=namespace)
+        names = [c.name for c in (pod.spec.init_containers or [])] + [c.name for c in pod.spec.containers]
+        budget = max(clamp_bytes(limit_bytes) // len(names), 1)
+        logs = await asyncio.gather(*(
+            _read_pod_log(context, v1, namespace, pod_name, name, budget, log_kwargs) for name in names
+        ))
+        return "\n".join(f"==> {name} <==\n{log}" for name, log in zip(names, logs))
+
+    if follow:
+        return await _follow_pod_log(context, v1, namespace, pod_name, container, follow_seconds, log_kwargs, ctx)
+    return await _read_pod_log(context, v1, namespace, pod_name, container, clamp_bytes(limit_bytes), log_kwargs)
+
+
+async def _read_pod_log(context, v1, namespace, pod_name, container, max_bytes, log_kwargs) -> str:
+    """Stream a pod log in chunks, keeping only its last max_bytes."""
+    buffer = TailBuffer(max_bytes)
+    async for chunk in stream(context, v1.read_namespaced_pod_log, name=pod_name, namespace=namespace,
+                              container=container, **log_kwargs):
+        buffer.write(chunk)
+    return buffer.text()
+
+
+async def _follow_pod_log(context, v1, namespace, pod_name, container, follow_seconds, log_kwargs, ctx) -> str:
+    """Follow a pod log for follow_seconds, forwarding chunks as progress notifications."""
+    buffer = TailBuffer(clamp_bytes(log_kwargs.get("limit_bytes")))
+    decoder = ChunkDecoder()
+    received = 0
+
+    async def pump():
+        nonlocal received
+        # Connect timeout as usual; no read timeout, quiet pods are fine.
+        async for chunk in stream(context, v1.read_namespaced_pod_log, name=pod_name, namespace=namespace,
+                                  container=container, follow=True, timeout=None,
+                                  _request_timeout=(get_context_options(context).timeout, None), **log_kwargs):
+            buffer.write(chunk)
+            received += len(chunk)
+            if ctx is not None:
+                await ctx.report_progress(received, None, decoder.decode(chunk))
+
+    try:
+        await asyncio.wait_for(pump(), follow_seconds)
+    except asyncio.TimeoutError:
+        pass
+    return buffer.text()
+
 @mcp.tool()
 async def get_pod_status(
     namespace: str,
     pod_name: str,
-    context: Optional[str] = None
+    context: Optional[str] = None,
+    live: bool = False
 ) -> Dict[str, Any]:
     """
     Get the status of a specified pod in a namespace.
-    Returns the pod's status as a dictionary.
+    Returns the pod's status as a dictionary. Served from the informer cache
+    when enabled; set live=True to always read from the API server.
     """
-    load_kube_config(context)
-    v1 = client.CoreV1Api()
+    pod = get_cached(context, "pods", pod_name, namespace, live=live)
+    if pod is not None:
+        return pod.status.to_dict()
+    v1 = client.CoreV1Api(get_api_client(context))
     
-    pod = v1.read_namespaced_pod(name=pod_name, namespace=namespace)
+    pod = await call(context, v1.read_namespaced_pod, name=pod_name, namespace=namespace)
     return pod.status.to_dict() 
 @mcp.tool()
 async def describe_pod(
     namespace: str,
     pod_name: str,
-    context: Optional[str] = None
+    context: Optional[str] = None,
+    live: bool = False,
+    output: str = "object",
+    fields: Optional[List[str]] = None,
+    use_cursor: bool = True
 ) -> Dict[str, Any]:
     """
     Describe a specified pod in a namespace.
-    Returns the pod's description as a dictionary.
+    Returns the pod's description as a dictionary. Served from the informer
+    cache when enabled; set live=True to always read from the API server.
+    output="json" returns the API's own JSON instead of the client model
+    dump, and fields (e.g. ["metadata.name", "status.phase"]) keeps only
+    those paths.
+    A description larger than KUBRALIS_CURSOR_THRESHOLD is kept
+    server-side: the response lists its top-level fields and sizes with a
+    "cursor" for read_cursor, unless use_cursor=False.
     """
-    load_kube_config(context)
-    v1 = client.CoreV1Api()
-    
-    pod = v1.read_namespaced_pod(name=pod_name, namespace=namespace)
-    return pod.to_dict()
\ No newline at end of file
+    pod = get_cached(context, "pods", pod_name, namespace, live=live)
+    if pod is not None:
+        result = render_cached(pod, output, fields)
+    else:
+        v1 = client.CoreV1Api(get_api_client(context))
+        result = await read_object(context, v1.read_namespaced_pod, output, fields, name=pod_name, namespace=namespace)
+    return stash_object(result, "describe_pod") if use_cursor else result
+
+def _pod_resources(spec: Dict[str, Any], field: str) -> Dict[str, float]:
+    """
+    Effective requests or limits of a raw pod spec, as the scheduler sees
+    them: the larger of the containers' sum and the largest init container.
+    """
+    totals: Dict[str, float] = {}
+    for container in spec.get("containers") or []:
+        for resource, value in ((container.get("resources") or {}).get(field) or {}).items():
+            totals[resource] = totals.get(resource, 0.0) + quantity_or_zero(value)
+    for container in spec.get("initContainers") or []:
+        for resource, value in ((container.get("resources") or {}).get(field) or {}).items():
+            totals[resource] = max(totals.get(resource, 0.0), quantity_or_zero(value))
+    return totals
+
+
+def _pod_reasons(status: Dict[str, Any]) -> List[str]:
+    """Why a raw pod is not simply running: its own reason plus waiting/terminated container reasons."""
+    reasons = {status["reason"]} if status.get("reason") else set()
+    for container in (status.get("initContainerStatuses") or []) + (status.get("containerStatuses") or []):
+        state = container.get("state") or {}
+        for key in ("waiting", "terminated"):
+            reason = (state.get(key) or {}).get("reason")
+            if reason and reason != "Completed":
+                reasons.add(reason)
+        last_reason = ((container.get("lastState") or {}).get("terminated") or {}).get("reason")
+        if last_reason == "OOMKilled":
+            reasons.add(last_reason)
+    return sorted(reasons)
+
+
+class _WorkloadGroup:
+    """Running totals of one group of pods."""
+    __slots__ = ("pods", "phases", "reasons", "restarts", "requests", "limits")
+
+    def __init__(self):
+        self.pods = 0
+        self.phases: Dict[str, int] = {}
+        self.reasons: Dict[str, int] = {}
+        self.restarts = 0
+        self.requests: Dict[str, float] = {}
+        self.limits: Dict[str, float] = {}
+
+    def add(self, phase: str, reasons: List[str], restarts: int, requests: Dict[str, float],
+            limits: Dict[str, float]) -> None:
+        self.pods += 1
+        self.phases[phase] = self.phases.get(phase, 0) + 1
+        for reason in reasons:
+            self.reasons[reason] = self.reasons.get(reason, 0) + 1
+        self.restarts += restarts
+        for resource, value in requests.items():
+            self.requests[resource] = self.requests.get(resource, 0.0) + value
+        for resource, value in limits.items():
+            self.limits[resource] = self.limits.get(resource, 0.0) + value
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "pods": self.pods,
+            "phases": dict(sorted(self.phases.items())),
+            "reasons": dict(sorted(self.reasons.items(), key=lambda item: -item[1])),
+            "restarts": self.restarts,
+            "requests": {resource: round_quantity(value) for resource, value in sorted(self.requests.items())},
+            "limits": {resource: round_quantity(value) for resource, value in sorted(self.limits.items())},
+        }
+
+
+@mcp.tool()
+async def get_workload_rollup(
+    namespace: Optional[str] = None,
+    context: Optional[str] = None,
+    label_selector: Optional[str] = None,
+    field_selector: Optional[str] = None,
+    group_by: str = "namespace",
+    top_restarts: int = 10
+) -> Dict[str, Any]:
+    """
+    Summarize the pods of a namespace (or of all namespaces when namespace
+    is None) instead of listing them.
+    Returns pod counts by phase and by reason (e.g. CrashLoopBackOff,
+    ImagePullBackOff, OOMKilled, Evicted), total restarts, the top_restarts
+    pods with the most restarts, and summed effective container requests
+    and limits of the pods that are not finished (CPU in cores, memory in
+    bytes), overall and per group. group_by is "namespace" or a pod label
+    key such as "app"; pods without the label fall in "<none>".
+    Pods are read a page at a time and only the totals are kept.
+    """
+    v1 = client.CoreV1Api(get_api_client(context))
+    if namespace:
+        list_func, kwargs = v1.list_namespaced_pod, {"namespace": namespace}
+    else:
+        list_func, kwargs = v1.list_pod_for_all_namespaces, {}
+    total = _WorkloadGroup()
+    groups: Dict[str, _WorkloadGroup] = {}
+    # Min-heap of (restarts, namespace, name), so the smallest is dropped first.
+    hot: List[Any] = []
+
+    try:
+        async for chunk in iter_chunks(context, list_func, raw=True, label_selector=label_selector,
+                                       field_selector=field_selector, **kwargs):
+            for pod in chunk:
+                metadata = pod.get("metadata") or {}
+                spec = pod.get("spec") or {}
+                status = pod.get("status") or {}
+                phase = status.get("phase") or "Unknown"
+                restarts = sum(c.get("restartCount") or 0 for c in status.get("containerStatuses") or [])
+                finished = phase in ("Succeeded", "Failed")
+                requests = {} if finished else _pod_resources(spec, "requests")
+                limits = {} if finished else _pod_resources(spec, "limits")
+                reasons = _pod_reasons(status)
+                total.add(phase, reasons, restarts, requests, limits)
+                if group_by == "namespace":
+                    key = metadata.get("namespace") or ""
+                else:
+                    key = (metadata.get("labels") or {}).get(group_by, "<none>")
+                group = groups.get(key)
+                if group is None:
+                    group = groups[key] = _WorkloadGroup()
+                group.add(phase, reasons, restarts, requests, limits)
+                if restarts and top_restarts > 0:
+                    entry = (restarts, metadata.get("namespace") or "", metadata.get("name") or "")
+                    if len(hot) < top_restarts:
+                        heapq.heappush(hot, entry)
+                    elif entry > hot[0]:
+                        heapq.heapreplace(hot, entry)
+    except client.exceptions.ApiException as e:
+        return {
+            "error": f"Kubernetes API error: {e.status}",
+            "message": str(e),
+            "details": e.body if hasattr(e, 'body') else "No details available"
+        }
+
+    return {
+        "namespace": namespace,
+        "groupBy": group_by,
+        **total.summary(),
+        "topRestarts": [{"namespace": ns, "name": name, "restarts": restarts}
+                        for restarts, ns, name in sorted(hot, reverse=True)],
+        "groups": {key: groups[key].summary() for key in sorted(groups)},
+    }
+
+
+BATCH_LABEL = "kubralis.io/batch"
+
+
+def _pod_readiness(pod: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    """("Ready" or "Failed", reason) once a raw pod has settled, else (None, latest waiting reason)."""
+    status = pod.get("status") or {}
+    if status.get("phase") == "Failed":
+        return "Failed", status.get("reason") or "Failed"
+    for condition in status.get("conditions") or []:
+        if condition.get("type") == "Ready" and condition.get("status") == "True":
+            return "Ready", None
+    reasons = _pod_reasons(status)
+    return None, reasons[0] if reasons else status.get("phase")
+
+
+def _pod_manifest(template: Dict[str, Any], name: str, batch: str) -> Dict[str, Any]:
+    manifest = copy.deepcopy(template)
+    manifest.setdefault("apiVersion", "v1")
+    manifest.setdefault("kind", "Pod")
+    metadata = manifest.setdefault("metadata", {})
+    metadata.pop("generateName", None)
+    metadata.pop("namespace", None)
+    metadata["name"] = name
+    metadata.setdefault("labels", {})[BATCH_LABEL] = batch
+    return manifest
+
+
+@mcp.tool()
+async def create_pods(
+    template: Dict[str, Any],
+    replicas: Optional[int] = None,
+    names: Optional[List[str]] = None,
+    namespaces: Union[str, List[str]] = "default",
+    context: Optional[str] = None,
+    concurrency: int = 20,
+    wait_ready: bool = True,
+    timeout_seconds: int = 300
+) -> Dict[str, Any]:
+    """
+    Create many pods from one template and optionally wait until they are Ready.
+
+    template is a pod manifest ({"metadata": {...}, "spec": {...}}); its
+    metadata.name (or generateName) is the prefix of the generated names
+    "<prefix>-<i>" when replicas is given, or pass the exact names. Every
+    pod is created in each of namespaces. Creates run with at most
+    concurrency in flight; readiness is then followed through a single
+    watch on the batch label (kubralis.io/batch) rather than by polling.
+
+    Returns counts, the batch label selector and per pod its status
+    (Ready, Failed, Pending at the timeout, Created when not waiting, or
+    CreateFailed with the API or connection error), the latest waiting
+    reason, the create latency and the time from submission to Ready, in
+    milliseconds.
+    """
+    if isinstance(namespaces, str):
+        namespaces = [namespaces]
+    if names is None:
+        if not replicas or replicas < 1:
+            return {
+                "error": "Invalid input",
+                "message": "Pass replicas (a positive count) or names"
+            }
+        metadata = template.get("metadata") or {}
+        prefix = (metadata.get("name") or metadata.get("generateName") or "pod").rstrip("-")
+        names = [f"{prefix}-{i}" for i in range(replicas)]
+    if not (template.get("spec") or {}).get("containers"):
+        return {
+            "error": "Invalid template",
+            "message": "template.spec.containers must list at least one container"
+        }
+
+    v1 = client.CoreV1Api(get_api_client(context))
+    batch = uuid.uuid4().hex[:12]
+    selector = f"{BATCH_LABEL}={batch}"
+    if len(namespaces) == 1:
+        list_func, list_kwargs = v1.list_namespaced_pod, {"namespace": namespaces[0]}
+    else:
+        list_func, list_kwargs = v1.list_pod_for_all_namespaces, {}
+    started = time.monotonic()
+    deadline = started + timeout_seconds
+    # Taken before the first create, so the watch misses no event of the batch.
+    resource_version = await list_resource_version(context, list_func, label_selector=selector, **list_kwargs)
+
+    pods: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    limit = asyncio.Semaphore(max(1, concurrency))
+
+    async def create(namespace: str, name: str) -> None:
+        entry = pods[(namespace, name)] = {"namespace": namespace, "name": name}
+        async with limit:
+            submitted = time.monotonic()
+            entry["submitted"] = submitted
+            try:
+                await call_raw(context, v1.create_namespaced_pod, namespace=namespace,
+                               body=_pod_manifest(template, name, batch))
+                entry["status"] = "Created"
+            except client.exceptions.ApiException as e:
+                entry.update(status="CreateFailed", error=f"{e.status} {e.reason}")
+            except Exception as e:
+                # Timeouts, connection errors and an open circuit fail this
+                # pod only; the rest of the batch still gets its result.
+                entry.update(status="CreateFailed", error=f"{type(e).__name__}: {e}")
+            entry["createMs"] = round((time.monotonic() - submitted) * 1000, 1)
+
+    await asyncio.gather(*(create(namespace, name) for namespace in namespaces for name in names))
+
+    waiting = {key for key, entry in pods.items() if entry["status"] == "Created"}
+    if wait_ready:
+        while waiting and time.monotonic() < deadline:
+            events = watch_events(context, list_func, resource_version, max(1, int(deadline - time.monotonic())),
+                                  label_selector=selector, **list_kwargs)
+            try:
+                # Closed on the way out, so leaving early hangs up the watch at once.
+                async with contextlib.aclosing(events):
+                    async for event_type, pod in events:
+                        resource_version = resource_version_of(pod) or resource_version
+                        if event_type not in ("ADDED", "MODIFIED"):
+                            continue
+                        metadata = pod.get("metadata") or {}
+                        key = (metadata.get("namespace"), metadata.get("name"))
+                        if key not in waiting:
+                            continue
+                        settled, reason = _pod_readiness(pod)
+                        entry = pods[key]
+                        entry["reason"] = reason
+                        if settled is not None:
+                            entry["status"] = settled
+                            if settled == "Ready":
+                                entry["readyMs"] = round((time.monotonic() - entry["submitted"]) * 1000, 1)
+                            waiting.discard(key)
+                            if not waiting:
+                                break
+            except client.exceptions.ApiException as e:
+                if e.status != 410:
+                    raise
+                # The starting point expired; re-read where the collection is now.
+                resource_version = await list_resource_version(context, list_func, label_selector=selector,
+                                                               **list_kwargs)
+                for pod in await list_collection(context, list_func, lambda pod: pod, raw=True,
+                                                 label_selector=selector, **list_kwargs):
+                    metadata = pod.get("metadata") or {}
+                    key = (metadata.get("namespace"), metadata.get("name"))
+                    settled, reason = _pod_readiness(pod)
+                    if key in waiting and settled is not None:
+                        entry = pods[key]
+                        entry.update(status=settled, reason=reason)
+                        if settled == "Ready":
+                            # Became Ready while the watch was down; this is an upper bound.
+                            entry["readyMs"] = round((time.monotonic() - entry["submitted"]) * 1000, 1)
+                        waiting.discard(key)
+        for key in waiting:
+            pods[key]["status"] = "Pending"
+
+    items = []
+    counts: Dict[str, int] = {}
+    for entry in pods.values():
+        entry.pop("submitted", None)
+        if entry.get("reason") is None:
+            entry.pop("reason", None)
+        counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+        items.append(entry)
+    create_times = array("d", sorted(entry["createMs"] for entry in items))
+    ready_times = array("d", sorted(entry["readyMs"] for entry in items if "readyMs" in entry))
+    result = {
+        "batchLabel": selector,
+        "requested": len(items),
+        "counts": counts,
+        "seconds": round(time.monotonic() - started, 3),
+        "createMs": {"p50": percentile(create_times, 50), "p99": percentile(create_times, 99)},
+        "readyMs": {"p50": percentile(ready_times, 50), "p99": percentile(ready_times, 99)} if wait_ready else None,
+        "items": items,
+    }
+    return cursor_result(result, "create_pods")
@@ -0,0 +1,132 @@
+import functools
+import os
+import threading
+from typing import Optional, Dict, Tuple, Any, Callable, Iterator
+from urllib.parse import urlsplit
+
+from k8s.metrics import cache_lookup
+
+COALESCE_READS = os.environ.get("KUBRALIS_COALESCE_READS", "true").lower() not in ("0", "false", "no")
+
+# Query parameters and path segments of GETs whose body is streamed rather
+# than read whole; those are never shared.
+_STREAMING_QUERY = ("watch", "follow")
+_STREAMING_PATH = ("log", "proxy")
+
+
+class _Flight:
+    __slots__ = ("done", "response", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class BufferedResponse:
+    """
+    A fully read response handed to a caller that asked for
+    _preload_content=False, with the parts of urllib3's HTTPResponse the
+    callers use (data, stream(), release_conn(), close()).
+    """
+    __slots__ = ("status", "reason", "data", "_headers")
+
+    def __init__(self, response: Any):
+        self.status = response.status
+        self.reason = response.reason
+        self.data = response.data
+        self._headers = response.getheaders()
+
+    def getheaders(self) -> Any:
+        return self._headers
+
+    def getheader(self, name: str, default: Any = None) -> Any:
+        return self._headers.get(name, default)
+
+    def read(self, amt: Optional[int] = None, decode_content: bool = True) -> bytes:
+        return self.data
+
+    def stream(self, amt: int = 64 * 1024, decode_content: bool = True) -> Iterator[bytes]:
+        for start in range(0, len(self.data), amt):
+            yield self.data[start:start + amt]
+
+    def release_conn(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def _is_shareable(method: str, url: str, query_params: Any) -> bool:
+    if method.upper() != "GET":
+        return False
+    for key, value in query_params or ():
+        if key in _STREAMING_QUERY and str(value).lower() in ("true", "1"):
+            return False
+    return not any(part in _STREAMING_PATH for part in urlsplit(url).path.split("/"))
+
+
+def _key(method: str, url: str, query_params: Any, headers: Any) -> Optional[Tuple]:
+    try:
+        query = tuple((key, str(value)) for key, value in query_params or ())
+    except (TypeError, ValueError):
+        return None
+    # The Accept header picks the representation (JSON, Table, metadata).
+    return method.upper(), url, query, (headers or {}).get("Accept")
+
+
+def _wait_limit(request_timeout: Any) -> Optional[float]:
+    """The longest a follower waits: the total its own request could take."""
+    if isinstance(request_timeout, (int, float)):
+        return request_timeout
+    if isinstance(request_timeout, tuple) and all(request_timeout):
+        return sum(request_timeout)
+    return None
+
+
+def coalesce_reads(request: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap a RESTClientObject.request so identical GETs in flight at the same
+    time share one upstream request: the first caller issues it, the rest
+    wait for its result (or exception), each for no longer than its own
+    _request_timeout allows. Responses are read whole so every
+    caller can decode them; watches, follows and log/proxy streams are
+    passed through untouched.
+    """
+    flights: Dict[Tuple, _Flight] = {}
+    lock = threading.Lock()
+
+    @functools.wraps(request)
+    def coalesced(method, url, query_params=None, headers=None, body=None, post_params=None,
+                  _preload_content=True, _request_timeout=None):
+        key = _key(method, url, query_params, headers) if _is_shareable(method, url, query_params) else None
+        if key is None:
+            return request(method, url, query_params=query_params, headers=headers, body=body,
+                           post_params=post_params, _preload_content=_preload_content,
+                           _request_timeout=_request_timeout)
+        with lock:
+            flight = flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = flights[key] = _Flight()
+        cache_lookup("singleflight", not leader)
+        if leader:
+            try:
+                flight.response = request(method, url, query_params=query_params, headers=headers,
+                                          post_params=post_params, _preload_content=True,
+                                          _request_timeout=_request_timeout)
+            except BaseException as e:
+                flight.error = e
+            finally:
+                with lock:
+                    del flights[key]
+                flight.done.set()
+        elif not flight.done.wait(_wait_limit(_request_timeout)):
+            raise TimeoutError(f"Timed out waiting for an identical in-flight GET {url}")
+        if flight.error is not None:
+            raise flight.error
+        # The body bytes are shared read-only; every caller deserializes its
+        # own objects from them.
+        return flight.response if _preload_content else BufferedResponse(flight.response)
+
+    return coalesced
@@ -0,0 +1,279 @@
+import contextlib
+import time
+from typing import Optional, List, Dict, Tuple, Any, Callable, AsyncIterator
+
+from k8s.client_pool import get_api_client, get_context_options
+from k8s.cursors import cursor_result
+from k8s.discovery import get_discovery
+from k8s.dispatch import stream
+from k8s.informer import RESOURCES as INFORMER_RESOURCES
+from k8s.lazy import lazy_import
+from k8s.raw import call_raw, loads
+from mcp_instance import mcp
+
+client = lazy_import("kubernetes.client")
+
+
+async def list_snapshot(context: Optional[str], func: Callable[..., Any],
+                        **kwargs: Any) -> Tuple[List[Dict[str, Any]], str]:
+    """
+    The collection's raw items and resourceVersion from one list call.
+    Watching from that resourceVersion sees every change after the list.
+    """
+    response = await call_raw(context, func, **kwargs)
+    return response.get("items") or [], response["metadata"]["resourceVersion"]
+
+
+async def list_resource_version(context: Optional[str], func: Callable[..., Any], **kwargs: Any) -> str:
+    """The collection's current resourceVersion, from a one-item list."""
+    return (await list_snapshot(context, func, limit=1, **kwargs))[1]
+
+
+async def watch_events(
+    context: Optional[str],
+    func: Callable[..., Any],
+    resource_version: Optional[str],
+    timeout_seconds: int,
+    **kwargs: Any
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Watch a collection through one of the generated list_* methods and
+    yield (event type, raw object) pairs as they arrive, without building
+    client models. The server ends the watch after timeout_seconds.
+    BOOKMARK events are yielded too (their object only carries the new
+    resourceVersion); an ERROR event, such as 410 Gone for an expired
+    resource_version, is raised as an ApiException. Close the generator
+    (contextlib.aclosing) when leaving early, so the watch is hung up at once.
+    """
+    if resource_version:
+        kwargs["resource_version"] = resource_version
+    buffered = b""
+    # Connect timeout as usual; the read may wait until the watch ends.
+    chunks = stream(context, func, watch=True, allow_watch_bookmarks=True, timeout_seconds=timeout_seconds,
+                    timeout=None, _request_timeout=(get_context_options(context).timeout, timeout_seconds + 15),
+                    **kwargs)
+    # Closing this generator closes the stream, and with it the connection.
+    async with contextlib.aclosing(chunks):
+        async for chunk in chunks:
+            buffered += chunk
+            lines = buffered.split(b"\n")
+            buffered = lines.pop()
+            for line in lines:
+                if not line.strip():
+                    continue
+                event = loads(line)
+                obj = event.get("object") or {}
+                if event.get("type") == "ERROR":
+                    raise client.exceptions.ApiException(status=obj.get("code"), reason=obj.get("message"))
+                yield event.get("type"), obj
+
+
+def resource_version_of(obj: Dict[str, Any]) -> Optional[str]:
+    return (obj.get("metadata") or {}).get("resourceVersion")
+
+
+# Accepted spellings of the resources wait_for watches.
+WAIT_RESOURCES = {
+    "pod": "pods", "pods": "pods", "po": "pods",
+    "namespace": "namespaces", "namespaces": "namespaces", "ns": "namespaces",
+    "bindingpolicy": "bindingpolicies", "bindingpolicies": "bindingpolicies",
+}
+# Values of status.phase, so that e.g. condition="Active" means the phase.
+PHASES = {
+    "pods": ("Pending", "Running", "Succeeded", "Failed", "Unknown"),
+    "namespaces": ("Active", "Terminating"),
+    "bindingpolicies": (),
+}
+
+
+def _wait_list(context: Optional[str], resource: str,
+               namespace: Optional[str]) -> Tuple[Callable[..., Any], Dict[str, Any]]:
+    """The list function (and its arguments) to list and watch resource with."""
+    if resource == "pods":
+        v1 = client.CoreV1Api(get_api_client(context))
+        if namespace:
+            return v1.list_namespaced_pod, {"namespace": namespace}
+        return v1.list_pod_for_all_namespaces, {}
+    return INFORMER_RESOURCES[resource](context)
+
+
+def parse_condition(resource: str, condition: str) -> Callable[[Optional[Dict[str, Any]]], bool]:
+    """
+    A predicate over a raw object (None once deleted) for a wait_for
+    condition: "deleted", "phase=<Phase>", a phase name of the resource,
+    "<ConditionType>" (status True) or "<ConditionType>=<True|False|Unknown>".
+    Raises ValueError for an empty condition.
+    """
+    condition = condition.strip()
+    if not condition:
+        raise ValueError("condition must not be empty")
+    if condition.lower() in ("deleted", "delete", "gone"):
+        return lambda obj: obj is None
+    key, _, value = condition.partition("=")
+    key, value = key.strip(), value.strip()
+    if key.lower() == "phase" or (not value and key in PHASES[resource]):
+        phase = value if key.lower() == "phase" else key
+        return lambda obj: obj is not None and (obj.get("status") or {}).get("phase") == phase
+    wanted = (value or "True").lower()
+
+    def has_condition(obj: Optional[Dict[str, Any]]) -> bool:
+        if obj is None:
+            return False
+        for item in (obj.get("status") or {}).get("conditions") or []:
+            if item.get("type") == key:
+                return str(item.get("status")).lower() == wanted
+        return False
+    return has_condition
+
+
+def _key(obj: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    metadata = obj.get("metadata") or {}
+    return metadata.get("namespace"), metadata.get("name")
+
+
+def _state(obj: Dict[str, Any]) -> Dict[str, Any]:
+    """The parts of an object a waiter cares about."""
+    metadata = obj.get("metadata") or {}
+    status = obj.get("status") or {}
+    state: Dict[str, Any] = {"name": metadata.get("name")}
+    if metadata.get("namespace"):
+        state["namespace"] = metadata["namespace"]
+    if status.get("phase"):
+        state["phase"] = status["phase"]
+    conditions = {c.get("type"): c.get("status") for c in status.get("conditions") or [] if c.get("type")}
+    if conditions:
+        state["conditions"] = conditions
+    return state
+
+
+@mcp.tool()
+async def wait_for(
+    resource: str,
+    condition: str = "Ready",
+    name: Optional[str] = None,
+    namespace: Optional[str] = None,
+    label_selector: Optional[str] = None,
+    match: str = "all",
+    context: Optional[str] = None,
+    timeout_seconds: int = 60
+) -> Dict[str, Any]:
+    """
+    Wait until pods, namespaces or BindingPolicies meet a condition, with
+    one server-side watch instead of polling the status tools. Returns as
+    soon as the condition holds, or when timeout_seconds have passed.
+
+    Args:
+        resource: "pods", "namespaces" or "bindingpolicies" (singular works too)
+        condition: "deleted", "phase=Running", a phase name such as "Active",
+            a condition type such as "Ready" (status True), or "Type=Status",
+            e.g. "Synced=False" (default "Ready")
+        name: Name of the object to wait for
+        namespace: Namespace of pods; all namespaces when only a selector is given
+            (default "default" with a name)
+        label_selector: Wait for the objects matching this selector instead of one name
+        match: With a selector, "all" matching objects (default) or "any" of them must
+            meet the condition; at least one object must match unless waiting for deletion
+        context: Kubernetes context to use
+        timeout_seconds: Longest to wait (default 60)
+
+    Returns:
+        Dictionary with met, the seconds waited, watch events seen, how many
+        objects match and meet the condition, and the phase and conditions
+        of each matching object
+    """
+    kind = WAIT_RESOURCES.get(resource.strip().lower())
+    if kind is None:
+        return {
+            "error": "Invalid resource",
+            "message": "resource must be one of: pods, namespaces, bindingpolicies"
+        }
+    if bool(name) == bool(label_selector):
+        return {
+            "error": "Invalid input",
+            "message": "Pass exactly one of name or label_selector"
+        }
+    if match not in ("all", "any"):
+        return {
+            "error": "Invalid input",
+            "message": "match must be one of: all, any"
+        }
+    try:
+        predicate = parse_condition(kind, condition)
+    except ValueError as e:
+        return {"error": "Invalid condition", "message": str(e)}
+    if kind == "pods" and name and not namespace:
+        namespace = "default"
+    if kind != "pods":
+        namespace = None
+
+    waiting_for_deletion = predicate(None)
+
+    def met(objects: Dict[Tuple[Optional[str], Optional[str]], Dict[str, Any]]) -> bool:
+        if not objects:
+            return waiting_for_deletion
+        results = [predicate(obj) for obj in objects.values()]
+        return all(results) if match == "all" else any(results)
+
+    started = time.monotonic()
+    deadline = started + max(0, timeout_seconds)
+    events = 0
+    try:
+        if kind == "bindingpolicies":
+            # Loads discovery without blocking, so the list below finds the served version in it.
+            await get_discovery(context, insecure=True)
+        func, kwargs = _wait_list(context, kind, namespace)
+        if name:
+            kwargs["field_selector"] = f"metadata.name={name}"
+        else:
+            kwargs["label_selector"] = label_selector
+        items, resource_version = await list_snapshot(context, func, **kwargs)
+        objects = {_key(obj): obj for obj in items}
+        done = met(objects)
+        while not done and time.monotonic() < deadline:
+            watch = watch_events(context, func, resource_version, max(1, int(deadline - time.monotonic())),
+                                 **kwargs)
+            try:
+                async with contextlib.aclosing(watch):
+                    async for event_type, obj in watch:
+                        resource_version = resource_version_of(obj) or resource_version
+                        if event_type == "BOOKMARK" or (name and _key(obj)[1] != name):
+                            continue
+                        events += 1
+                        if event_type == "DELETED":
+                            objects.pop(_key(obj), None)
+                        else:
+                            objects[_key(obj)] = obj
+                        done = met(objects)
+                        if done or time.monotonic() >= deadline:
+                            break
+            except client.exceptions.ApiException as e:
+                if e.status != 410:
+                    raise
+                # Too far behind to resume; start over from a fresh list.
+                items, resource_version = await list_snapshot(context, func, **kwargs)
+                objects = {_key(obj): obj for obj in items}
+                done = met(objects)
+    except client.exceptions.ApiException as e:
+        return {
+            "error": f"Kubernetes API error: {e.status}",
+            "message": str(e),
+            "details": e.body if hasattr(e, 'body') else "No details available"
+        }
+
+    waited = round(time.monotonic() - started, 3)
+    target = name or label_selector
+    result = {
+        "met": done,
+        "message": (f"{kind} {target} met condition {condition!r} after {waited}s" if done
+                    else f"Timed out after {timeout_seconds}s waiting for {kind} {target} to meet {condition!r}"),
+        "resource": kind,
+        "condition": condition,
+        "waitedSeconds": waited,
+        "events": events,
+        "matching": len(objects),
+        "meetingCondition": sum(1 for obj in objects.values() if predicate(obj)),
+    }
+    if namespace:
+        result["namespace"] = namespace
+    result["items"] = [_state(obj) for obj in objects.values()]
+    return cursor_result(result, "wait_for")
@@ -1,49 +1,154 @@
-from mcp.server.fastmcp import FastMCP
+import asyncio
+import copy
+import logging
 
-from kubernetes import client, config
-from typing import Optional, List, Dict, Any
-import yaml
-mcp = FastMCP("Kubestellar  MCP")
+from typing import Optional, List, Dict, Tuple, Any, Union
 
+from k8s.client_pool import get_api_client
+from k8s.discovery import Discovery, get_discovery, invalidate as invalidate_discovery, is_builtin_group
+from k8s.dispatch import call
+from k8s.fanout import fan_out
+from k8s.informer import get_cached, list_cached
+from k8s.lazy import lazy_import
+from k8s.observability import LazyYaml
+from k8s.pagination import iter_chunks, list_collection
+from k8s.patch import CONTENT_TYPES, PATCH_TYPES, diff, json_patch, merge_patch
+from k8s.raw import accept_override, api_request, call_raw, decode, output_converter
+from kubestellar.cluster_selection import get_cluster_index, selectors_match
+from kubestellar.downsync_index import ANY, RuleIndex, build_rule_index, shared_rule_index
+from kubestellar.policy_bundle import iter_documents, open_bundle, is_policy_spec, policy_name_of, spec_arguments
+from mcp_instance import mcp
 
+client = lazy_import("kubernetes.client")
+yaml = lazy_import("yaml")
 
+logger = logging.getLogger(__name__)
 
-def load_kube_config(context=None):
-    try:
-        print(f"Loading kube config for context: {context}")
-        config.load_kube_config(context=context)
-        c = client.Configuration.get_default_copy()
-        c.verify_ssl = False
-        c.ssl_ca_cert = None  # Explicitly disable SSL verification
-        client.Configuration.set_default(c)
-        
-        # Print current context
-        current_context = config.list_kube_config_contexts()[1]
-        print(f"Current context: {current_context['name']}")
-        
-        return current_context
-    except Exception as e:
-        print(f"Error loading kube config: {str(e)}")
-        raise
 
-def is_kubernetes_builtin_resource(resource: str) -> bool:
-    # Implement this based on your resource knowledge or a lookup table.
-    builtins = {"pods", "deployments", "services", "namespaces", "configmaps", "secrets"}
-    return resource in builtins
 
-def get_api_group_for_crd(resource: str, crd_api_groups: Dict[str, str]) -> str:
-    return crd_api_groups.get(resource, "")
+def get_custom_objects_api(context: Optional[str] = None) -> "client.CustomObjectsApi":
+    """
+    CustomObjectsApi on the pooled client for a context.
+    TLS verification stays disabled for KubeStellar hubs, but only on this
+    context's own Configuration rather than the process-wide default.
+    """
+    return client.CustomObjectsApi(get_api_client(context, insecure=True))
+
+def summarize_binding_policy(policy: Dict[str, Any]) -> Dict[str, Any]:
+    """The compact view of a BindingPolicy returned by list_binding_policies."""
+    return {
+        "name": policy.get('metadata', {}).get('name', ''),
+        "age": policy.get('metadata', {}).get('creationTimestamp', ''),
+        "status": (policy.get('status', {}).get('conditions') or [{}])[0].get('status', ''),
+        "clusterSelectors": policy.get('spec', {}).get('clusterSelectors', []),
+        "downsync": policy.get('spec', {}).get('downsync', []),
+        "bindingMode": policy.get('spec', {}).get('bindingMode', '')
+    }
+
+BINDING_POLICY_GROUP = "control.kubestellar.io"
+BINDING_POLICY_PLURAL = "bindingpolicies"
+
+async def get_binding_policy_version(context: Optional[str] = None) -> Optional[str]:
+    """
+    The preferred served version of the BindingPolicy API, from the cached
+    discovery of the context. Discovery is refreshed once before giving up,
+    so a freshly installed KubeStellar is picked up. None if not served.
+    """
+    discovery = await get_discovery(context, insecure=True)
+    version = discovery.preferred_version(BINDING_POLICY_GROUP, BINDING_POLICY_PLURAL)
+    if version is None:
+        discovery = await get_discovery(context, insecure=True, refresh=True)
+        version = discovery.preferred_version(BINDING_POLICY_GROUP, BINDING_POLICY_PLURAL)
+    return version
+
+def is_kubernetes_builtin_resource(resource: str, discovery: Discovery) -> bool:
+    group = discovery.api_group_for(resource)
+    return group is not None and is_builtin_group(group)
+
+def get_api_group_for_crd(resource: str, crd_api_groups: Optional[Dict[str, str]], discovery: Optional[Discovery] = None) -> str:
+    """The apiGroup for a downsync rule: an explicit crd_api_groups entry wins, then discovery."""
+    if crd_api_groups and resource in crd_api_groups:
+        return crd_api_groups[resource]
+    if discovery is not None:
+        return discovery.api_group_for(resource) or ""
+    return ""
+
+def build_binding_policy(
+    policy_name: str,
+    cluster_labels: Dict[str, str],
+    workload_labels: Dict[str, str],
+    resource_configs: List[Dict[str, Any]],
+    crd_api_groups: Optional[Dict[str, str]],
+    namespaces_to_sync: Optional[List[str]],
+    version: str,
+    discovery: Optional[Discovery] = None
+) -> Dict[str, Any]:
+    """
+    Build a BindingPolicy object with one downsync rule per resource config.
+    Raises ValueError for a malformed resource config.
+    """
+    downsync_rules = []
+    for resource_cfg in resource_configs:
+        if not isinstance(resource_cfg, dict) or "Type" not in resource_cfg:
+            raise ValueError(f"Invalid resource configuration: {resource_cfg}")
+
+        resource = resource_cfg["Type"]
+        rule = {
+            "resources": [resource],
+            "objectSelectors": [{"matchLabels": workload_labels}],
+            "apiGroup": get_api_group_for_crd(resource, crd_api_groups, discovery)
+        }
+        if resource_cfg.get("CreateOnly"):
+            rule["createOnly"] = True
+        if namespaces_to_sync:
+            rule["namespaces"] = namespaces_to_sync
+        downsync_rules.append(rule)
+
+    return {
+        "apiVersion": f"{BINDING_POLICY_GROUP}/{version}",
+        "kind": "BindingPolicy",
+        "metadata": {
+            "name": policy_name
+        },
+        "spec": {
+            "downsync": downsync_rules,
+            "clusterSelectors": [{"matchLabels": cluster_labels}],
+            "bindingMode": "Downsync"
+        }
+    }
+
+async def load_binding_policies(context: Optional[str] = None, live: bool = False) -> List[Dict[str, Any]]:
+    """Every BindingPolicy of a context as raw dicts, from the informer cache if possible."""
+    policies = list_cached(context, BINDING_POLICY_PLURAL, live=live)
+    if policies is not None:
+        return policies
+    version = await get_binding_policy_version(context)
+    if version is None:
+        return []
+    api = get_custom_objects_api(context)
+    return await list_collection(context, api.list_cluster_custom_object, lambda policy: policy,
+        raw=True,
+        group=BINDING_POLICY_GROUP,
+        version=version,
+        plural=BINDING_POLICY_PLURAL
+    )
+
+def binding_policy_api_missing() -> Dict[str, Any]:
+    return {
+        "error": "BindingPolicy API not accessible",
+        "message": "The BindingPolicy API endpoint is not accessible. Please verify the API version and permissions."
+    }
 
 def format_labels(labels: Dict[str, str]) -> List[str]:
     return [f"{k}: {v}" for k, v in labels.items()]
 
-def create_binding_policy_helper(
+async def create_binding_policy_helper(
     policy_name: str,
     namespace: str,
     cluster_labels: Dict[str, str],
     workload_labels: Dict[str, str],
     resource_configs: List[Dict[str, Any]],
-    crd_api_groups: Dict[str, str],
+    crd_api_groups: Optional[Dict[str, str]] = None,
     namespaces_to_sync: Optional[List[str]] = None,
     context: Optional[str] = None
 ) -> Dict[str, Any]:
@@ -51,34 +156,14 @@ def create_binding_policy_helper(
     Create a KubeStellar BindingPolicy CRD in the target cluster.
     """
     try:
-        load_kube_config(context)
-        api = client.CustomObjectsApi()
+        api = get_custom_objects_api(context)
 
-        # First check if the API group exists
-        try:
-            api.list_cluster_custom_object(
-                group="control.kubestellar.io",
-                version="v1alpha1",
-                plural="bindingpolicies"
-            )
-        except client.exceptions.ApiException as e:
-            if e.status == 404:
-                try:
-                    # Try with v1alpha2 version as well
-                    api.list_cluster_custom_object(
-                        group="control.kubestellar.io",
-                        version="v1alpha2",
-                        plural="bindingpolicies"
-                    )
-                    print("Using v1alpha2 API version")
-                except client.exceptions.ApiException as e2:
-                    if e2.status == 404:
-                        return {
-                            "error": "BindingPolicy API not accessible",
-                            "message": "The BindingPolicy API endpoint is not accessible. Please verify the API version and permissions."
-                        }
-                    raise e2
-            raise e
+        # The API version and resource groups come from cached discovery,
+        # so this costs no extra round trip once the cache is warm.
+        version = await get_binding_policy_version(context)
+        if version is None:
+            return binding_policy_api_missing()
+        discovery = await get_discovery(context, insecure=True)
 
         # Build downsync rules
         downsync_rules = []
@@ -86,11 +171,11 @@ def create_binding_policy_helper(
         # Handle CRDs first
         for resource_cfg in resource_configs:
             resource = resource_cfg["Type"]
-            if not is_kubernetes_builtin_resource(resource):
+            if not is_kubernetes_builtin_resource(resource, discovery):
                 crd_rule = {
                     "resources": [resource],
                     "objectSelectors": [{"matchLabels": workload_labels}],
-                    "apiGroup": get_api_group_for_crd(resource, crd_api_groups)
+                    "apiGroup": get_api_group_for_crd(resource, crd_api_groups, discovery)
                 }
                 if resource_cfg.get("CreateOnly"):
                     crd_rule["createOnly"] = True
@@ -103,11 +188,14 @@ def create_binding_policy_helper(
             resource = resource_cfg["Type"]
             if resource == "namespaces":
                 continue
-            if is_kubernetes_builtin_resource(resource):
+            if is_kubernetes_builtin_resource(resource, discovery):
                 rule = {
                     "resources": [resource],
                     "objectSelectors": [{"matchLabels": workload_labels}]
                 }
+                api_group = get_api_group_for_crd(resource, crd_api_groups, discovery)
+                if api_group:
+                    rule["apiGroup"] = api_group
                 if resource_cfg.get("CreateOnly"):
                     rule["createOnly"] = True
                 if namespaces_to_sync:
@@ -126,7 +214,7 @@ def create_binding_policy_helper(
 
         # Build the BindingPolicy object
         policy_obj = {
-            "apiVersion": "control.kubestellar.io/v1alpha1",
+            "apiVersion": f"{BINDING_POLICY_GROUP}/{version}",
             "kind": "BindingPolicy",
             "metadata": {
                 "name": policy_name
@@ -139,17 +227,20 @@ def create_binding_policy_helper(
             }
         }
 
-        print(f"Creating cluster-scoped policy: {yaml.dump(policy_obj)}")
+        logger.debug("Creating cluster-scoped policy: %s", LazyYaml(policy_obj))
 
         try:
             # Create the policy as a cluster-scoped resource
-            result = api.create_cluster_custom_object(
-                group="control.kubestellar.io",
-                version="v1alpha1",
-                plural="bindingpolicies",
+            result = await call(context, api.create_cluster_custom_object,
+                group=BINDING_POLICY_GROUP,
+                version=version,
+                plural=BINDING_POLICY_PLURAL,
                 body=policy_obj
             )
         except client.exceptions.ApiException as e:
+            if e.status == 404:
+                # Discovery was stale (e.g. the CRD was removed); refetch next time.
+                invalidate_discovery(context)
             return {
                 "error": f"Kubernetes API error: {e.status}",
                 "message": str(e),
@@ -191,7 +282,7 @@ async def create_binding_policy(
     cluster_labels: Dict[str, str],
     workload_labels: Dict[str, str],
     resource_configs: List[Dict[str, Any]],
-    crd_api_groups: Dict[str, str],
+    crd_api_groups: Optional[Dict[str, str]] = None,
     namespaces_to_sync: Optional[List[str]] = None,
     context: Optional[str] = None
 ) -> Dict[str, Any]:
@@ -204,7 +295,8 @@ async def create_binding_policy(
         cluster_labels: Labels to select target clusters
         workload_labels: Labels to select target workloads
         resource_configs: List of resource configurations
-        crd_api_groups: API groups for CRDs
+        crd_api_groups: Optional resource -> API group overrides; groups are
+            otherwise resolved through API discovery
         namespaces_to_sync: Optional list of namespaces to sync
         context: Kubernetes context to use
     
@@ -237,70 +329,36 @@ async def create_binding_policy(
                 "message": "resource_configs must be a list"
             }
 
-        # Load kube config and verify context
-        current_context = load_kube_config(context)
-        print(f"Using context: {current_context['name']}")
-        
-        # Check if policy already exists
-        api = client.CustomObjectsApi()
+        api = get_custom_objects_api(context)
+        logger.debug("Using context: %s", context or "current-context")
+
+        # Served version and resource groups come from cached discovery;
+        # an existing policy is reported from the create's 409 instead of
+        # a separate GET, so this is a single round trip when warm.
+        version = await get_binding_policy_version(context)
+        if version is None:
+            return binding_policy_api_missing()
+        discovery = await get_discovery(context, insecure=True)
+
         try:
-            api.get_cluster_custom_object(
-                group="control.kubestellar.io",
-                version="v1alpha1",
-                plural="bindingpolicies",
-                name=policy_name
+            policy_obj = build_binding_policy(
+                policy_name, cluster_labels, workload_labels, resource_configs,
+                crd_api_groups, namespaces_to_sync, version, discovery
             )
+        except ValueError as e:
             return {
-                "error": "Policy already exists",
-                "message": f"Binding policy '{policy_name}' already exists"
+                "error": "Invalid resource config",
+                "message": str(e)
             }
-        except client.exceptions.ApiException as e:
-            if e.status != 404:
-                raise
 
-        # Build downsync rules
-        downsync_rules = []
-        for resource_cfg in resource_configs:
-            if not isinstance(resource_cfg, dict) or "Type" not in resource_cfg:
-                return {
-                    "error": "Invalid resource config",
-                    "message": f"Invalid resource configuration: {resource_cfg}"
-                }
-            
-            resource = resource_cfg["Type"]
-            rule = {
-                "resources": [resource],
-                "objectSelectors": [{"matchLabels": workload_labels}],
-                "apiGroup": get_api_group_for_crd(resource, crd_api_groups)
-            }
-            if resource_cfg.get("CreateOnly"):
-                rule["createOnly"] = True
-            if namespaces_to_sync:
-                rule["namespaces"] = namespaces_to_sync
-            downsync_rules.append(rule)
-
-        # Build the BindingPolicy object
-        policy_obj = {
-            "apiVersion": "control.kubestellar.io/v1alpha1",
-            "kind": "BindingPolicy",
-            "metadata": {
-                "name": policy_name
-            },
-            "spec": {
-                "downsync": downsync_rules,
-                "clusterSelectors": [{"matchLabels": cluster_labels}],
-                "bindingMode": "Downsync"
-            }
-        }
-
-        print(f"Creating binding policy: {yaml.dump(policy_obj)}")
+        logger.debug("Creating binding policy: %s", LazyYaml(policy_obj))
 
         try:
             # Create the policy
-            result = api.create_cluster_custom_object(
-                group="control.kubestellar.io",
-                version="v1alpha1",
-                plural="bindingpolicies",
+            result = await call(context, api.create_cluster_custom_object,
+                group=BINDING_POLICY_GROUP,
+                version=version,
+                plural=BINDING_POLICY_PLURAL,
                 body=policy_obj
             )
             
@@ -321,6 +379,13 @@ async def create_binding_policy(
             return response
 
         except client.exceptions.ApiException as e:
+            if e.status == 409:
+                return {
+                    "error": "Policy already exists",
+                    "message": f"Binding policy '{policy_name}' already exists"
+                }
+            if e.status == 404:
+                invalidate_discovery(context)
             return {
                 "error": f"Kubernetes API error: {e.status}",
                 "message": str(e),
@@ -341,40 +406,68 @@ async def create_binding_policy(
 
 @mcp.tool()
 async def list_binding_policies(
-    context: Optional[str] = None
+    context: Optional[str] = None,
+    limit: Optional[int] = None,
+    continue_token: Optional[str] = None,
+    output: str = "object",
+    fields: Optional[List[str]] = None,
+    contexts: Optional[Union[str, List[str]]] = None
 ) -> Dict[str, Any]:
     """
     List all BindingPolicy CRDs in the cluster.
+    When limit or continue_token is given only one page is returned, along
+    with a "continue" token to pass back for the next page.
+    By default each policy is summarized; output="json" returns the full
+    objects, output="table" compact kubectl-style rows and output="metadata"
+    only object metadata. fields (e.g. ["metadata.name", "spec.downsync"])
+    keeps only those paths.
+    contexts ("all", a glob such as "wds*", or a list of names) queries
+    several contexts concurrently; every policy is tagged with its
+    "context" and failing contexts are listed under "errors". Paging works
+    the same way: the "continue" token covers every context.
     """
+    if contexts:
+        result = await fan_out(contexts, lambda ctx, token: list_binding_policies(
+            context=ctx, limit=limit, continue_token=token, output=output, fields=fields),
+            items_key="bindingPolicies", continue_token=continue_token)
+        result["message"] = "Successfully retrieved binding policies"
+        result["totalPolicies"] = len(result["bindingPolicies"])
+        return result
     try:
-        load_kube_config(context)
-        api = client.CustomObjectsApi()
+        if output == "object" and not fields:
+            raw, convert = False, summarize_binding_policy
+        else:
+            raw, convert = output_converter(output, fields)
+        version = await get_binding_policy_version(context)
+        if version is None:
+            return binding_policy_api_missing()
+        api = get_custom_objects_api(context)
+        list_func = accept_override(api.list_cluster_custom_object,
+                                    "/apis/{group}/{version}/{plural}", output)
 
         try:
             # Get all binding policies
-            policies = api.list_cluster_custom_object(
-                group="control.kubestellar.io",
-                version="v1alpha1",
-                plural="bindingpolicies"
+            result = await list_collection(context, list_func, convert,
+                raw=raw,
+                limit=limit,
+                continue_token=continue_token,
+                group=BINDING_POLICY_GROUP,
+                version=version,
+                plural=BINDING_POLICY_PLURAL
             )
 
-            # Parse and format the policies
-            policies_list = []
-            for policy in policies.get('items', []):
-                policy_data = {
-                    "name": policy.get('metadata', {}).get('name', ''),
-                    "age": policy.get('metadata', {}).get('creationTimestamp', ''),
-                    "status": policy.get('status', {}).get('conditions', [{}])[0].get('status', ''),
-                    "clusterSelectors": policy.get('spec', {}).get('clusterSelectors', []),
-                    "downsync": policy.get('spec', {}).get('downsync', []),
-                    "bindingMode": policy.get('spec', {}).get('bindingMode', '')
+            if isinstance(result, dict):
+                return {
+                    "message": "Successfully retrieved binding policies",
+                    "bindingPolicies": result["items"],
+                    "totalPolicies": len(result["items"]),
+                    "continue": result["continue"],
+                    "remainingItemCount": result["remainingItemCount"]
                 }
-                policies_list.append(policy_data)
-
             return {
                 "message": "Successfully retrieved binding policies",
-                "bindingPolicies": policies_list,
-                "totalPolicies": len(policies_list)
+                "bindingPolicies": result,
+                "totalPolicies": len(result)
             }
 
         except client.exceptions.ApiException as e:
@@ -399,14 +492,16 @@ async def delete_binding_policy(
     Delete a BindingPolicy CRD from the cluster.
     """
     try:
-        load_kube_config(context)
-        api = client.CustomObjectsApi()
+        version = await get_binding_policy_version(context)
+        if version is None:
+            return binding_policy_api_missing()
+        api = get_custom_objects_api(context)
 
         try:
-            result = api.delete_cluster_custom_object(
-                group="control.kubestellar.io",
-                version="v1alpha1",
-                plural="bindingpolicies",
+            result = await call(context, api.delete_cluster_custom_object,
+                group=BINDING_POLICY_GROUP,
+                version=version,
+                plural=BINDING_POLICY_PLURAL,
                 name=policy_name,
                 body=client.V1DeleteOptions()
             )
@@ -439,23 +534,30 @@ async def delete_binding_policy(
 @mcp.tool()
 async def get_binding_policy_details(
     policy_name: str,
-    context: Optional[str] = None
+    context: Optional[str] = None,
+    live: bool = False
 ) -> Dict[str, Any]:
     """
     Get detailed information about a specific BindingPolicy CRD.
+    Served from the informer cache when enabled; set live=True to always
+    read from the API server.
     """
     try:
-        load_kube_config(context)
-        api = client.CustomObjectsApi()
+        api = get_custom_objects_api(context)
 
         try:
-            # Get the specific binding policy
-            policy = api.get_cluster_custom_object(
-                group="control.kubestellar.io",
-                version="v1alpha1",
-                plural="bindingpolicies",
-                name=policy_name
-            )
+            # Get the specific binding policy, from the informer cache if possible
+            policy = get_cached(context, "bindingpolicies", policy_name, live=live)
+            if policy is None:
+                version = await get_binding_policy_version(context)
+                if version is None:
+                    return binding_policy_api_missing()
+                policy = await call(context, api.get_cluster_custom_object,
+                    group=BINDING_POLICY_GROUP,
+                    version=version,
+                    plural=BINDING_POLICY_PLURAL,
+                    name=policy_name
+                )
 
             # Parse and format the policy details
             policy_data = {
@@ -504,23 +606,30 @@ async def get_binding_policy_details(
 @mcp.tool()
 async def get_binding_policy_status(
     policy_name: str,
-    context: Optional[str] = None
+    context: Optional[str] = None,
+    live: bool = False
 ) -> Dict[str, Any]:
     """
     Get the status of a specific BindingPolicy CRD.
+    Served from the informer cache when enabled; set live=True to always
+    read from the API server.
     """
     try:
-        load_kube_config(context)
-        api = client.CustomObjectsApi()
+        api = get_custom_objects_api(context)
 
         try:
-            # Get the specific binding policy
-            policy = api.get_cluster_custom_object(
-                group="control.kubestellar.io",
-                version="v1alpha1",
-                plural="bindingpolicies",
-                name=policy_name
-            )
+            # Get the specific binding policy, from the informer cache if possible
+            policy = get_cached(context, "bindingpolicies", policy_name, live=live)
+            if policy is None:
+                version = await get_binding_policy_version(context)
+                if version is None:
+                    return binding_policy_api_missing()
+                policy = await call(context, api.get_cluster_custom_object,
+                    group=BINDING_POLICY_GROUP,
+                    version=version,
+                    plural=BINDING_POLICY_PLURAL,
+                    name=policy_name
+                )
 
             # Parse and format the policy status
             status_data = {
@@ -550,4 +659,765 @@ async def get_binding_policy_status(
         return {
             "error": str(e),
             "message": "Failed to get binding policy status. Please check the input parameters and cluster configuration."
-        }
\ No newline at end of file
+        }
+
+def _apply_request(api_client: Any, path: str, query: List[Tuple[str, str]], body: Dict[str, Any],
+                   _request_timeout: Any = None) -> Tuple[int, Any]:
+    """Server-side apply PATCH; the body is decoded here, on the worker thread."""
+    response = api_request(api_client, "PATCH", path, query,
+                           headers={"Content-Type": "application/apply-patch+yaml"}, body=body,
+                           _request_timeout=_request_timeout)
+    return response.status, decode(response)
+
+
+async def apply_binding_policy_object(
+    context: Optional[str],
+    policy_obj: Dict[str, Any],
+    version: str,
+    field_manager: str = "kubralis",
+    force: bool = False,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """Server-side apply a single BindingPolicy object. Returns a per-policy result."""
+    name = policy_obj["metadata"]["name"]
+    api_client = get_api_client(context, insecure=True)
+    query = [("fieldManager", field_manager)]
+    if force:
+        query.append(("force", "true"))
+    if dry_run:
+        query.append(("dryRun", "All"))
+    path = f"/apis/{BINDING_POLICY_GROUP}/{version}/{BINDING_POLICY_PLURAL}/{name}"
+    try:
+        status, applied = await call(context, _apply_request, api_client, path, query, policy_obj)
+        return {
+            "name": name,
+            "status": "created" if status == 201 else "applied",
+            "resourceVersion": (applied.get("metadata") or {}).get("resourceVersion")
+        }
+    except client.exceptions.ApiException as e:
+        return {
+            "name": name,
+            "status": "failed",
+            "error": f"Kubernetes API error: {e.status}",
+            "message": e.body if e.body else str(e)
+        }
+
+
+@mcp.tool()
+async def apply_binding_policies(
+    bundle: Optional[str] = None,
+    bundle_path: Optional[str] = None,
+    policies: Optional[List[Dict[str, Any]]] = None,
+    bundle_format: str = "auto",
+    dry_run: bool = False,
+    concurrency: int = 8,
+    field_manager: str = "kubralis",
+    force: bool = False,
+    context: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Create or update many BindingPolicies at once using server-side apply.
+
+    Args:
+        bundle: Multi-document YAML or NDJSON text
+        bundle_path: Path of a YAML/NDJSON bundle file readable by the server
+        policies: Documents passed directly instead of a bundle
+        bundle_format: "auto", "yaml" or "ndjson"
+        dry_run: Validate on the server without persisting anything
+        concurrency: Maximum number of apply requests in flight
+        field_manager: Server-side apply field manager name
+        force: Take ownership of fields managed by someone else
+        context: Kubernetes context to use
+
+    Each document is either a full BindingPolicy object or a spec in the
+    create_binding_policy style (policy_name, cluster_labels,
+    workload_labels, resource_configs, crd_api_groups, namespaces_to_sync).
+    Bundles are parsed one document at a time while earlier documents are
+    being applied. Returns one result per policy; a failing policy does not
+    stop the others.
+    """
+    try:
+        version = await get_binding_policy_version(context)
+        if version is None:
+            return binding_policy_api_missing()
+        discovery = await get_discovery(context, insecure=True)
+
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+        results: List[Dict[str, Any]] = []
+        tasks = []
+
+        async def apply_one(index: int, document: Dict[str, Any]) -> None:
+            try:
+                if not isinstance(document, dict):
+                    raise ValueError(f"Document {index} is not a mapping")
+                if is_policy_spec(document):
+                    policy_obj = build_binding_policy(*spec_arguments(document), version, discovery)
+                else:
+                    policy_obj = dict(document)
+                    policy_obj.setdefault("apiVersion", f"{BINDING_POLICY_GROUP}/{version}")
+                    policy_obj.setdefault("kind", "BindingPolicy")
+                    if not policy_name_of(policy_obj):
+                        raise ValueError(f"Document {index} has no metadata.name")
+                    # The apply goes to the served version's endpoint.
+                    policy_obj["apiVersion"] = f"{BINDING_POLICY_GROUP}/{version}"
+                result = await apply_binding_policy_object(context, policy_obj, version, field_manager, force, dry_run)
+            except (ValueError, KeyError, TypeError) as e:
+                result = {
+                    "name": policy_name_of(document) if isinstance(document, dict) else None,
+                    "status": "failed",
+                    "error": "Invalid policy",
+                    "message": str(e)
+                }
+            except Exception as e:
+                result = {
+                    "name": policy_name_of(document) if isinstance(document, dict) else None,
+                    "status": "failed",
+                    "error": type(e).__name__,
+                    "message": str(e)
+                }
+            finally:
+                semaphore.release()
+            result["index"] = index
+            results.append(result)
+
+        stream = None
+        if policies is not None:
+            documents = iter(policies)
+        else:
+            stream = open_bundle(bundle, bundle_path)
+            documents = iter_documents(stream, bundle_format)
+        parse_error = None
+        try:
+            for index, document in enumerate(documents):
+                # Parse the next document only once a slot is free, so at most
+                # `concurrency` parsed policies are held at a time.
+                await semaphore.acquire()
+                tasks.append(asyncio.create_task(apply_one(index, document)))
+        except (ValueError, yaml.YAMLError) as e:
+            # Everything before the malformed document is still applied.
+            parse_error = str(e)
+        finally:
+            await asyncio.gather(*tasks)
+            if stream is not None:
+                stream.close()
+
+        results.sort(key=lambda r: r["index"])
+        failed = sum(1 for r in results if r["status"] == "failed")
+        response = {
+            "message": f"{'Validated' if dry_run else 'Applied'} {len(results) - failed} of {len(results)} binding policies",
+            "dryRun": dry_run,
+            "applied": len(results) - failed,
+            "failed": failed,
+            "results": results
+        }
+        if parse_error:
+            response["error"] = "Invalid bundle"
+            response["parseError"] = parse_error
+        return response
+
+    except (ValueError, OSError) as e:
+        return {
+            "error": "Invalid bundle",
+            "message": str(e)
+        }
+    except Exception as e:
+        return {
+            "error": str(e),
+            "message": "Failed to apply the binding policies. Please check the bundle and cluster configuration."
+        }
+
+@mcp.tool()
+async def get_binding_policy_clusters(
+    policy_name: str,
+    context: Optional[str] = None,
+    inventory_context: Optional[str] = None,
+    live: bool = False
+) -> Dict[str, Any]:
+    """
+    List the ManagedClusters a BindingPolicy selects.
+
+    Args:
+        policy_name: Name of the binding policy
+        context: Kubernetes context (WDS) holding the policy
+        inventory_context: Context (ITS) holding the ManagedClusters; defaults to context
+        live: Read from the API servers instead of the informer caches
+
+    The clusterSelectors (matchLabels and matchExpressions) are evaluated
+    against a label index of the inventory rather than cluster by cluster.
+    """
+    try:
+        policy = get_cached(context, BINDING_POLICY_PLURAL, policy_name, live=live)
+        if policy is None:
+            version = await get_binding_policy_version(context)
+            if version is None:
+                return binding_policy_api_missing()
+            api = get_custom_objects_api(context)
+            policy = await call(context, api.get_cluster_custom_object,
+                group=BINDING_POLICY_GROUP,
+                version=version,
+                plural=BINDING_POLICY_PLURAL,
+                name=policy_name
+            )
+        index = await get_cluster_index(inventory_context or context, live=live)
+        selectors = policy.get('spec', {}).get('clusterSelectors', [])
+        clusters = sorted(index.select_any(selectors))
+        return {
+            "message": f"Binding policy '{policy_name}' selects {len(clusters)} of {len(index)} clusters",
+            "policy": policy_name,
+            "clusterSelectors": selectors,
+            "clusters": clusters,
+            "totalClusters": len(clusters)
+        }
+
+    except client.exceptions.ApiException as e:
+        if e.status == 404:
+            return {
+                "error": f"Binding policy '{policy_name}' not found",
+                "message": "The specified binding policy or the ManagedCluster API does not exist"
+            }
+        return {
+            "error": f"Kubernetes API error: {e.status}",
+            "message": str(e),
+            "details": e.body if hasattr(e, 'body') else "No details available"
+        }
+    except ValueError as e:
+        return {
+            "error": "Invalid cluster selector",
+            "message": str(e)
+        }
+    except Exception as e:
+        return {
+            "error": str(e),
+            "message": "Failed to match the binding policy against the cluster inventory."
+        }
+
+@mcp.tool()
+async def get_cluster_binding_policies(
+    cluster_name: str,
+    context: Optional[str] = None,
+    inventory_context: Optional[str] = None,
+    live: bool = False
+) -> Dict[str, Any]:
+    """
+    List the BindingPolicies whose clusterSelectors select a ManagedCluster.
+
+    Args:
+        cluster_name: Name of the ManagedCluster
+        context: Kubernetes context (WDS) holding the policies
+        inventory_context: Context (ITS) holding the ManagedClusters; defaults to context
+        live: Read from the API servers instead of the informer caches
+    """
+    try:
+        index, policies = await asyncio.gather(
+            get_cluster_index(inventory_context or context, live=live),
+            load_binding_policies(context, live=live)
+        )
+        labels = index.labels_of(cluster_name)
+        if labels is None:
+            return {
+                "error": f"Cluster '{cluster_name}' not found",
+                "message": "The specified ManagedCluster does not exist in the inventory"
+            }
+        matching = sorted(
+            policy.get('metadata', {}).get('name', '')
+            for policy in policies
+            if selectors_match(policy.get('spec', {}).get('clusterSelectors'), labels)
+        )
+        return {
+            "message": f"Cluster '{cluster_name}' is targeted by {len(matching)} binding policies",
+            "cluster": cluster_name,
+            "labels": labels,
+            "bindingPolicies": matching,
+            "totalPolicies": len(matching)
+        }
+
+    except client.exceptions.ApiException as e:
+        return {
+            "error": f"Kubernetes API error: {e.status}",
+            "message": str(e),
+            "details": e.body if hasattr(e, 'body') else "No details available"
+        }
+    except ValueError as e:
+        return {
+            "error": "Invalid cluster selector",
+            "message": str(e)
+        }
+    except Exception as e:
+        return {
+            "error": str(e),
+            "message": "Failed to match binding policies against the cluster."
+        }
+
+@mcp.tool()
+async def get_binding_policy_cluster_matrix(
+    context: Optional[str] = None,
+    inventory_context: Optional[str] = None,
+    by: str = "policy",
+    live: bool = False
+) -> Dict[str, Any]:
+    """
+    Match every BindingPolicy against every ManagedCluster.
+
+    Args:
+        context: Kubernetes context (WDS) holding the policies
+        inventory_context: Context (ITS) holding the ManagedClusters; defaults to context
+        by: "policy" maps each policy to its clusters, "cluster" each cluster to its policies
+        live: Read from the API servers instead of the informer caches
+
+    Each policy is evaluated once against the label index, so the cost
+    grows with the number of matches rather than policies x clusters.
+    Policies with an invalid selector are reported under "errors";
+    clusters no policy selects are listed under "unselectedClusters".
+    """
+    if by not in ("policy", "cluster"):
+        return {
+            "error": "Invalid input",
+            "message": "by must be 'policy' or 'cluster'"
+        }
+    try:
+        index, policies = await asyncio.gather(
+            get_cluster_index(inventory_context or context, live=live),
+            load_binding_policies(context, live=live)
+        )
+        by_policy: Dict[str, List[str]] = {}
+        errors: Dict[str, Any] = {}
+        for policy in policies:
+            name = policy.get('metadata', {}).get('name', '')
+            try:
+                by_policy[name] = sorted(index.select_any(policy.get('spec', {}).get('clusterSelectors')))
+            except ValueError as e:
+                errors[name] = {"error": "Invalid cluster selector", "message": str(e)}
+
+        by_cluster: Dict[str, List[str]] = {name: [] for name in index.names()}
+        for name in sorted(by_policy):
+            for cluster in by_policy[name]:
+                by_cluster.setdefault(cluster, []).append(name)
+
+        return {
+            "message": f"Matched {len(by_policy)} binding policies against {len(index)} clusters",
+            "matrix": by_policy if by == "policy" else by_cluster,
+            "unselectedClusters": [cluster for cluster, names in by_cluster.items() if not names],
+            "totalPolicies": len(by_policy),
+            "totalClusters": len(index),
+            "errors": errors
+        }
+
+    except client.exceptions.ApiException as e:
+        return {
+            "error": f"Kubernetes API error: {e.status}",
+            "message": str(e),
+            "details": e.body if hasattr(e, 'body') else "No details available"
+        }
+    except Exception as e:
+        return {
+            "error": str(e),
+            "message": "Failed to build the binding policy / cluster matrix."
+        }
+
+def _workload_ref(obj: Dict[str, Any], discovery: Discovery) -> Dict[str, Any]:
+    """
+    Normalize a manifest (apiVersion/kind/metadata) or a shorthand
+    {"resource", "apiGroup", "namespace", "name", "labels"} into a
+    workload reference. Raises ValueError when the type is unknown.
+    """
+    if "kind" in obj:
+        api_version = obj.get("apiVersion", "v1")
+        group = api_version.rsplit("/", 1)[0] if "/" in api_version else ""
+        found = discovery.find(group, obj["kind"])
+        if found is None:
+            raise ValueError(f"Unknown kind '{obj['kind']}' in API version '{api_version}'")
+        _, resource, info = found
+        metadata = obj.get("metadata") or {}
+        namespace = metadata.get("namespace") or ("default" if info.get("namespaced") else None)
+        return {
+            "apiGroup": group,
+            "resource": resource,
+            "namespace": namespace,
+            "name": metadata.get("name", ""),
+            "labels": metadata.get("labels") or {}
+        }
+    if "resource" not in obj:
+        raise ValueError("Each object needs either apiVersion/kind/metadata or resource/name")
+    group = obj.get("apiGroup")
+    if group is None:
+        group = discovery.api_group_for(obj["resource"]) or ""
+    found = discovery.find(group, obj["resource"])
+    return {
+        "apiGroup": group,
+        "resource": found[1] if found else obj["resource"].lower(),
+        "namespace": obj.get("namespace"),
+        "name": obj.get("name", ""),
+        "labels": obj.get("labels") or {}
+    }
+
+async def _namespace_workload_refs(
+    context: Optional[str],
+    namespace: str,
+    group: str,
+    resource: str,
+    label_selector: Optional[str],
+    discovery: Discovery
+) -> List[Dict[str, Any]]:
+    """References to every object of one type in a namespace, listed metadata-only in chunks."""
+    found = discovery.find(group, resource)
+    if found is None:
+        return []
+    version, plural, info = found
+    base = f"/api/{version}" if group == "" else f"/apis/{group}/{version}"
+    api = get_custom_objects_api(context)
+    if plural == "namespaces":
+        # The namespace itself, so rules downsyncing namespaces are covered too.
+        items = [await call_raw(context, api_request, api.api_client, "GET", f"{base}/namespaces/{namespace}",
+                                headers={"Accept": "application/json"})]
+    elif not info.get("namespaced"):
+        return []
+    else:
+        list_func = accept_override(api.list_cluster_custom_object, f"{base}/namespaces/{namespace}/{plural}", "metadata")
+        items = []
+        async for chunk in iter_chunks(context, list_func, raw=True, label_selector=label_selector):
+            items.extend(chunk)
+    refs = []
+    for item in items:
+        metadata = item.get("metadata") or {}
+        refs.append({
+            "apiGroup": group,
+            "resource": plural,
+            "namespace": namespace if info.get("namespaced") else None,
+            "name": metadata.get("name", ""),
+            "labels": metadata.get("labels") or {}
+        })
+    return refs
+
+async def _namespace_labels(context: Optional[str], namespace: str, live: bool = False) -> Optional[Dict[str, str]]:
+    """Labels of a namespace, None if it does not exist (yet)."""
+    ns = get_cached(context, "namespaces", namespace, live=live)
+    if ns is not None:
+        return ns.metadata.labels or {}
+    api_client = get_api_client(context)
+    try:
+        namespace_obj = await call_raw(context, api_request, api_client, "GET", f"/api/v1/namespaces/{namespace}")
+    except client.exceptions.ApiException as e:
+        if e.status == 404:
+            return None
+        raise
+    return (namespace_obj.get("metadata") or {}).get("labels") or {}
+
+@mcp.tool()
+async def get_workload_binding_policies(
+    objects: Optional[List[Dict[str, Any]]] = None,
+    namespace: Optional[str] = None,
+    resources: Optional[List[str]] = None,
+    label_selector: Optional[str] = None,
+    context: Optional[str] = None,
+    inventory_context: Optional[str] = None,
+    live: bool = False
+) -> Dict[str, Any]:
+    """
+    Find the BindingPolicies that downsync given workload objects, and the
+    clusters those objects will land on.
+
+    Args:
+        objects: Manifests (apiVersion, kind, metadata) or references
+            {"resource", "apiGroup", "namespace", "name", "labels"} to check
+        namespace: Instead of objects, check every object in this namespace
+        resources: Resource types to scan in namespace (e.g. ["deployments",
+            "configmaps"]); defaults to every type some policy downsyncs
+        label_selector: Only scan objects in namespace matching this selector
+        context: Kubernetes context (WDS) holding the policies and workloads
+        inventory_context: Context (ITS) holding the ManagedClusters; defaults to context
+        live: Read from the API servers instead of the informer caches
+
+    Downsync rules are indexed by (apiGroup, resource, namespace), so each
+    object is only checked against the rules that can apply to it. Given
+    objects are all reported; a namespace scan reports only the objects
+    some policy selects, with the number scanned in "totalObjects".
+    """
+    if not objects and not namespace:
+        return {
+            "error": "Invalid input",
+            "message": "Either objects or namespace must be given"
+        }
+    try:
+        index: Optional[RuleIndex] = None if live else shared_rule_index(context)
+        if index is None:
+            index = build_rule_index(await load_binding_policies(context, live=live))
+        discovery = await get_discovery(context, insecure=True)
+
+        errors: Dict[str, Any] = {}
+        refs: List[Dict[str, Any]] = []
+        if objects:
+            for i, obj in enumerate(objects):
+                try:
+                    refs.append(_workload_ref(obj, discovery))
+                except (ValueError, KeyError, AttributeError) as e:
+                    errors[f"objects[{i}]"] = {"error": "Invalid object", "message": str(e)}
+        else:
+            if resources:
+                types = [(discovery.api_group_for(r) or "", r) for r in resources]
+            else:
+                # Rules without an apiGroup cover the resource in every group serving it.
+                types = sorted({(g, r) for group, r in index.resources()
+                                for g in (discovery.groups_for(r) if group == ANY else [group])})
+            listed = await asyncio.gather(*(
+                _namespace_workload_refs(context, namespace, group, resource, label_selector, discovery)
+                for group, resource in types
+            ), return_exceptions=True)
+            for (group, resource), chunk in zip(types, listed):
+                if isinstance(chunk, client.exceptions.ApiException):
+                    # e.g. no permission to list one type; report it and keep the rest.
+                    errors[f"{group}/{resource}" if group else resource] = {
+                        "error": f"Kubernetes API error: {chunk.status}",
+                        "message": chunk.reason
+                    }
+                elif isinstance(chunk, BaseException):
+                    raise chunk
+                else:
+                    refs.extend(chunk)
+
+        namespace_labels: Dict[str, Optional[Dict[str, str]]] = {}
+        if index.uses_namespace_selectors:
+            names = sorted({ref["namespace"] for ref in refs if ref["namespace"]})
+            labels = await asyncio.gather(*(_namespace_labels(context, ns, live) for ns in names))
+            namespace_labels = dict(zip(names, labels))
+
+        matched: List[Dict[str, Any]] = []
+        policy_names: set = set()
+        for ref in refs:
+            names = index.match(ref["apiGroup"], ref["resource"], ref["namespace"], ref["name"],
+                                ref["labels"], namespace_labels.get(ref["namespace"]))
+            policy_names |= names
+            if names or objects:
+                matched.append(dict(ref, bindingPolicies=sorted(names)))
+
+        policy_clusters: Dict[str, List[str]] = {}
+        if policy_names:
+            try:
+                cluster_index = await get_cluster_index(inventory_context or context, live=live)
+                for name in policy_names:
+                    policy_clusters[name] = sorted(cluster_index.select_any(index.cluster_selectors(name)))
+            except (client.exceptions.ApiException, ValueError) as e:
+                errors["inventory"] = {"error": "Failed to resolve target clusters", "message": str(e)}
+        for ref in matched:
+            clusters = set()
+            for name in ref["bindingPolicies"]:
+                clusters.update(policy_clusters.get(name, []))
+            ref["clusters"] = sorted(clusters)
+
+        return {
+            "message": f"{sum(1 for ref in matched if ref['bindingPolicies'])} of {len(refs)} objects are selected by binding policies",
+            "objects": matched,
+            "bindingPolicies": {name: policy_clusters.get(name, []) for name in sorted(policy_names)},
+            "totalObjects": len(refs),
+            "errors": errors
+        }
+
+    except client.exceptions.ApiException as e:
+        return {
+            "error": f"Kubernetes API error: {e.status}",
+            "message": str(e),
+            "details": e.body if hasattr(e, 'body') else "No details available"
+        }
+    except Exception as e:
+        return {
+            "error": str(e),
+            "message": "Failed to match workloads against binding policies."
+        }
+
+def updated_binding_policy_spec(
+    policy: Dict[str, Any],
+    cluster_labels: Optional[Dict[str, str]],
+    cluster_selectors: Optional[List[Dict[str, Any]]],
+    workload_labels: Optional[Dict[str, str]],
+    resource_configs: Optional[List[Dict[str, Any]]],
+    crd_api_groups: Optional[Dict[str, str]],
+    namespaces_to_sync: Optional[List[str]],
+    downsync: Optional[List[Dict[str, Any]]],
+    version: str,
+    discovery: Optional[Discovery] = None
+) -> Dict[str, Any]:
+    """
+    The spec of a policy with the requested changes applied; anything not
+    asked for keeps its current value. Raises ValueError for a malformed
+    resource config.
+    """
+    current = policy.get('spec', {})
+    spec = copy.deepcopy(current)
+    if cluster_selectors is not None:
+        spec["clusterSelectors"] = cluster_selectors
+    elif cluster_labels is not None:
+        spec["clusterSelectors"] = [{"matchLabels": cluster_labels}]
+
+    rules = current.get("downsync") or [{}]
+    if downsync is not None:
+        spec["downsync"] = downsync
+    elif resource_configs is not None:
+        if workload_labels is None:
+            workload_labels = ((rules[0].get("objectSelectors") or [{}])[0] or {}).get("matchLabels") or {}
+        if namespaces_to_sync is None:
+            namespaces_to_sync = rules[0].get("namespaces")
+        spec["downsync"] = build_binding_policy(
+            policy.get('metadata', {}).get('name', ''), {}, workload_labels, resource_configs,
+            crd_api_groups, namespaces_to_sync, version, discovery
+        )["spec"]["downsync"]
+    else:
+        for rule in spec.get("downsync") or []:
+            if workload_labels is not None:
+                rule["objectSelectors"] = [{"matchLabels": workload_labels}]
+            if namespaces_to_sync:
+                rule["namespaces"] = namespaces_to_sync
+            elif namespaces_to_sync is not None:
+                rule.pop("namespaces", None)
+    return spec
+
+def _describe_changes(ops: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """diff() operations as {"op", "path", "old", "new"} entries for the tool response."""
+    changes = []
+    for op in ops:
+        change = {"op": op["op"], "path": op["path"]}
+        if "old" in op:
+            change["old"] = op["old"]
+        if "value" in op:
+            change["new"] = op["value"]
+        changes.append(change)
+    return changes
+
+@mcp.tool()
+async def update_binding_policy(
+    policy_name: str,
+    cluster_labels: Optional[Dict[str, str]] = None,
+    cluster_selectors: Optional[List[Dict[str, Any]]] = None,
+    workload_labels: Optional[Dict[str, str]] = None,
+    resource_configs: Optional[List[Dict[str, Any]]] = None,
+    crd_api_groups: Optional[Dict[str, str]] = None,
+    namespaces_to_sync: Optional[List[str]] = None,
+    downsync: Optional[List[Dict[str, Any]]] = None,
+    patch_type: str = "json",
+    dry_run: bool = False,
+    max_retries: int = 3,
+    context: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Update an existing BindingPolicy in place with a minimal patch, instead
+    of deleting and recreating it (which makes KubeStellar re-propagate
+    every workload).
+
+    Args:
+        policy_name: Name of the binding policy
+        cluster_labels: New labels to select target clusters
+        cluster_selectors: New clusterSelectors, taking precedence over cluster_labels
+        workload_labels: New labels to select workloads
+        resource_configs: New resource configurations (as in create_binding_policy)
+        crd_api_groups: Optional resource -> API group overrides for resource_configs
+        namespaces_to_sync: New namespaces to sync; [] syncs from all namespaces
+        downsync: New downsync rules, taking precedence over resource_configs
+        patch_type: "json" (RFC 6902 JSON patch) or "merge" (RFC 7386 merge patch)
+        dry_run: Validate on the server without persisting anything
+        max_retries: How often to re-read and retry when the policy changed concurrently
+        context: Kubernetes context to use
+
+    Settings that are not given keep their current values. The patch is
+    conditional on the resourceVersion that was read; on a conflict the
+    policy is read again and the patch recomputed. Nothing is sent when
+    the policy already matches. Returns the changes made under "diff".
+    """
+    if patch_type not in PATCH_TYPES:
+        return {
+            "error": "Invalid input",
+            "message": f"patch_type must be one of {', '.join(PATCH_TYPES)}"
+        }
+    if all(arg is None for arg in (cluster_labels, cluster_selectors, workload_labels,
+                                   resource_configs, namespaces_to_sync, downsync)):
+        return {
+            "error": "Invalid input",
+            "message": "Nothing to update; pass at least one of cluster_labels, cluster_selectors, "
+                       "workload_labels, resource_configs, namespaces_to_sync or downsync"
+        }
+    try:
+        version = await get_binding_policy_version(context)
+        if version is None:
+            return binding_policy_api_missing()
+        discovery = await get_discovery(context, insecure=True)
+        api = get_custom_objects_api(context)
+        path = f"/apis/{BINDING_POLICY_GROUP}/{version}/{BINDING_POLICY_PLURAL}/{policy_name}"
+        query = [("dryRun", "All")] if dry_run else []
+
+        for attempt in range(max(0, max_retries) + 1):
+            # The first attempt may start from the informer cache; a stale
+            # copy just costs a conflict and a live re-read.
+            policy = get_cached(context, BINDING_POLICY_PLURAL, policy_name) if attempt == 0 else None
+            if policy is None:
+                policy = await call(context, api.get_cluster_custom_object,
+                    group=BINDING_POLICY_GROUP,
+                    version=version,
+                    plural=BINDING_POLICY_PLURAL,
+                    name=policy_name
+                )
+            try:
+                spec = updated_binding_policy_spec(
+                    policy, cluster_labels, cluster_selectors, workload_labels, resource_configs,
+                    crd_api_groups, namespaces_to_sync, downsync, version, discovery
+                )
+            except ValueError as e:
+                return {
+                    "error": "Invalid resource config",
+                    "message": str(e)
+                }
+
+            # Only the selectors and rules are ours to change.
+            managed = ("clusterSelectors", "downsync")
+            current = {k: v for k, v in policy.get('spec', {}).items() if k in managed}
+            desired = {k: v for k, v in spec.items() if k in managed}
+            ops = diff(current, desired, "/spec")
+            if not ops:
+                return {
+                    "message": f"Binding policy '{policy_name}' is already up to date",
+                    "changed": False,
+                    "diff": []
+                }
+
+            resource_version = policy.get('metadata', {}).get('resourceVersion')
+            if patch_type == "json":
+                # Replacing resourceVersion with the value read makes the
+                # server reject the patch if the policy changed since.
+                body = [{"op": "replace", "path": "/metadata/resourceVersion", "value": resource_version}] + json_patch(ops)
+            else:
+                body = {"metadata": {"resourceVersion": resource_version}, "spec": merge_patch(current, desired)}
+
+            try:
+                updated = await call_raw(context, api_request, api.api_client, "PATCH", path, query,
+                                         headers={"Content-Type": CONTENT_TYPES[patch_type]}, body=body)
+            except client.exceptions.ApiException as e:
+                if e.status == 409 and attempt < max_retries:
+                    continue
+                raise
+            return {
+                "message": f"{'Validated' if dry_run else 'Updated'} binding policy '{policy_name}' with {len(ops)} change(s)",
+                "changed": True,
+                "dryRun": dry_run,
+                "patchType": patch_type,
+                "diff": _describe_changes(ops),
+                "resourceVersion": updated.get('metadata', {}).get('resourceVersion'),
+                "attempts": attempt + 1
+            }
+
+    except client.exceptions.ApiException as e:
+        if e.status == 404:
+            return {
+                "error": f"Binding policy '{policy_name}' not found",
+                "message": "The specified binding policy does not exist in the cluster"
+            }
+        if e.status == 409:
+            return {
+                "error": "Conflict",
+                "message": f"Binding policy '{policy_name}' kept changing; gave up after {max_retries + 1} attempts"
+            }
+        return {
+            "error": f"Kubernetes API error: {e.status}",
+            "message": str(e),
+            "details": e.body if hasattr(e, 'body') else "No details available"
+        }
+    except Exception as e:
+        return {
+            "error": str(e),
+            "message": "Failed to update the BindingPolicy. Please check the input parameters and cluster configuration."
+        }
@@ -0,0 +1,208 @@
+import threading
+from typing import Optional, List, Dict, Set, Tuple, Any, Iterable
+
+from k8s.client_pool import get_api_client
+from k8s.informer import get_informer
+from k8s.lazy import lazy_import
+from k8s.pagination import iter_chunks
+from k8s.raw import accept_override
+
+client = lazy_import("kubernetes.client")
+
+MANAGED_CLUSTER_GROUP = "cluster.open-cluster-management.io"
+MANAGED_CLUSTER_VERSION = "v1"
+MANAGED_CLUSTER_PLURAL = "managedclusters"
+
+SELECTOR_OPERATORS = ("In", "NotIn", "Exists", "DoesNotExist")
+
+
+def _name_and_labels(cluster: Dict[str, Any]) -> Tuple[str, Dict[str, str]]:
+    metadata = cluster.get("metadata") or {}
+    return metadata.get("name", ""), metadata.get("labels") or {}
+
+
+def _check_operator(expression: Dict[str, Any]) -> str:
+    operator = expression.get("operator")
+    if operator not in SELECTOR_OPERATORS:
+        raise ValueError(f"Unknown selector operator '{operator}'; expected one of {', '.join(SELECTOR_OPERATORS)}")
+    return operator
+
+
+def selector_matches(selector: Dict[str, Any], labels: Dict[str, str]) -> bool:
+    """
+    Evaluate one Kubernetes label selector (matchLabels and
+    matchExpressions, ANDed) against a single label set. An empty
+    selector matches everything.
+    """
+    for key, value in (selector.get("matchLabels") or {}).items():
+        if labels.get(key) != value:
+            return False
+    for expression in selector.get("matchExpressions") or []:
+        operator = _check_operator(expression)
+        key = expression.get("key")
+        values = expression.get("values") or []
+        if operator == "In" and labels.get(key) not in values:
+            return False
+        if operator == "NotIn" and key in labels and labels[key] in values:
+            return False
+        if operator == "Exists" and key not in labels:
+            return False
+        if operator == "DoesNotExist" and key in labels:
+            return False
+    return True
+
+
+def selectors_match(selectors: Optional[List[Dict[str, Any]]], labels: Dict[str, str]) -> bool:
+    """BindingPolicy semantics: a cluster is selected when any of clusterSelectors matches."""
+    return any(selector_matches(selector or {}, labels) for selector in selectors or [])
+
+
+class LabelIndex:
+    """
+    An inverted index from label key/value pairs to ManagedCluster names.
+
+    Selectors are evaluated as set intersections and differences over the
+    index, so selecting from thousands of clusters costs in proportion to
+    the matching sets rather than a scan of every cluster's labels.
+    Updates are incremental: changing one cluster's labels only touches
+    the index entries of the labels that changed.
+    """
+
+    def __init__(self):
+        self._labels: Dict[str, Dict[str, str]] = {}
+        self._by_pair: Dict[Tuple[str, str], Set[str]] = {}
+        self._by_key: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def names(self) -> List[str]:
+        return sorted(self._labels)
+
+    def labels_of(self, name: str) -> Optional[Dict[str, str]]:
+        return self._labels.get(name)
+
+    def _unlink(self, name: str, labels: Dict[str, str]) -> None:
+        for key, value in labels.items():
+            for index, entry in ((self._by_pair, (key, value)), (self._by_key, key)):
+                names = index.get(entry)
+                if names is not None:
+                    names.discard(name)
+                    if not names:
+                        del index[entry]
+
+    def _link(self, name: str, labels: Dict[str, str]) -> None:
+        for key, value in labels.items():
+            self._by_pair.setdefault((key, value), set()).add(name)
+            self._by_key.setdefault(key, set()).add(name)
+
+    def upsert(self, name: str, labels: Dict[str, str]) -> None:
+        labels = dict(labels)
+        with self._lock:
+            old = self._labels.get(name, {})
+            self._unlink(name, {k: v for k, v in old.items() if labels.get(k) != v})
+            self._link(name, {k: v for k, v in labels.items() if old.get(k) != v})
+            self._labels[name] = labels
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            old = self._labels.pop(name, None)
+            if old is not None:
+                self._unlink(name, old)
+
+    def replace(self, clusters: Iterable[Dict[str, Any]]) -> None:
+        """Make the index match a full cluster list, touching only what differs."""
+        current = dict(_name_and_labels(cluster) for cluster in clusters)
+        for name in set(self._labels) - set(current):
+            self.remove(name)
+        for name, labels in current.items():
+            if self._labels.get(name) != labels:
+                self.upsert(name, labels)
+
+    def handle(self, event_type: str, obj: Any) -> None:
+        """Informer handler keeping the index in step with ManagedCluster events."""
+        if event_type == "REPLACED":
+            self.replace(obj)
+            return
+        name, labels = _name_and_labels(obj)
+        if event_type == "DELETED":
+            self.remove(name)
+        else:
+            self.upsert(name, labels)
+
+    def select(self, selector: Dict[str, Any]) -> Set[str]:
+        """Names of the clusters matching one label selector."""
+        required: List[Set[str]] = []
+        excluded: List[Set[str]] = []
+        empty: Set[str] = set()
+        with self._lock:
+            for key, value in (selector.get("matchLabels") or {}).items():
+                required.append(self._by_pair.get((key, value), empty))
+            for expression in selector.get("matchExpressions") or []:
+                operator = _check_operator(expression)
+                key = expression.get("key")
+                values = expression.get("values") or []
+                if operator in ("In", "NotIn"):
+                    matched = set().union(*(self._by_pair.get((key, v), empty) for v in values))
+                    (required if operator == "In" else excluded).append(matched)
+                elif operator == "Exists":
+                    required.append(self._by_key.get(key, empty))
+                else:
+                    excluded.append(self._by_key.get(key, empty))
+
+            if required:
+                # Intersect starting from the smallest set.
+                required.sort(key=len)
+                selected = set(required[0])
+                for names in required[1:]:
+                    if not selected:
+                        break
+                    selected &= names
+            else:
+                selected = set(self._labels)
+            for names in excluded:
+                selected -= names
+        return selected
+
+    def select_any(self, selectors: Optional[List[Dict[str, Any]]]) -> Set[str]:
+        """Names of the clusters a BindingPolicy's clusterSelectors select (any selector matching)."""
+        selected: Set[str] = set()
+        for selector in selectors or []:
+            selected |= self.select(selector or {})
+        return selected
+
+
+_indexes: Dict[Optional[str], LabelIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+async def get_cluster_index(context: Optional[str] = None, live: bool = False) -> LabelIndex:
+    """
+    The label index over the ManagedClusters of an inventory context.
+
+    With the managedclusters informer enabled, one index per context is
+    kept current from its watch events and shared between calls. Otherwise
+    (or with live=True, or while the informer is stale) a fresh index is
+    built from a chunked, metadata-only list of the clusters.
+    """
+    informer = None if live else get_informer(context, MANAGED_CLUSTER_PLURAL)
+    if informer is not None:
+        with _indexes_lock:
+            index = _indexes.get(context)
+            if index is None:
+                index = _indexes[context] = LabelIndex()
+                informer.add_handler(index.handle)
+        if informer.is_fresh():
+            return index
+
+    api = client.CustomObjectsApi(get_api_client(context, insecure=True))
+    list_func = accept_override(api.list_cluster_custom_object, "/apis/{group}/{version}/{plural}", "metadata")
+    index = LabelIndex()
+    async for chunk in iter_chunks(context, list_func, raw=True,
+                                   group=MANAGED_CLUSTER_GROUP,
+                                   version=MANAGED_CLUSTER_VERSION,
+                                   plural=MANAGED_CLUSTER_PLURAL):
+        for cluster in chunk:
+            index.upsert(*_name_and_labels(cluster))
+    return index
@@ -0,0 +1,205 @@
+import itertools
+import threading
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Set, Tuple, Any, Iterable
+
+from k8s.informer import get_informer
+from kubestellar.cluster_selection import selector_matches
+
+ANY = "*"
+
+# (apiGroup, resource, namespace); any of them may be ANY
+RuleKey = Tuple[str, str, str]
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """One downsync clause of a BindingPolicy, reduced to what object matching needs."""
+    policy: str
+    object_selectors: Tuple[Dict[str, Any], ...]
+    object_names: Optional[frozenset]
+    namespace_selectors: Tuple[Dict[str, Any], ...]
+
+    def matches(self, name: str, labels: Dict[str, str], namespace_labels: Optional[Dict[str, str]] = None) -> bool:
+        if self.object_names is not None and name not in self.object_names and ANY not in self.object_names:
+            return False
+        if self.object_selectors and not any(selector_matches(s, labels) for s in self.object_selectors):
+            return False
+        if self.namespace_selectors:
+            if namespace_labels is None or not any(selector_matches(s, namespace_labels) for s in self.namespace_selectors):
+                return False
+        return True
+
+
+def compile_policy(policy: Dict[str, Any]) -> List[Tuple[RuleKey, CompiledRule]]:
+    """
+    The index entries of every downsync rule of a BindingPolicy.
+
+    Unset fields follow the KubeStellar controller. A missing apiGroup
+    matches every group, and "" is the core group. resources, namespaces and
+    objectNames are omitempty lists that the controller only filters on when
+    they are non-empty, so a missing list and an empty one both match
+    everything.
+    """
+    name = policy.get('metadata', {}).get('name', '')
+    entries = []
+    for rule in policy.get('spec', {}).get('downsync') or []:
+        compiled = CompiledRule(
+            policy=name,
+            object_selectors=tuple(s or {} for s in rule.get("objectSelectors") or []),
+            object_names=frozenset(rule["objectNames"]) if rule.get("objectNames") else None,
+            namespace_selectors=tuple(s or {} for s in rule.get("namespaceSelectors") or []),
+        )
+        # A missing apiGroup matches every group; "" is the core group.
+        group = ANY if rule.get("apiGroup") is None else rule["apiGroup"]
+        namespaces = rule.get("namespaces") or [ANY]
+        resources = rule.get("resources") or [ANY]
+        for resource in resources:
+            for namespace in namespaces:
+                entries.append(((group, resource.lower(), namespace), compiled))
+    return entries
+
+
+class RuleIndex:
+    """
+    Downsync rules of every BindingPolicy, bucketed by (apiGroup,
+    resource, namespace). Matching an object only evaluates the label
+    selectors of the rules in its own buckets (plus the wildcard ones),
+    never every rule of every policy. Policies are added and removed
+    individually, so the index can follow informer events.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[RuleKey, List[CompiledRule]] = {}
+        self._keys: Dict[str, List[RuleKey]] = {}
+        self._cluster_selectors: Dict[str, List[Dict[str, Any]]] = {}
+        self._resource_versions: Dict[str, Optional[str]] = {}
+        self._namespace_selector_rules = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def uses_namespace_selectors(self) -> bool:
+        """Whether any rule needs the labels of the object's namespace."""
+        return self._namespace_selector_rules > 0
+
+    def resources(self) -> Set[Tuple[str, str]]:
+        """
+        The concrete resources some rule downsyncs, as (apiGroup, resource)
+        pairs; apiGroup is ANY for rules without one.
+        """
+        with self._lock:
+            return {(group, resource) for group, resource, _ in self._buckets if resource != ANY}
+
+    def cluster_selectors(self, policy: str) -> List[Dict[str, Any]]:
+        return self._cluster_selectors.get(policy, [])
+
+    def _remove(self, name: str) -> None:
+        for key in self._keys.pop(name, []):
+            kept = []
+            for rule in self._buckets.get(key, []):
+                if rule.policy != name:
+                    kept.append(rule)
+                elif rule.namespace_selectors:
+                    self._namespace_selector_rules -= 1
+            if kept:
+                self._buckets[key] = kept
+            else:
+                self._buckets.pop(key, None)
+        self._cluster_selectors.pop(name, None)
+        self._resource_versions.pop(name, None)
+
+    def upsert(self, policy: Dict[str, Any]) -> None:
+        metadata = policy.get('metadata', {})
+        name = metadata.get('name', '')
+        entries = compile_policy(policy)
+        with self._lock:
+            self._remove(name)
+            keys = []
+            for key, rule in entries:
+                self._buckets.setdefault(key, []).append(rule)
+                if rule.namespace_selectors:
+                    self._namespace_selector_rules += 1
+                if key not in keys:
+                    keys.append(key)
+            self._keys[name] = keys
+            self._cluster_selectors[name] = policy.get('spec', {}).get('clusterSelectors') or []
+            self._resource_versions[name] = metadata.get('resourceVersion')
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            self._remove(name)
+
+    def replace(self, policies: Iterable[Dict[str, Any]]) -> None:
+        """Make the index match a full policy list, recompiling only changed policies."""
+        current = {policy.get('metadata', {}).get('name', ''): policy for policy in policies}
+        for name in set(self._keys) - set(current):
+            self.remove(name)
+        for name, policy in current.items():
+            resource_version = policy.get('metadata', {}).get('resourceVersion')
+            if name not in self._keys or resource_version is None or self._resource_versions.get(name) != resource_version:
+                self.upsert(policy)
+
+    def handle(self, event_type: str, obj: Any) -> None:
+        """Informer handler keeping the index in step with BindingPolicy events."""
+        if event_type == "REPLACED":
+            self.replace(obj)
+        elif event_type == "DELETED":
+            self.remove(obj.get('metadata', {}).get('name', ''))
+        else:
+            self.upsert(obj)
+
+    def match(
+        self,
+        group: str,
+        resource: str,
+        namespace: Optional[str],
+        name: str,
+        labels: Dict[str, str],
+        namespace_labels: Optional[Dict[str, str]] = None
+    ) -> Set[str]:
+        """
+        Names of the policies whose downsync rules select an object.
+        namespace is None for cluster-scoped objects; a Namespace object
+        is matched against the rules' namespaces by its own name.
+        """
+        resource = resource.lower()
+        if resource == "namespaces":
+            namespace = name
+        namespaces = (namespace, ANY) if namespace else (ANY,)
+        policies: Set[str] = set()
+        with self._lock:
+            for key in itertools.product((group, ANY), (resource, ANY), namespaces):
+                for rule in self._buckets.get(key, ()):
+                    if rule.policy not in policies and rule.matches(name, labels, namespace_labels):
+                        policies.add(rule.policy)
+        return policies
+
+
+def build_rule_index(policies: Iterable[Dict[str, Any]]) -> RuleIndex:
+    index = RuleIndex()
+    index.replace(policies)
+    return index
+
+
+_indexes: Dict[Optional[str], RuleIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def shared_rule_index(context: Optional[str] = None) -> Optional[RuleIndex]:
+    """
+    The rule index of a context kept current by the bindingpolicies
+    informer, or None when that informer is disabled or not fresh; callers
+    then build_rule_index() from a fresh list.
+    """
+    informer = get_informer(context, "bindingpolicies")
+    if informer is None:
+        return None
+    with _indexes_lock:
+        index = _indexes.get(context)
+        if index is None:
+            index = _indexes[context] = RuleIndex()
+            informer.add_handler(index.handle)
+    return index if informer.is_fresh() else None
@@ -0,0 +1,75 @@
+import io
+import json
+from typing import Optional, List, Dict, Any, Iterator, IO
+
+from k8s.lazy import lazy_import
+
+yaml = lazy_import("yaml")
+
+BUNDLE_FORMATS = ("auto", "yaml", "ndjson")
+
+
+def _detect_format(stream: IO[str]) -> str:
+    """Peek at the first non-blank line: a JSON object means NDJSON, anything else YAML."""
+    position = stream.tell()
+    fmt = "yaml"
+    for line in stream:
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if stripped.startswith("{") and stripped.endswith("}"):
+            fmt = "ndjson"
+        break
+    stream.seek(position)
+    return fmt
+
+
+def iter_documents(stream: IO[str], fmt: str = "auto") -> Iterator[Dict[str, Any]]:
+    """
+    Yield the documents of a multi-document YAML or NDJSON stream one at a
+    time, so a large bundle never has to be parsed into memory at once.
+    Empty YAML documents and blank lines are skipped.
+    """
+    if fmt not in BUNDLE_FORMATS:
+        raise ValueError(f"Unknown bundle format '{fmt}'; expected one of {', '.join(BUNDLE_FORMATS)}")
+    if fmt == "auto":
+        fmt = _detect_format(stream)
+    if fmt == "ndjson":
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+    else:
+        for document in yaml.safe_load_all(stream):
+            if document is not None:
+                yield document
+
+
+def open_bundle(bundle: Optional[str] = None, bundle_path: Optional[str] = None) -> IO[str]:
+    """A text stream over an inline bundle or a bundle file on the server's filesystem."""
+    if bundle_path:
+        return open(bundle_path, "r", encoding="utf-8")
+    return io.StringIO(bundle or "")
+
+
+def policy_name_of(document: Dict[str, Any]) -> Optional[str]:
+    """The policy name of either a BindingPolicy object or a create_binding_policy-style spec."""
+    if "policy_name" in document:
+        return document["policy_name"]
+    return (document.get("metadata") or {}).get("name")
+
+
+def is_policy_spec(document: Dict[str, Any]) -> bool:
+    """True for create_binding_policy-style inputs rather than full BindingPolicy objects."""
+    return "policy_name" in document and "kind" not in document
+
+
+def spec_arguments(document: Dict[str, Any]) -> List[Any]:
+    """Positional build_binding_policy() arguments (up to the version) of a policy spec."""
+    return [
+        document["policy_name"],
+        document.get("cluster_labels") or {},
+        document.get("workload_labels") or {},
+        document.get("resource_configs") or [],
+        document.get("crd_api_groups"),
+        document.get("namespaces_to_sync"),
+    ]
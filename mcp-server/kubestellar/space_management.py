@@ -1,12 +1,11 @@
-from mcp.server.fastmcp import FastMCP
+import asyncio
 
-from kubernetes import client, config
 from typing import Optional, List, Dict, Any
-mcp = FastMCP("Kubestellar  MCP")
 
-def load_kube_config(context: Optional[str] = None):
-    """Load kubeconfig for a given context."""
-    config.load_kube_config(context=context)
+from k8s.kubeconfig import get_kubeconfig, kubeconfig_paths, update_kubeconfig
+from mcp_instance import mcp
+
+WDS_PREFIX = "wds"
 
 
 @mcp.tool()
@@ -14,8 +13,7 @@ async def list_wds_contexts() -> List[str]:
     """
     List all kubeconfig contexts that represent Workload Description Spaces (WDS).
     """
-    contexts, _ = config.list_kube_config_contexts()
-    return [ctx['name'] for ctx in contexts if ctx['name'].startswith('wds')]
+    return get_kubeconfig().with_prefix(WDS_PREFIX)
 
 @mcp.tool()
 async def get_wds_context_details(context_name: str) -> Dict[str, Any]:
@@ -23,33 +21,31 @@ async def get_wds_context_details(context_name: str) -> Dict[str, Any]:
     Get details of a specific WDS context.
     Returns the context's details as a dictionary.
     """
-    contexts, active_context = config.list_kube_config_contexts()
-    
-    for ctx in contexts:
-        if ctx['name'] == context_name:
-            return {
-                "name": ctx['name'],
-                "context": ctx['context'],
-                "cluster": ctx['context']['cluster'],
-                "user": ctx['context']['user']
-            }
-    
+    ctx = get_kubeconfig().context(context_name)
+    if ctx is not None:
+        return {
+            "name": ctx['name'],
+            "context": ctx['context'],
+            "cluster": ctx['context']['cluster'],
+            "user": ctx['context']['user']
+        }
+
     return {"error": f"WDS context '{context_name}' not found."}
 @mcp.tool()
 async def create_wds_context(
     context_name: str,
     cluster_name: str,
-    user_name: str
+    user_name: str,
+    namespace: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Create a new WDS context in kubeconfig.
+    The context is written to the first kubeconfig file.
     Returns the created context's details as a dictionary.
     """
-    contexts, _ = config.list_kube_config_contexts()
-    
-    if any(ctx['name'] == context_name for ctx in contexts):
+    if get_kubeconfig().context(context_name) is not None:
         return {"error": f"WDS context '{context_name}' already exists."}
-    
+
     new_context = {
         "name": context_name,
         "context": {
@@ -57,9 +53,19 @@ async def create_wds_context(
             "user": user_name
         }
     }
-    
-    # Here you would typically save this context to kubeconfig
-    # For simplicity, we return the new context details
+    if namespace:
+        new_context["context"]["namespace"] = namespace
+
+    def add(document: Dict[str, Any]) -> bool:
+        contexts = document.get("contexts") or []
+        if any(ctx.get("name") == context_name for ctx in contexts):
+            return False
+        document["contexts"] = contexts + [new_context]
+        return True
+
+    # Re-checked under the file lock in case another writer got there first.
+    if not await asyncio.to_thread(update_kubeconfig, kubeconfig_paths()[0], add):
+        return {"error": f"WDS context '{context_name}' already exists."}
     return new_context
 @mcp.tool()
 async def delete_wds_context(context_name: str) -> Dict[str, Any]:
@@ -67,25 +73,38 @@ async def delete_wds_context(context_name: str) -> Dict[str, Any]:
     Delete a WDS context from kubeconfig.
     Returns a confirmation message.
     """
-    contexts, _ = config.list_kube_config_contexts()
-    
-    if not any(ctx['name'] == context_name for ctx in contexts):
+    kubeconfig = get_kubeconfig()
+    if kubeconfig.context(context_name) is None:
         return {"error": f"WDS context '{context_name}' not found."}
-    
-    # Here you would typically remove the context from kubeconfig
-    # For simplicity, we return a confirmation message
-    return {"message": f"WDS context '{context_name}' has been deleted."}
+
+    def remove(document: Dict[str, Any]) -> bool:
+        contexts = document.get("contexts") or []
+        kept = [ctx for ctx in contexts if ctx.get("name") != context_name]
+        document["contexts"] = kept
+        return len(kept) != len(contexts)
+
+    if not await asyncio.to_thread(update_kubeconfig, kubeconfig.sources[context_name], remove):
+        return {"error": f"WDS context '{context_name}' not found."}
+    result = {"message": f"WDS context '{context_name}' has been deleted."}
+    if kubeconfig.current_context == context_name:
+        result["warning"] = f"'{context_name}' was the current context; switch to another context."
+    return result
 @mcp.tool()
 async def switch_wds_context(context_name: str) -> Dict[str, Any]:
     """
     Switch to a specified WDS context in kubeconfig.
     Returns the active context's details after switching.
     """
-    contexts, active_context = config.list_kube_config_contexts()
-    
-    if not any(ctx['name'] == context_name for ctx in contexts):
+    ctx = get_kubeconfig().context(context_name)
+    if ctx is None:
         return {"error": f"WDS context '{context_name}' not found."}
-    
-    # Here you would typically switch the active context in kubeconfig
-    # For simplicity, we return the new active context details
-    return {"message": f"Switched to WDS context '{context_name}'."}
\ No newline at end of file
+
+    def switch(document: Dict[str, Any]) -> None:
+        document["current-context"] = context_name
+
+    # kubectl keeps current-context in the first kubeconfig file.
+    await asyncio.to_thread(update_kubeconfig, kubeconfig_paths()[0], switch)
+    return {
+        "message": f"Switched to WDS context '{context_name}'.",
+        "context": ctx['context']
+    }
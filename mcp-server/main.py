@@ -1,12 +1,45 @@
 # main.py
-from mcp.server.fastmcp_instance import mcp
+import json
+import os
+import sys
+import time
+
+_started = time.perf_counter()
+
+from mcp_instance import mcp
 
 # Import all tool modules to trigger tool registration
 import k8s.cluster_management
 import k8s.namespace_management
 import k8s.resource_management
+import k8s.watching
+import k8s.cursors
+import k8s.observability
 import kubestellar.binding_policy_management
 import kubestellar.space_management
 
+# Seconds from interpreter start of this module to all tools registered.
+# The kubernetes client and yaml are imported by the first tool call that
+# needs them, not here; see `python main.py --startup-time`.
+STARTUP_BUDGET = float(os.environ.get("KUBRALIS_STARTUP_BUDGET", "1.0"))
+STARTUP_TIME = time.perf_counter() - _started
+
+
+def startup_report() -> dict:
+    return {
+        "startupSeconds": round(STARTUP_TIME, 4),
+        "budgetSeconds": STARTUP_BUDGET,
+        "tools": len(mcp._tool_manager.list_tools()),
+        "kubernetesImported": "kubernetes" in sys.modules,
+        "yamlImported": "yaml" in sys.modules,
+    }
+
+
 if __name__ == "__main__":
-    mcp.serve()
+    if "--startup-time" in sys.argv[1:]:
+        report = startup_report()
+        print(json.dumps(report))
+        sys.exit(0 if report["startupSeconds"] <= STARTUP_BUDGET and not report["kubernetesImported"] else 1)
+    k8s.observability.configure_logging()
+    k8s.observability.start_metrics_endpoint()
+    mcp.run()
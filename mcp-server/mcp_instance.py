@@ -0,0 +1,15 @@
+from mcp.server.fastmcp import FastMCP
+
+from k8s.metrics import instrument_tool
+
+
+class InstrumentedFastMCP(FastMCP):
+    """FastMCP whose tools are timed and counted (see k8s.metrics)."""
+
+    def add_tool(self, fn, name=None, description=None, annotations=None) -> None:
+        super().add_tool(instrument_tool(name or fn.__name__, fn), name=name, description=description,
+                         annotations=annotations)
+
+
+# The single server every tool module registers its tools with.
+mcp = InstrumentedFastMCP("Kubestellar  MCP")
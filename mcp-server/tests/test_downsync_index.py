@@ -0,0 +1,39 @@
+import unittest
+
+from kubestellar.downsync_index import ANY, build_rule_index
+
+
+def policy(name, *rules):
+    return {"metadata": {"name": name, "resourceVersion": "1"}, "spec": {"downsync": list(rules)}}
+
+
+class RuleIndexTest(unittest.TestCase):
+
+    def test_missing_api_group_matches_every_group(self):
+        index = build_rule_index([policy("any-group", {"resources": ["deployments"]})])
+        self.assertEqual(index.match("apps", "deployments", "ns", "web", {}), {"any-group"})
+        self.assertEqual(index.match("", "deployments", "ns", "web", {}), {"any-group"})
+        self.assertEqual(index.match("apps", "statefulsets", "ns", "web", {}), set())
+        self.assertEqual(index.resources(), {(ANY, "deployments")})
+
+    def test_empty_api_group_is_the_core_group(self):
+        index = build_rule_index([policy("core", {"apiGroup": "", "resources": ["configmaps"]})])
+        self.assertEqual(index.match("", "configmaps", "ns", "cm", {}), {"core"})
+        self.assertEqual(index.match("example.com", "configmaps", "ns", "cm", {}), set())
+
+    def test_empty_resources_match_every_resource(self):
+        index = build_rule_index([policy("empty", {"apiGroup": "apps", "resources": []})])
+        self.assertEqual(index.match("apps", "deployments", "ns", "web", {}), {"empty"})
+        self.assertEqual(index.match("apps", "statefulsets", "ns", "db", {}), {"empty"})
+        self.assertEqual(index.match("", "configmaps", "ns", "cm", {}), set())
+
+    def test_missing_resources_match_every_resource(self):
+        index = build_rule_index([policy("all", {"apiGroup": "apps",
+                                                 "objectSelectors": [{"matchLabels": {"app": "web"}}]})])
+        self.assertEqual(index.match("apps", "deployments", "ns", "web", {"app": "web"}), {"all"})
+        self.assertEqual(index.match("apps", "deployments", "ns", "web", {"app": "db"}), set())
+        self.assertEqual(index.resources(), set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from benchmarks.fake_apiserver import serve_fleet
+from benchmarks.fleet import FleetSpec
+
+
+def kubeconfig(servers):
+    return {
+        "apiVersion": "v1",
+        "kind": "Config",
+        "clusters": [{"name": name, "cluster": {"server": server.url}} for name, server in servers.items()],
+        "contexts": [{"name": name, "context": {"cluster": name, "user": "u"}} for name in servers],
+        "current-context": next(iter(servers)),
+        "users": [{"name": "u", "user": {"token": "x"}}],
+    }
+
+
+class MultiContextPagingTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.servers = {
+            "wds1": serve_fleet(FleetSpec(nodes=5, pods=0, namespaces=1, policies=0, clusters=0)),
+            "wds2": serve_fleet(FleetSpec(nodes=3, pods=0, namespaces=1, policies=0, clusters=0)),
+        }
+        cls.tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(cls.tmp.name, "config")
+        with open(path, "w") as f:
+            json.dump(kubeconfig(cls.servers), f)
+        cls.saved_kubeconfig = os.environ.get("KUBECONFIG")
+        os.environ["KUBECONFIG"] = path
+
+    @classmethod
+    def tearDownClass(cls):
+        for server in cls.servers.values():
+            server.stop()
+        if cls.saved_kubeconfig is None:
+            os.environ.pop("KUBECONFIG", None)
+        else:
+            os.environ["KUBECONFIG"] = cls.saved_kubeconfig
+        cls.tmp.cleanup()
+
+    def pages(self):
+        from k8s.resource_management import get_nodes
+
+        async def walk():
+            pages, token = [], None
+            while True:
+                page = await get_nodes(contexts=["wds1", "wds2"], limit=2, continue_token=token,
+                                       output="metadata")
+                pages.append(page)
+                token = page.get("continue")
+                if not token:
+                    return pages
+        return asyncio.run(walk())
+
+    def test_pages_through_every_context(self):
+        pages = self.pages()
+        self.assertEqual([page["contexts"] for page in pages],
+                         [["wds1", "wds2"], ["wds1", "wds2"], ["wds1"]])
+        self.assertEqual([len(page["items"]) for page in pages], [4, 3, 1])
+        seen = [(item["context"], item["metadata"]["name"]) for page in pages for item in page["items"]]
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(sum(1 for context, _ in seen if context == "wds1"), 5)
+        self.assertEqual(sum(1 for context, _ in seen if context == "wds2"), 3)
+        self.assertTrue(all(not page["errors"] for page in pages))
+
+    def test_rejects_a_single_context_token(self):
+        from k8s.resource_management import get_nodes
+
+        with self.assertRaises(ValueError):
+            asyncio.run(get_nodes(contexts=["wds1", "wds2"], limit=2, continue_token="not-a-fan-out-token"))
+
+
+if __name__ == "__main__":
+    unittest.main()